@@ -0,0 +1,71 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from neal import SimulatedAnnealingSampler
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from dwave_tutorials import adders
+
+"""
+benchmarks-adders.py
+--------------------
+  How k-bit ripple-carry and carry-lookahead adders from
+  dwave_tutorials.adders scale with k: build time, gates, variables,
+  couplers, and the fraction of simulated annealing reads that add up
+  (a + b + cin == s).
+
+The adders are sampled with all inputs free, so any a and b is a valid
+answer as long as the sum bits match.
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Build and sample ripple-carry and carry-lookahead adders.')
+    parser.add_argument('--bits', type=int, nargs='+', default=[2, 4, 8, 16, 32, 64])
+    parser.add_argument('--reads', type=int, default=100)
+    parser.add_argument('--sweeps', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    sampler = SimulatedAnnealingSampler()
+    print('{:>10} {:>4} {:>6} {:>9} {:>9} {:>10} {:>10} {:>7}'.format(
+        'adder', 'k', 'gates', 'variables', 'couplers', 'build', 'sample', 'valid'))
+    for kind in sorted(adders.builders):
+        for k in args.bits:
+            start = time.time()
+            bqm, variables = adders.adder_bqm(k, kind=kind, carry_in=True)
+            build = time.time() - start
+
+            start = time.time()
+            response = sampler.sample(bqm, num_reads=args.reads, num_sweeps=args.sweeps,
+                                      seed=args.seed)
+            sample = time.time() - start
+            ok = adders.valid(response, variables)
+
+            gates = len(adders.builders[kind](k, carry_in=True)[0].gates)
+            print('{:>10} {:>4} {:>6} {:>9} {:>9} {:>9.4f}s {:>9.3f}s {:>6.1f}%'.format(
+                kind, k, gates, len(bqm), len(bqm.quadratic), build, sample,
+                100.0 * ok.mean()))
+
+
+if __name__ == '__main__':
+    main()
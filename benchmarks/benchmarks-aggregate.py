@@ -0,0 +1,107 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import dimod
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from dwave_tutorials import aggregate
+
+"""
+benchmarks-aggregate.py
+-----------------------
+  Compare the board-drawing tally loop from fun-four-queens.py against
+  the chunked counter in dwave_tutorials.aggregate.
+
+The samples are random 4x4 boards, drawn from a small pool so that there
+are only a few hundred distinct answers, like a real sampler would give.
+We report time and the peak memory allocated while aggregating (the
+response itself is not counted). Memory tracing makes the loop even
+slower than usual, so it is skipped above --loop-max reads.
+"""
+
+Q = {0: '*', 1: 'Q'}
+
+
+def loop_aggregate(response):
+    # This is the tally loop from fun-four-queens.py, minus csp.check().
+    answers = {}
+    for datum in response.data(sorted_by=None):
+        sample, energy, num = datum
+        result = '+-+-+-+-+\n'
+        for row in range(1, 5):
+            for col in range(1, 5):
+                result += '|'+Q[sample['x'+str(row)+str(col)]]
+            result += '|\n'
+            result += '+-+-+-+-+\n'
+        try:
+            answers[result] += num
+        except KeyError:
+            answers[result] = num
+    return answers
+
+
+def measure(function, *args):
+    tracemalloc.start()
+    start = time.time()
+    result = function(*args)
+    seconds = time.time() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare the tutorial tally loop against dwave_tutorials.aggregate.')
+    parser.add_argument('--reads', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--loop-max', type=int, default=100000)
+    parser.add_argument('--distinct', type=int, default=300)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    labels = ['x'+str(row)+str(col) for row in range(1, 5) for col in range(1, 5)]
+    rng = np.random.RandomState(args.seed)
+    pool = rng.randint(0, 2, size=(args.distinct, len(labels))).astype(np.int8)
+
+    print('{:>9} | {:>9} {:>10} | {:>9} {:>10}'.format(
+        'reads', 'loop (s)', 'loop MiB', 'chunk (s)', 'chunk MiB'))
+    for reads in args.reads:
+        matrix = pool[rng.randint(0, len(pool), size=reads)]
+        response = dimod.SampleSet.from_samples((matrix, labels), dimod.BINARY,
+                                                energy=np.zeros(reads))
+
+        counter, chunk_time, chunk_peak = measure(aggregate.aggregate, response, labels)
+        chunked = '{:>9.3f} {:>10.2f}'.format(chunk_time, chunk_peak / 2.0**20)
+
+        if reads > args.loop_max:
+            loop = '{:>9} {:>10}'.format('skipped', '-')
+        else:
+            answers, loop_time, loop_peak = measure(loop_aggregate, response)
+            assert len(answers) == len(counter)
+            loop = '{:>9.3f} {:>10.2f}'.format(loop_time, loop_peak / 2.0**20)
+
+        print('{:>9} | {} | {}'.format(reads, loop, chunked))
+
+
+if __name__ == '__main__':
+    main()
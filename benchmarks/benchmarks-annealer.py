@@ -0,0 +1,69 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from dwave_tutorials import schedules
+from dwave_tutorials.annealer import ScheduleAnnealingSampler
+
+"""
+benchmarks-annealer.py
+----------------------
+  Reads per second and ground-state probability for
+  dwave_tutorials.annealer.ScheduleAnnealingSampler under the three
+  schedules from dwave-features-anneal-schedule.py and a few pauses.
+"""
+
+Q = {(0, 0): -1.1, (0, 4): 0, (4, 0): 2, (4, 4): -1}
+
+tutorial_schedules = [
+    ((0.0, 0.0), (5.0, 1.0)),
+    ((0.0, 0.0), (5.0, 0.5), (20.0, 1.0)),
+    ((0.0, 0.0), (1.0, 0.80), (19.0, 0.81), (20.0, 1.0)),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Throughput of the schedule-following simulated annealer.')
+    parser.add_argument('--reads', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    sampler = ScheduleAnnealingSampler()
+    entries = tutorial_schedules + [schedules.pause_schedule(point, 20.0)
+                                    for point in (0.2, 0.4, 0.6, 0.8)]
+    print('{:>7} {:>12} {:>7}  {}'.format('sweeps', 'reads/s', 'P(gs)', 'schedule'))
+    for schedule in entries:
+        start = time.time()
+        response = sampler.sample_qubo(Q, anneal_schedule=schedule, num_reads=args.reads,
+                                       seed=args.seed)
+        seconds = time.time() - start
+        record = response.record
+        ground = record.num_occurrences[np.isclose(record.energy, -1.1)].sum()
+        print('{:>7} {:>12.0f} {:>7.3f}  {}'.format(
+            response.info['num_sweeps'], args.reads / seconds, ground / float(args.reads),
+            ' '.join('({:g}, {:g})'.format(t, s) for t, s in schedule)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import argparse
+import operator
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+import dimod
+import neal
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from dwave_tutorials import (bqmpresolve, canonical, circuits, coins, multiplier, nqueens,
+                             templates)
+
+"""
+benchmarks-bqmpresolve.py
+-------------------------
+  Variables left, presolve time and end-to-end sample time with and
+  without dwave_tutorials.bqmpresolve, on every tutorial's model.
+
+Each model is built the way its tutorial builds it: the NOT and AND
+QUBOs as written, the full adder and 2x2 multiplier with
+canonical.stitch() (with the inputs or the product fixed by
+constraints, and without csp presolve), four queens with
+templates.stitch(), n-queens and the template multipliers from their
+modules, and the coin as its empty model.
+
+Both sides are sampled with neal at the same num_reads. 'end to end' is
+presolve + sampling the smaller model + expand(), against sampling the
+whole model. 'ground' is the fraction of reads at the lowest energy
+either side found, with the expanded samples scored on the original
+model.
+
+The coin is the case to look out for: every variable is isolated with
+no bias, so presolve fixes them all to 0, which is a ground state but
+not a coin flip.
+"""
+
+
+def fix(csp, fixed):
+    for v, value in sorted(fixed.items()):
+        csp.add_constraint(operator.truth if value else operator.not_, [v])
+    return csp
+
+
+problems = [
+    ('not', lambda: dimod.BinaryQuadraticModel.from_qubo(circuits.not_qubo)),
+    ('and', lambda: dimod.BinaryQuadraticModel.from_qubo(circuits.and_qubo)),
+    ('full adder', lambda: canonical.stitch(circuits.full_adder_csp(), 3.0)),
+    ('full adder a=1 b=1', lambda: canonical.stitch(
+        fix(circuits.full_adder_csp(), {'a': 1, 'b': 1}), 3.0)),
+    ('2x2 multiplier', lambda: canonical.stitch(circuits.multiplier_2x2_csp(None), 2.0)),
+    ('2x2 multiplier C=9', lambda: canonical.stitch(circuits.multiplier_2x2_csp(9), 2.0)),
+    ('2x2 template C=9', lambda: multiplier.multiplier_bqm(2, 2, c=9)),
+    ('4x4 template C=143', lambda: multiplier.multiplier_bqm(4, 4, c=143)),
+    ('four queens', lambda: templates.stitch(nqueens.csp(4), min_classical_gap=3.2)),
+    ('8 queens', lambda: nqueens.bqm(8)),
+    ('coin', lambda: coins.empty_bqm(range(50))),
+]
+
+
+def sample(sampler, bqm, num_reads, seed):
+    start = time.time()
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')  # neal on a model with no biases
+        response = sampler.sample(bqm, num_reads=num_reads, seed=seed)
+    return response, time.time() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Variables left and sample time with and without BQM presolve.')
+    parser.add_argument('--num-reads', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    sampler = neal.SimulatedAnnealingSampler()
+    print('{:<20} {:>5} {:>5} {:>9} | {:>9} {:>9} {:>6} | {:>9} {:>6} {:>7}'.format(
+        '', 'vars', 'left', 'presolve', 'sample', 'end2end', 'ground',
+        'sample', 'ground', 'speedup'))
+    for name, build in problems:
+        bqm = build()
+
+        start = time.time()
+        reduction = bqmpresolve.reduce(bqm, seed=args.seed)
+        presolve_seconds = time.time() - start
+        small, small_seconds = sample(sampler, reduction.bqm, args.num_reads, args.seed)
+        start = time.time()
+        small = reduction.expand(small)
+        end_to_end = presolve_seconds + small_seconds + time.time() - start
+
+        full, full_seconds = sample(sampler, bqm, args.num_reads, args.seed)
+
+        small_energies = bqm.energies((small.record.sample, small.variables))
+        full_energies = full.record.energy
+        assert np.allclose(small_energies, small.record.energy)
+        lowest = min(small_energies.min(), full_energies.min())
+
+        def ground(energies, occurrences):
+            at = np.isclose(energies, lowest)
+            return occurrences[at].sum() / float(occurrences.sum())
+
+        print('{:<20} {:>5} {:>5} {:>8.4f}s | {:>8.4f}s {:>8.4f}s {:>6.1%} | '
+              '{:>8.4f}s {:>6.1%} {:>6.1f}x'.format(
+                  name, len(bqm), len(reduction.bqm), presolve_seconds,
+                  small_seconds, end_to_end,
+                  ground(small_energies, small.record.num_occurrences),
+                  full_seconds, ground(full_energies, full.record.num_occurrences),
+                  full_seconds / end_to_end))
+    print('\n(left: with presolve; right: the whole model. vars counts aux variables.)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import dwavebinarycsp
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from dwave_tutorials import canonical, circuits, cli, nqueens, stitchcache
+
+"""
+benchmarks-canonical.py
+-----------------------
+  Penalty searches and stitch time with dwave_tutorials.canonical
+  versus the exact-table cache in stitchcache.py, from a cold start.
+
+For each CSP we count its constraints, its distinct truth tables (what
+stitchcache.py searches for) and its distinct canonical forms (what
+canonical.py searches for), then stitch it both ways with empty
+in-memory caches, so every distinct shape costs a real search.
+
+The second table builds the n-queens CSP with add_constraint(func),
+which calls the function on every input for every constraint, versus
+ConstraintCompiler.constraint(), which calls it once per shape.
+
+Pass --plain to also time dwavebinarycsp.stitch(), which searches once
+for every constraint: 80 times for the four-queens board.
+"""
+
+
+def timed(function, *args, **kwargs):
+    start = time.time()
+    result = function(*args, **kwargs)
+    return result, time.time() - start
+
+
+def nand(in0, in1):
+    return not (in0 and in1)
+
+
+def any_(*args):
+    return any(args)
+
+
+def build(n, add):
+    # nqueens.csp(n), with add(csp, func, variables) adding each constraint.
+    names = nqueens.labels(n)
+    csp = dwavebinarycsp.ConstraintSatisfactionProblem(dwavebinarycsp.BINARY)
+    for kind, line in nqueens.lines(n):
+        if kind == 'row':
+            add(csp, any_, [names[s] for s in line])
+        i, j = np.triu_indices(len(line), k=1)
+        for a, b in zip(line[i], line[j]):
+            add(csp, nand, [names[a], names[b]])
+    return csp
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Canonical penalty models versus the exact-table cache.')
+    parser.add_argument('--min-classical-gap', type=float, default=2.0)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[4, 6, 8])
+    parser.add_argument('--plain', action='store_true',
+                        help='also time dwavebinarycsp.stitch() (slow)')
+    args = parser.parse_args()
+    gap = args.min_classical_gap
+
+    problems = [
+        ('full adder', circuits.full_adder_csp()),
+        ('2x2 multiplier', circuits.multiplier_2x2_csp()),
+        ('four queens', cli.load('fun/fun-four-queens.py').board_csp()),
+    ]
+
+    print('{:<15} {:>6} {:>6} {:>6} | {:>9} {:>8} | {:>9} {:>8} | {:>9}'.format(
+        'csp', 'consts', 'tables', 'canon', 'cache (s)', 'searches',
+        'canon (s)', 'searches', 'plain (s)'))
+    for name, csp in problems:
+        compiler = canonical.ConstraintCompiler(stitchcache.PenaltyModelCache(None))
+        tables, forms = set(), set()
+        for const in csp.constraints:
+            table = canonical.truth_table(const)
+            tables.add((len(table), table.tobytes()))
+            forms.add((len(table), compiler.canonical_form(table)[0]))
+
+        cache = stitchcache.PenaltyModelCache(None)
+        _, exact = timed(stitchcache.stitch, csp, gap, cache=cache)
+        _, fast = timed(compiler.stitch, csp, gap)
+        plain = '-'
+        if args.plain:
+            plain = '{:>9.3f}'.format(timed(dwavebinarycsp.stitch, csp, gap)[1])
+        print('{:<15} {:>6} {:>6} {:>6} | {:>9.3f} {:>8} | {:>9.3f} {:>8} | {:>9}'.format(
+            name, len(csp.constraints), len(tables), len(forms),
+            exact, cache.misses, fast, compiler.searches, plain))
+
+    print('\n{:>3} {:>6} | {:>15} | {:>15} {:>6}'.format(
+        'n', 'consts', 'add_constraint', 'compiler (s)', 'calls'))
+    for n in args.sizes:
+        _, plain = timed(build, n, lambda csp, func, variables:
+                         csp.add_constraint(func, variables))
+        compiler = canonical.ConstraintCompiler()
+        csp, fast = timed(build, n, lambda csp, func, variables:
+                          csp.add_constraint(compiler.constraint(func, variables)))
+        print('{:>3} {:>6} | {:>15.4f} | {:>15.4f} {:>6}'.format(
+            n, len(csp.constraints), plain, fast, compiler.evaluations))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+from neal import SimulatedAnnealingSampler
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from dwave_tutorials.coins import CoinFlipper
+from dwave_tutorials.mockqpu import MockQPUSampler
+
+"""
+benchmarks-coins.py
+-------------------
+  Coins per second: the fun-coin.py way (a dict QUBO and a loop over
+  every coin of every trial) versus dwave_tutorials.coins.CoinFlipper,
+  on the simulated annealer and on the stand-in QPU.
+
+The big run defaults to 100k coins x 5000 trials. Pass --trials 1000000
+for the full million; it streams, so only --batch trials are in memory
+at once.
+"""
+
+
+def tutorial_way(sampler, coins, trials, **parameters):
+    bqm = {}
+    for i in range(0, coins):
+        bqm[(i, i)] = 0
+    response = sampler.sample_qubo(bqm, num_reads=trials, **parameters)
+    distrib = [0] * (coins + 1)
+    for datum in response.data():
+        heads = 0
+        for key in datum.sample:
+            heads += datum.sample[key]
+        distrib[heads] += datum.num_occurrences
+    return distrib
+
+
+def report(name, coins, trials, seconds, qpu=None):
+    line = '{:<28} {:>7} coins x {:>8} trials {:>9.3f}s {:>14.0f} coins/s'.format(
+        name, coins, trials, seconds, coins * trials / seconds)
+    if qpu:
+        line += ' {:>14.0f} coins/s of QPU time'.format(qpu)
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Coin-flip throughput on the simulated annealer and a stand-in QPU.')
+    parser.add_argument('--coins', type=int, default=100000)
+    parser.add_argument('--trials', type=int, default=5000)
+    parser.add_argument('--batch', type=int, default=None)
+    parser.add_argument('--sweeps', type=int, default=1)
+    parser.add_argument('--qpu-trials', type=int, default=5000)
+    parser.add_argument('--annealing-time', type=float, default=20.0)
+    args = parser.parse_args()
+
+    sampler = SimulatedAnnealingSampler()
+
+    # The tutorial's own size first, both ways.
+    start = time.time()
+    tutorial_way(sampler, 2000, 5000, num_sweeps=args.sweeps)
+    report('fun-coin.py loop', 2000, 5000, time.time() - start)
+
+    flipper = CoinFlipper(sampler, 2000, num_sweeps=args.sweeps)
+    start = time.time()
+    flipper.histogram(5000)
+    report('CoinFlipper', 2000, 5000, time.time() - start)
+
+    flipper = CoinFlipper(sampler, args.coins, batch_size=args.batch, num_sweeps=args.sweeps)
+    start = time.time()
+    distrib = flipper.histogram(args.trials)
+    report('CoinFlipper, large', args.coins, args.trials, time.time() - start)
+    mean = np.dot(np.arange(len(distrib)), distrib) / distrib.sum()
+    print('    mean heads per trial {:.2f} (expected {:.1f})'.format(mean, args.coins / 2.0))
+
+    qpu = MockQPUSampler()
+    coins = len(qpu.nodelist)
+    flipper = CoinFlipper(qpu, coins, annealing_time=args.annealing_time)
+    start = time.time()
+    flipper.histogram(args.qpu_trials)
+    report('CoinFlipper, mock QPU', coins, args.qpu_trials, time.time() - start,
+           flipper.qpu_throughput())
+
+
+if __name__ == '__main__':
+    main()
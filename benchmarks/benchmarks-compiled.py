@@ -0,0 +1,107 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import dimod
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from dwave_tutorials import circuits, nqueens
+from dwave_tutorials.compiled import CompiledQUBO
+
+"""
+benchmarks-compiled.py
+----------------------
+  Energies and single-flip energy changes three ways: a loop over the Q
+  dict, dimod's BQM.energies(), and dwave_tutorials.compiled.CompiledQUBO.
+
+The flip test is what local search does all day: change one variable
+and ask how much the energy moved. With a dict that means computing the
+energy again; CompiledQUBO.delta() only looks at the variable's
+neighbors.
+"""
+
+
+def dict_energy(Q, sample):
+    return sum(bias * sample[u] * sample[v] for (u, v), bias in Q.items())
+
+
+def rate(count, seconds):
+    return '{:>12.0f}/s'.format(count / seconds)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare dict, dimod and compiled QUBO energy evaluation.')
+    parser.add_argument('--samples', type=int, default=100000)
+    parser.add_argument('--flips', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = np.random.RandomState(args.seed)
+    problems = [('NOT', circuits.not_qubo), ('AND', circuits.and_qubo)]
+    for n in (8, 16):
+        problems.append(('{} queens'.format(n), nqueens.bqm(n).to_qubo()[0]))
+
+    print('{:<10} {:>5} {:>14} {:>14} {:>14} {:>14} {:>14}'.format(
+        'problem', 'vars', 'dict energy', 'dimod energy', 'compiled', 'dict flip',
+        'compiled flip'))
+    for name, Q in problems:
+        qubo = CompiledQUBO.from_qubo(Q)
+        bqm = dimod.BinaryQuadraticModel.from_qubo(Q)
+        X = rng.randint(0, 2, size=(args.samples, len(qubo))).astype(np.int8)
+
+        loop = min(len(X), 2000)
+        start = time.time()
+        for row in X[:loop]:
+            dict_energy(Q, dict(zip(qubo.labels, row)))
+        dict_rate = rate(loop, time.time() - start)
+
+        start = time.time()
+        bqm.energies((X, qubo.labels))
+        dimod_rate = rate(len(X), time.time() - start)
+
+        start = time.time()
+        qubo.energies(X)
+        compiled_rate = rate(len(X), time.time() - start)
+
+        flips = rng.randint(0, len(qubo), size=args.flips)
+        x = X[0].copy()
+        sample = dict(zip(qubo.labels, x))
+        start = time.time()
+        for i in flips[:loop]:
+            v = qubo.labels[i]
+            before = dict_energy(Q, sample)
+            sample[v] = 1 - sample[v]
+            dict_energy(Q, sample) - before
+        dict_flip = rate(loop, time.time() - start)
+
+        start = time.time()
+        for i in flips:
+            qubo.delta(x, i)
+            x[i] ^= 1
+        compiled_flip = rate(len(flips), time.time() - start)
+
+        print('{:<10} {:>5} {} {} {} {} {}'.format(
+            name, len(qubo), dict_rate, dimod_rate, compiled_rate, dict_flip, compiled_flip))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import dimod
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from dwave_tutorials import circuits, nqueens, stitchcache
+from dwave_tutorials.embedcache import CachedEmbeddingComposite, EmbeddingCache, quality
+from dwave_tutorials.mockqpu import MockQPUSampler
+
+"""
+benchmarks-embedcache.py
+------------------------
+  Measure what CachedEmbeddingComposite saves on the tutorial problems.
+
+For every problem we time the first embedding (a cache miss, the same
+work EmbeddingComposite does on every call), then a cache hit. Then we
+warm the cache with --tries searches and report the chain length the
+cache ends up with. The cache is kept in memory, so nothing on disk is
+touched.
+"""
+
+
+def problems():
+    yield 'AND', dimod.BinaryQuadraticModel.from_qubo(circuits.and_qubo)
+    yield 'full adder', stitchcache.stitch(circuits.full_adder_csp(), min_classical_gap=3.0)
+    yield '2x2 multiplier', stitchcache.stitch(circuits.multiplier_2x2_csp())
+    yield '4-queens', nqueens.bqm(4)
+    yield '6-queens', nqueens.bqm(6)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Measure embedding time saved by CachedEmbeddingComposite.')
+    parser.add_argument('--topology', choices=['chimera', 'pegasus'], default='chimera')
+    parser.add_argument('--tries', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    qpu = MockQPUSampler(args.topology, broken_fraction=0.02, seed=args.seed)
+    sampler = CachedEmbeddingComposite(qpu, cache=EmbeddingCache(), seed=args.seed)
+
+    print('{:>15} {:>10} {:>10} {:>12} {:>12}'.format(
+        'problem', 'miss (s)', 'hit (s)', 'first chain', 'warm chain'))
+    for name, bqm in problems():
+        start = time.time()
+        first = sampler.find_embedding(bqm)
+        miss = time.time() - start
+
+        start = time.time()
+        sampler.find_embedding(bqm)
+        hit = time.time() - start
+
+        sampler.warm([bqm], tries=args.tries)
+        warm = sampler.find_embedding(bqm)
+
+        print('{:>15} {:>10.4f} {:>10.4f} {:>12} {:>12}'.format(
+            name, miss, hit, '{}/{}'.format(*quality(first)), '{}/{}'.format(*quality(warm))))
+    print('')
+    print('chain is longest chain/total qubits')
+    print(sampler.cache.report())
+
+
+if __name__ == '__main__':
+    main()
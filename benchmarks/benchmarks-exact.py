@@ -0,0 +1,73 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import dimod
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from dwave_tutorials import multiplier, nqueens
+from dwave_tutorials.exact import EnumerationSolver
+
+"""
+benchmarks-exact.py
+-------------------
+  Time to find every ground state: dimod.ExactSolver versus
+  dwave_tutorials.exact.EnumerationSolver, on random models of n
+  variables and on tutorial-sized problems.
+
+ExactSolver keeps all 2^n energies, so it is only run up to
+--exact-limit variables.
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare dimod.ExactSolver with the Gray code enumerator.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[12, 16, 20, 24, 28, 30])
+    parser.add_argument('--exact-limit', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    problems = [('random n={}'.format(n),
+                 dimod.generators.gnp_random_bqm(n, 0.5, 'BINARY', random_state=args.seed))
+                for n in args.sizes]
+    problems += [('4 queens', nqueens.bqm(4)),
+                 ('5 queens', nqueens.bqm(5)),
+                 ('3x3 multiplier, c=35', multiplier.multiplier_bqm(3, 3, c=35))]
+
+    solver = EnumerationSolver()
+    print('{:<22} {:>4} {:>12} {:>12} {:>14}'.format(
+        'problem', 'n', 'ExactSolver', 'enumerate', 'ground states'))
+    for name, bqm in problems:
+        exact = '-'
+        if len(bqm) <= args.exact_limit:
+            start = time.time()
+            dimod.ExactSolver().sample(bqm).lowest()
+            exact = '{:.3f}s'.format(time.time() - start)
+
+        start = time.time()
+        response = solver.sample(bqm)
+        seconds = time.time() - start
+        print('{:<22} {:>4} {:>12} {:>11.3f}s {:>14}'.format(
+            name, len(bqm), exact, seconds, response.info['degeneracy']))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import dwavebinarycsp
+from neal import SimulatedAnnealingSampler
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from dwave_tutorials import circuits, validate
+from dwave_tutorials.factoring import BatchFactorer
+
+"""
+benchmarks-factoring.py
+-----------------------
+  Factorizations per second: one stitch-and-sample per number (the way
+  logic-gates-2by2-multiplier.py does it) versus BatchFactorer.
+
+The numbers are random integers from 0 to 15. The per-number path is
+slow, so it is only run on the first --loop-limit numbers and its
+throughput is extrapolated from that.
+"""
+
+
+def factor_one(sampler, c, num_reads):
+    # The tutorial's way: stitch the CSP with C fixed, sample, check.
+    csp = circuits.multiplier_2x2_csp(c)
+    bqm = dwavebinarycsp.stitch(csp)
+    response = sampler.sample(bqm, num_reads=num_reads)
+    mask, valid, invalid = validate.check(csp, response)
+    found = set()
+    for datum, ok in zip(response.data(sorted_by=None), mask):
+        if ok:
+            sample = datum.sample
+            found.add((sample['a0'] + 2 * sample['a1'], sample['b0'] + 2 * sample['b1']))
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare per-number factoring against BatchFactorer.')
+    parser.add_argument('--count', type=int, default=5000)
+    parser.add_argument('--reads', type=int, default=100)
+    parser.add_argument('--loop-limit', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    numbers = [int(c) for c in np.random.RandomState(args.seed).randint(0, 16, size=args.count)]
+
+    sampler = SimulatedAnnealingSampler()
+    limit = min(args.loop_limit, len(numbers))
+    start = time.time()
+    for c in numbers[:limit]:
+        factor_one(sampler, c, args.reads)
+    loop_rate = limit / (time.time() - start)
+
+    start = time.time()
+    factorer = BatchFactorer(num_reads=args.reads)
+    setup = time.time() - start
+    results = factorer.factor(numbers)
+
+    print('{} numbers, {} reads per submission'.format(len(numbers), args.reads))
+    print('per number: {:>12.1f} factorizations/s (from {} numbers)'.format(loop_rate, limit))
+    print('batched:    {:>12.1f} factorizations/s (plus {:.3f}s one-time stitch)'.format(
+        factorer.throughput(), setup))
+    print('')
+    for c in sorted(results):
+        print('{:>2} = {}'.format(c, ', '.join('{}*{}'.format(a, b) for a, b in sorted(results[c]))
+                                   or 'no 2-bit factors'))
+
+
+if __name__ == '__main__':
+    main()
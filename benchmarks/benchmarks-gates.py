@@ -0,0 +1,97 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import dwavebinarycsp
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from dwave_tutorials import cli, nqueens, templates
+
+"""
+benchmarks-gates.py
+-------------------
+  Check every gate template, then time stitching the four-queens CSPs
+  from templates versus dwavebinarycsp.stitch().
+
+The first table verifies each template in dwave_tutorials.templates by
+brute force (every setting of its ports and aux variables) and prints
+its classical gap.
+
+The second table stitches the CSP from fun-four-queens.py and the
+n-queens CSPs from dwave_tutorials.nqueens, whose constraints are the
+opaque or4 / any_ and nand functions. templates.stitch() matches them
+to templates by truth table; dwavebinarycsp.stitch() searches for a
+penalty model for every one of them. The one-time cost of building the
+table of template forms is reported on its own.
+
+dwavebinarycsp.stitch() takes tens of seconds for a 4x4 board, so it is
+only run up to --stitch-max.
+"""
+
+
+def timed(function, *args, **kwargs):
+    start = time.time()
+    result = function(*args, **kwargs)
+    return result, time.time() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Gate templates versus dwavebinarycsp.stitch() on four queens.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[5, 6, 8])
+    parser.add_argument('--stitch-max', type=int, default=4,
+                        help='largest board to stitch (stitching is slow)')
+    parser.add_argument('--min-classical-gap', type=float, default=3.2)
+    args = parser.parse_args()
+
+    print('{:<10} {:>5} {:>4} {:>5} {:>10}'.format('template', 'ports', 'aux', 'gap',
+                                                   'verify (s)'))
+    for gate in templates.gates:
+        gap, seconds = timed(gate.verify)
+        print('{:<10} {:>5} {:>4} {:>5.1f} {:>10.4f}'.format(
+            gate.name, len(gate.ports), len(gate.aux), gap, seconds))
+
+    forms, seconds = timed(templates.forms)
+    print('\n{} template forms built in {:.4f}s (once per process)\n'.format(
+        len(forms), seconds))
+
+    problems = [('four-queens', 4, cli.load('fun/fun-four-queens.py').board_csp())]
+    problems += [('nqueens', n, nqueens.csp(n)) for n in args.sizes]
+
+    print('{:<12} {:>3} {:>6} | {:>13} {:>5} | {:>10} {:>5} | {:>8}'.format(
+        'csp', 'n', 'consts', 'templates (s)', 'vars', 'stitch (s)', 'vars', 'speedup'))
+    for name, n, csp in problems:
+        bqm, fast = timed(templates.stitch, csp, min_classical_gap=args.min_classical_gap)
+        row = '{:<12} {:>3} {:>6} | {:>13.4f} {:>5} | '.format(
+            name, n, len(csp.constraints), fast, len(bqm))
+        if n > args.stitch_max:
+            row += '{:>10} {:>5} | {:>8}'.format('skipped', '-', '-')
+        else:
+            try:
+                bqm, slow = timed(dwavebinarycsp.stitch, csp,
+                                  min_classical_gap=args.min_classical_gap)
+                row += '{:>10.4f} {:>5} | {:>7.0f}x'.format(slow, len(bqm), slow / fast)
+            except Exception as error:
+                row += '{:>10} {:>5} | {:>8}'.format('failed', '-', type(error).__name__[:8])
+        print(row)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import dimod
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from dwave_tutorials import multiplier, nqueens
+
+"""
+benchmarks-interning.py
+-----------------------
+  Memory and lookup cost of string labels versus the numbered variables
+  of dwave_tutorials.interning, on n-queens and the array multiplier.
+
+For each problem the model is built both ways: nqueens.bqm() and
+multiplier.multiplier_bqm() with string labels, nqueens.model() and
+multiplier.multiplier_model() with numbers and a LabelIndex. Then
+--num-reads random samples are put in a SampleSet for each (the same
+samples, so no sampler time is mixed in), and we time
+
+  build       building the model
+  memory      peak memory (tracemalloc) for building the model, plus
+              for making the SampleSet
+  per sample  reading every variable of every sample: sample[label]
+              through response.samples() with labels, a row of
+              LabelIndex.columns() with numbers
+  matrix      getting the sample matrix in the model's own variable
+              order, the way check_matrix() and compiled.py want it: a
+              column gather by label, or columns() (no copy)
+  output      turning the numbered response back into labels with
+              LabelIndex.sampleset(), the one place the labels are needed
+"""
+
+
+def timed(function, *args):
+    start = time.time()
+    result = function(*args)
+    return result, time.time() - start
+
+
+def measure(build, num_reads, seed):
+    # Build the model and a SampleSet of random samples, and the memory
+    # (tracemalloc) each took. The random samples are not counted.
+    tracemalloc.start()
+    built, build_seconds = timed(build)
+    memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    bqm, index = built if isinstance(built, tuple) else (built, None)
+
+    X = np.random.RandomState(seed).randint(2, size=(num_reads, bqm.num_variables))
+    X = X.astype(np.int8)
+    tracemalloc.start()
+    response = dimod.SampleSet.from_samples_bqm((X, list(bqm.variables)), bqm)
+    memory += tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return bqm, index, response, build_seconds, memory
+
+
+def labeled_lookups(response, labels):
+    total = 0
+    for sample in response.samples():
+        total += sum(int(sample[label]) for label in labels)
+    return total
+
+
+def numbered_lookups(X):
+    total = 0
+    for row in X:
+        total += int(row.sum())
+    return total
+
+
+def labeled_matrix(response, labels):
+    position = {v: i for i, v in enumerate(response.variables)}
+    return response.record.sample[:, [position[label] for label in labels]]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Memory and lookup cost of string labels versus numbered variables.')
+    parser.add_argument('--num-reads', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    problems = []
+    for n in (8, 16, 32):
+        problems.append(('{} queens'.format(n), lambda n=n: nqueens.bqm(n),
+                         lambda n=n: nqueens.model(n)))
+    for n, c in ((4, 143), (8, 143 * 251), (16, 40503 * 65521)):
+        problems.append(('{0}x{0} multiplier'.format(n),
+                         lambda n=n, c=c: multiplier.multiplier_bqm(n, n, c),
+                         lambda n=n, c=c: multiplier.multiplier_model(n, n, c)))
+
+    print('{:<17} {:>5} | {:>9} {:>9} | {:>9} {:>9} | {:>11} {:>11} | {:>9} {:>9} | {:>9}'.format(
+        '', 'vars', 'build', '', 'memory', '', 'per sample', '', 'matrix', '', 'output'))
+    print('{:<17} {:>5} | {:>9} {:>9} | {:>9} {:>9} | {:>11} {:>11} | {:>9} {:>9} | {:>9}'.format(
+        '', '', 'labels', 'numbers', 'labels', 'numbers', 'labels', 'numbers',
+        'labels', 'numbers', ''))
+    for name, labeled, numbered in problems:
+        bqm, _, response, build, memory = measure(labeled, args.num_reads, args.seed)
+        labels = list(bqm.variables)
+        total, lookup = timed(labeled_lookups, response, labels)
+        _, matrix = timed(labeled_matrix, response, labels)
+
+        bqm, index, numbered_response, fast_build, fast_memory = measure(
+            numbered, args.num_reads, args.seed)
+        X, fast_matrix = timed(index.columns, numbered_response)
+        fast_total, fast_lookup = timed(numbered_lookups, X)
+        assert fast_total == total
+        _, output = timed(index.sampleset, numbered_response)
+
+        per_sample = 1e6 / args.num_reads
+        print('{:<17} {:>5} | {:>8.4f}s {:>8.4f}s | {:>7.0f}kB {:>7.0f}kB | '
+              '{:>9.1f}us {:>9.1f}us | {:>8.4f}s {:>8.4f}s | {:>8.4f}s'.format(
+                  name, len(labels), build, fast_build, memory / 1e3, fast_memory / 1e3,
+                  lookup * per_sample, fast_lookup * per_sample,
+                  matrix, fast_matrix, output))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import dimod
+import minorminer
+from dwave.system.composites import FixedEmbeddingComposite
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from dwave_tutorials import circuits, nqueens, stitchcache
+from dwave_tutorials.mockqpu import MockQPUSampler
+
+"""
+benchmarks-mockqpu.py
+---------------------
+  Run the tutorial problems through the QPU code path, using the local
+  stand-in QPU from dwave_tutorials.mockqpu.
+
+For every problem we report how long minorminer took to find an
+embedding, how many physical qubits it used and the longest chain,
+the wall-clock time to sample, and the QPU access time the stand-in
+reports. Nothing here touches the network.
+"""
+
+
+def problems():
+    yield 'NOT', dimod.BinaryQuadraticModel.from_qubo(circuits.not_qubo)
+    yield 'AND', dimod.BinaryQuadraticModel.from_qubo(circuits.and_qubo)
+    yield 'full adder', stitchcache.stitch(circuits.full_adder_csp(), min_classical_gap=3.0)
+    yield '2x2 multiplier', stitchcache.stitch(circuits.multiplier_2x2_csp())
+    yield '4-queens', nqueens.bqm(4)
+    yield '8-queens', nqueens.bqm(8)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Run the tutorial problems on the stand-in QPU.')
+    parser.add_argument('--topology', choices=['chimera', 'pegasus'], default='chimera')
+    parser.add_argument('--broken-fraction', type=float, default=0.02)
+    parser.add_argument('--reads', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    qpu = MockQPUSampler(args.topology, broken_fraction=args.broken_fraction, seed=args.seed)
+    print('{} working graph: {} qubits, {} couplers'.format(
+        qpu.properties['chip_id'], len(qpu.nodelist), len(qpu.edgelist)))
+    print('{:>15} {:>6} {:>10} {:>7} {:>6} {:>10} {:>10}'.format(
+        'problem', 'vars', 'embed (s)', 'qubits', 'chain', 'wall (s)', 'qpu (s)'))
+
+    for name, bqm in problems():
+        start = time.time()
+        embedding = minorminer.find_embedding(
+            list(bqm.quadratic) or [(v, v) for v in bqm.variables], qpu.edgelist,
+            random_seed=args.seed)
+        embed_time = time.time() - start
+        if not embedding:
+            print('{:>15} {:>6} {:>10.4f}  no embedding found'.format(
+                name, bqm.num_variables, embed_time))
+            continue
+
+        sampler = FixedEmbeddingComposite(qpu, embedding)
+        start = time.time()
+        response = sampler.sample(bqm, num_reads=args.reads, seed=args.seed)
+        wall = time.time() - start
+
+        print('{:>15} {:>6} {:>10.4f} {:>7} {:>6} {:>10.4f} {:>10.4f}'.format(
+            name, bqm.num_variables, embed_time,
+            sum(len(chain) for chain in embedding.values()),
+            max(len(chain) for chain in embedding.values()),
+            wall, response.info['timing']['qpu_access_time'] / 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import dwavebinarycsp
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from dwave_tutorials import multiplier
+
+"""
+benchmarks-multiplier.py
+------------------------
+  Build time and size of N by N array multipliers from
+  dwave_tutorials.multiplier, versus stitching the same netlist.
+
+Stitching looks up or searches for a penalty model per gate, so it
+grows much faster; it only runs up to --stitch-limit bits.
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Build N by N multipliers from templates and with stitch().')
+    parser.add_argument('--widths', type=int, nargs='+', default=[2, 3, 4, 6, 8, 12, 16, 24, 32])
+    parser.add_argument('--stitch-limit', type=int, default=8)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print('{:>5} {:>6} {:>9} {:>9} {:>12} {:>12}'.format(
+        'bits', 'gates', 'variables', 'couplers', 'templates', 'stitch'))
+    for width in args.widths:
+        best = None
+        for _ in range(args.repeat):
+            start = time.time()
+            bqm = multiplier.multiplier_bqm(width, width)
+            seconds = time.time() - start
+            best = seconds if best is None else min(best, seconds)
+        gates = len(multiplier.array_multiplier(width, width).gates)
+
+        stitched = '-'
+        if width <= args.stitch_limit:
+            csp = multiplier.multiplier_csp(width, width)
+            start = time.time()
+            dwavebinarycsp.stitch(csp)
+            stitched = '{:.4f}s'.format(time.time() - start)
+
+        print('{:>5} {:>6} {:>9} {:>9} {:>11.4f}s {:>12}'.format(
+            width, gates, len(bqm), len(bqm.quadratic), best, stitched))
+
+
+if __name__ == '__main__':
+    main()
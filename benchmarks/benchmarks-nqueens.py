@@ -0,0 +1,78 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import dwavebinarycsp
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from dwave_tutorials import nqueens
+
+"""
+benchmarks-nqueens.py
+---------------------
+  Compare building the n-queens BQM directly against stitching the
+  n-queens CSP.
+
+For every board size we report build time, number of variables and
+number of interactions. The stitch() path builds the same OR plus NAND
+constraints as fun-four-queens.py and uses the same min_classical_gap.
+
+stitch() takes tens of seconds for a 4x4 board and grows quickly from
+there, so by default it is only run up to --stitch-max. It also cannot
+handle an OR of more than 8 variables, so boards larger than 8 always
+fail on the stitch() path.
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare nqueens.bqm() against dwavebinarycsp.stitch().')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(range(4, 13)))
+    parser.add_argument('--stitch-max', type=int, default=5,
+                        help='largest board to stitch (stitching is slow)')
+    parser.add_argument('--min-classical-gap', type=float, default=3.2)
+    args = parser.parse_args()
+
+    print('{:>3} | {:>10} {:>6} {:>8} | {:>10} {:>6} {:>8}'.format(
+        'n', 'direct (s)', 'vars', 'inters', 'stitch (s)', 'vars', 'inters'))
+    for n in args.sizes:
+        start = time.time()
+        bqm = nqueens.bqm(n)
+        direct = '{:>10.4f} {:>6} {:>8}'.format(
+            time.time() - start, bqm.num_variables, bqm.num_interactions)
+
+        if n > args.stitch_max:
+            stitched = '{:>10} {:>6} {:>8}'.format('skipped', '-', '-')
+        else:
+            start = time.time()
+            try:
+                bqm = dwavebinarycsp.stitch(
+                    nqueens.csp(n), min_classical_gap=args.min_classical_gap)
+                stitched = '{:>10.4f} {:>6} {:>8}'.format(
+                    time.time() - start, bqm.num_variables, bqm.num_interactions)
+            except Exception as error:
+                stitched = '{:>10} {:>6} {:>8}'.format(
+                    'failed', '-', type(error).__name__[:8])
+
+        print('{:>3} | {} | {}'.format(n, direct, stitched))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import dimod
+from neal import SimulatedAnnealingSampler
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from dwave_tutorials import nqueens
+from dwave_tutorials.parallel import ParallelSampler
+
+"""
+benchmarks-parallel.py
+----------------------
+  Measure how ParallelSampler scales with the number of worker
+  processes.
+
+Two workloads: the eight-queens BQM, and the coin-flip BQM from
+fun-coin.py (every qubit used, all biases 0). Each worker count is
+warmed up once before timing, so process startup is not counted.
+Speedup is relative to a single SimulatedAnnealingSampler().
+"""
+
+
+def workloads(coins):
+    coin = dimod.BinaryQuadraticModel.from_qubo({(i, i): 0 for i in range(coins)})
+    return [('8-queens', nqueens.bqm(8)), (str(coins)+' coins', coin)]
+
+
+def main():
+    cpus = os.cpu_count() or 1
+    default_workers = sorted(set([1, 2, 4, 8, 16, 32, cpus]) & set(range(1, cpus + 1)))
+
+    parser = argparse.ArgumentParser(
+        description='Measure ParallelSampler speedup across worker counts.')
+    parser.add_argument('--workers', type=int, nargs='+', default=default_workers)
+    parser.add_argument('--reads', type=int, default=5000)
+    parser.add_argument('--coins', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    for name, bqm in workloads(args.coins):
+        start = time.time()
+        SimulatedAnnealingSampler().sample(bqm, num_reads=args.reads, seed=args.seed)
+        serial = time.time() - start
+
+        print('{} ({} reads): serial {:.3f}s'.format(name, args.reads, serial))
+        print('{:>8} {:>10} {:>8} {:>11}'.format('workers', 'time (s)', 'speedup', 'efficiency'))
+        for workers in args.workers:
+            with ParallelSampler(num_workers=workers) as sampler:
+                sampler.sample(bqm, num_reads=workers, seed=args.seed)  # warm up
+                start = time.time()
+                response = sampler.sample(bqm, num_reads=args.reads, seed=args.seed)
+                seconds = time.time() - start
+            assert sum(response.record.num_occurrences) == args.reads
+            speedup = serial / seconds
+            print('{:>8} {:>10.3f} {:>7.2f}x {:>10.0f}%'.format(
+                workers, seconds, speedup, 100 * speedup / workers))
+        print('')
+
+
+if __name__ == '__main__':
+    main()
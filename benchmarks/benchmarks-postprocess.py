@@ -0,0 +1,75 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import argparse
+import os
+import sys
+
+from neal import SimulatedAnnealingSampler
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from dwave_tutorials import circuits, nqueens, postprocess, stitchcache, validate
+
+"""
+benchmarks-postprocess.py
+-------------------------
+  How many invalid samples dwave_tutorials.postprocess repairs, and what
+  it costs per 1000 samples.
+
+Short simulated anneals (a handful of sweeps) stand in for a noisy QPU:
+they return lots of near misses, like the 152 valid / 4848 invalid run
+in logic-gates-full-adder.py. Each response is checked as it came back,
+after steepest descent, and after descent plus a short tabu search.
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Measure valid rates and latency of descent post-processing.')
+    parser.add_argument('--num-reads', type=int, default=5000)
+    parser.add_argument('--sweeps', type=int, nargs='+', default=[1, 2, 5, 20])
+    parser.add_argument('--tabu-steps', type=int, nargs='+', default=[10, 50])
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    problems = [('full adder', circuits.full_adder_csp(), 3.0),
+                ('2x2 multiplier', circuits.multiplier_2x2_csp(), 2.0),
+                ('four queens', nqueens.csp(4), 2.0)]
+    modes = [('descent', 0)] + [('tabu {}'.format(t), t) for t in args.tabu_steps]
+
+    sampler = SimulatedAnnealingSampler()
+    print('{:<15} {:>6} {:>8}'.format('problem', 'sweeps', 'raw') +
+          ''.join(' {:>18}'.format(name) for name, _ in modes))
+    for name, csp, gap in problems:
+        bqm = stitchcache.stitch(csp, min_classical_gap=gap)
+        checker = validate.CompiledCSP(csp)
+        for sweeps in args.sweeps:
+            response = sampler.sample(bqm, num_reads=args.num_reads, num_sweeps=sweeps,
+                                      seed=args.seed)
+            _, valid, invalid = checker.check(response)
+            row = '{:<15} {:>6} {:>7.1%}'.format(name, sweeps, valid / (valid + invalid))
+            for _, tabu_steps in modes:
+                repaired = postprocess.repair(response, bqm, tabu_steps=tabu_steps)
+                _, valid, invalid = checker.check(repaired)
+                seconds = repaired.info['postprocessing']['seconds']
+                ms_per_1k = 1e6 * seconds / len(repaired)
+                row += ' {:>6.1%} {:>7.2f}ms'.format(valid / (valid + invalid), ms_per_1k)
+            print(row)
+    print('(each post-processing column: valid rate, added latency per 1000 samples)')
+
+
+if __name__ == '__main__':
+    main()
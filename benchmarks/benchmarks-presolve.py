@@ -0,0 +1,104 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import argparse
+import operator
+import os
+import sys
+import time
+
+import neal
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from dwave_tutorials import canonical, circuits, presolve, stitchcache, validate
+
+"""
+benchmarks-presolve.py
+----------------------
+  Stitch and sample time, with and without dwave_tutorials.presolve,
+  on the 2x2 multiplier and the full adder.
+
+The multiplier is run for every C that has 2-bit factors, with c3..c0
+fixed as in logic-gates-2by2-multiplier.py. The full adder is run with
+nothing fixed, with a and b fixed, and with a, b and cIn fixed.
+
+Stitching uses dwave_tutorials.canonical with an empty in-memory cache,
+so the times include the penalty model searches. Samples come from
+neal, and are checked against the original CSP after presolve.expand()
+has put the decided variables back.
+"""
+
+
+def fix(csp, fixed):
+    for v, value in sorted(fixed.items()):
+        csp.add_constraint(operator.truth if value else operator.not_, [v])
+    return csp
+
+
+def run(csp, use_presolve, sampler, num_reads, gap):
+    start = time.time()
+    presolved = presolve.presolve(csp) if use_presolve else None
+    presolve_seconds = time.time() - start
+    small = csp if presolved is None else presolved.csp
+
+    compiler = canonical.ConstraintCompiler(stitchcache.PenaltyModelCache(None))
+    start = time.time()
+    bqm = compiler.stitch(small, min_classical_gap=gap)
+    stitch_seconds = time.time() - start
+
+    start = time.time()
+    response = sampler.sample(bqm, num_reads=num_reads)
+    sample_seconds = time.time() - start
+    if presolved is not None:
+        response = presolved.expand(response)
+
+    _, valid, invalid = validate.check(csp, response)
+    return (len(bqm), presolve_seconds, stitch_seconds, sample_seconds,
+            valid / float(valid + invalid))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Stitch and sample time with and without presolve.')
+    parser.add_argument('--num-reads', type=int, default=1000)
+    args = parser.parse_args()
+
+    problems = []
+    for c in (0, 1, 2, 3, 4, 6, 9):
+        problems.append(('multiplier C={}'.format(c), 2.0,
+                         lambda c=c: circuits.multiplier_2x2_csp(c)))
+    for fixed in ({}, {'a': 1, 'b': 1}, {'a': 1, 'b': 0, 'cIn': 1}):
+        name = 'full adder ' + (' '.join('{}={}'.format(v, fixed[v]) for v in sorted(fixed))
+                                or 'free')
+        problems.append((name, 3.0, lambda fixed=fixed: fix(circuits.full_adder_csp(), fixed)))
+
+    sampler = neal.SimulatedAnnealingSampler()
+    print('{:<28} {:>5} | {:>5} {:>9} {:>9} {:>9} {:>6} | {:>5} {:>9} {:>9} {:>6}'.format(
+        '', 'vars', 'vars', 'presolve', 'stitch', 'sample', 'valid',
+        'vars', 'stitch', 'sample', 'valid'))
+    for name, gap, build in problems:
+        csp = build()
+        before = run(csp, False, sampler, args.num_reads, gap)
+        after = run(csp, True, sampler, args.num_reads, gap)
+        print('{:<28} {:>5} | {:>5} {:>8.4f}s {:>8.4f}s {:>8.4f}s {:>6.1%} | '
+              '{:>5} {:>8.4f}s {:>8.4f}s {:>6.1%}'.format(
+                  name, len(csp.variables), after[0], after[1], after[2], after[3], after[4],
+                  before[0], before[2], before[3], before[4]))
+    print('\n(left: with presolve; right: without. vars counts aux variables.)')
+
+
+if __name__ == '__main__':
+    main()
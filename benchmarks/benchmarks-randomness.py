@@ -0,0 +1,77 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+from neal import SimulatedAnnealingSampler
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from dwave_tutorials.coins import CoinFlipper
+from dwave_tutorials.mockqpu import MockQPUSampler
+from dwave_tutorials.randomness import RandomnessTests
+
+"""
+benchmarks-randomness.py
+------------------------
+  Runs the tests from dwave_tutorials.randomness over three bit
+  sources, and reports p-values and how many bits per second the tests
+  get through (not counting the time to make the bits).
+
+  - NumPy's generator, as a known-good reference
+  - the simulated annealer on fun-coin.py's empty model
+  - the stand-in QPU
+
+Expect most p-values to be well above 0.001 for all three.
+"""
+
+
+def run(name, num_coins, batches):
+    tests = RandomnessTests(num_coins)
+    for samples in batches:
+        tests.update(samples)
+    print('{}: {} bits, {:.1f} Mbit/s'.format(name, tests.bits, tests.throughput() / 1e6))
+    for test, statistic, p_value in tests.results():
+        print('    {:<14} {:>16.4f}   p = {:.4f}'.format(test, statistic, p_value))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Randomness tests on NumPy, simulated annealing and mock QPU coin flips.')
+    parser.add_argument('--coins', type=int, default=2000)
+    parser.add_argument('--trials', type=int, default=25000)
+    parser.add_argument('--qpu-trials', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = np.random.RandomState(args.seed)
+    batch = 5000
+    run('numpy', args.coins,
+        (rng.randint(0, 2, size=(min(batch, args.trials - start), args.coins), dtype=np.int8)
+         for start in range(0, args.trials, batch)))
+
+    flipper = CoinFlipper(SimulatedAnnealingSampler(), args.coins, num_sweeps=1)
+    run('simulated annealing', args.coins, flipper.batches(args.trials))
+
+    qpu = MockQPUSampler()
+    flipper = CoinFlipper(qpu, len(qpu.nodelist))
+    run('mock QPU', len(qpu.nodelist), flipper.batches(args.qpu_trials))
+
+
+if __name__ == '__main__':
+    main()
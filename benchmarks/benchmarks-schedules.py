@@ -0,0 +1,70 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from dwave_tutorials import schedules
+from dwave_tutorials.mockqpu import MockQPUSampler
+
+"""
+benchmarks-schedules.py
+-----------------------
+  Wall-clock time of an anneal schedule sweep with
+  dwave_tutorials.schedules.ScheduleSweep, serial versus several worker
+  threads, on the stand-in QPU with simulated latency (each call takes
+  as long as its reported QPU access time).
+
+The problem is the biased NOT gate from
+dwave-features-anneal-schedule.py.
+"""
+
+Q = {(0, 0): -1.1, (0, 4): 0, (4, 0): 2, (4, 4): -1}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Time an anneal schedule sweep at different concurrency levels.')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 16, 32])
+    parser.add_argument('--reads', type=int, default=100)
+    parser.add_argument('--table', action='store_true', help='print the results table')
+    args = parser.parse_args()
+
+    entries = schedules.grid(np.round(np.arange(0.1, 1.0, 0.1), 2),
+                             [0, 5, 20, 50, 100], [None, 1.0, 2.0, 5.0])
+    sampler = MockQPUSampler(simulate_latency=True)
+    print('{} schedules, {} reads each'.format(len(entries), args.reads))
+
+    serial = None
+    for workers in args.workers:
+        sweep = schedules.ScheduleSweep(sampler, Q, num_reads=args.reads, max_workers=workers)
+        rows = sweep.run(entries)
+        if serial is None:
+            serial = sweep.elapsed
+        print('{:>3} workers: {:>8.2f}s  ({:.1f}x)'.format(
+            workers, sweep.elapsed, serial / sweep.elapsed))
+
+    if args.table:
+        print('')
+        print(schedules.format_table(rows))
+
+
+if __name__ == '__main__':
+    main()
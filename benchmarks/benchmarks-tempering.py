@@ -0,0 +1,93 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+from neal import SimulatedAnnealingSampler
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from dwave_tutorials import circuits, nqueens, stitchcache, validate
+from dwave_tutorials.tempering import ParallelTemperingSampler
+
+"""
+benchmarks-tempering.py
+-----------------------
+  Time to the first valid solution: neal's SimulatedAnnealingSampler
+  versus dwave_tutorials.tempering.ParallelTemperingSampler.
+
+Each trial calls the sampler with --batch reads at a time, with a new
+seed each call, until some read passes the CSP check. The table shows
+the median time and number of reads that took over --trials trials, and
+the fraction of all reads that were valid.
+
+The problems are the stitched four-queens model from fun-four-queens.py
+(min_classical_gap=3.2) and the 2x2 multiplier.
+"""
+
+
+def first_valid(sampler, bqm, checker, batch, seed, params, max_reads):
+    start = time.time()
+    reads = valid = 0
+    while reads < max_reads:
+        response = sampler.sample(bqm, num_reads=batch, seed=seed + reads, **params)
+        mask = checker.check_matrix(response.record.sample, list(response.variables))
+        reads += batch
+        valid += int(mask.sum())
+        if mask.any():
+            return time.time() - start, reads, valid
+    return np.inf, reads, valid
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare time to first valid solution for annealing and tempering.')
+    parser.add_argument('--trials', type=int, default=20)
+    parser.add_argument('--batch', type=int, default=10)
+    parser.add_argument('--max-reads', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    problems = [('four queens', nqueens.csp(4), 3.2),
+                ('2x2 multiplier', circuits.multiplier_2x2_csp(), 2.0)]
+    samplers = [('neal, 1000 sweeps', SimulatedAnnealingSampler(), {}),
+                ('neal, 100 sweeps', SimulatedAnnealingSampler(), {'num_sweeps': 100}),
+                ('neal, 10 sweeps', SimulatedAnnealingSampler(), {'num_sweeps': 10}),
+                ('tempering, 100 sweeps', ParallelTemperingSampler(),
+                 {'num_sweeps': 100, 'answer_mode': 'raw'}),
+                ('tempering, 20 sweeps', ParallelTemperingSampler(),
+                 {'num_sweeps': 20, 'answer_mode': 'raw'})]
+
+    print('{:<15} {:<22} {:>12} {:>8} {:>8}'.format(
+        'problem', 'sampler', 'first valid', 'reads', 'valid'))
+    for name, csp, gap in problems:
+        bqm = stitchcache.stitch(csp, min_classical_gap=gap)
+        checker = validate.CompiledCSP(csp)
+        for label, sampler, params in samplers:
+            seconds, reads, valid = zip(*[
+                first_valid(sampler, bqm, checker, args.batch,
+                            args.seed + trial * args.max_reads, params, args.max_reads)
+                for trial in range(args.trials)])
+            print('{:<15} {:<22} {:>10.2f}ms {:>8.0f} {:>7.1%}'.format(
+                name, label, 1000 * np.median(seconds), np.median(reads),
+                sum(valid) / float(sum(reads))))
+
+
+if __name__ == '__main__':
+    main()
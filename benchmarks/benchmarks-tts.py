@@ -0,0 +1,220 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import argparse
+import json
+import math
+import operator
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+import dimod
+import dwavebinarycsp
+import dwavebinarycsp.factories.constraint.gates as gates
+import neal
+from dwave.system.composites import EmbeddingComposite
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from dwave_tutorials import circuits, cli, coins, stitchcache, templates, validate
+from dwave_tutorials.annealer import ScheduleAnnealingSampler
+from dwave_tutorials.mockqpu import MockQPUSampler
+from dwave_tutorials.tempering import ParallelTemperingSampler
+
+"""
+benchmarks-tts.py
+-----------------
+  Time to solution for every tutorial's model, across samplers and
+  num_reads, as JSON.
+
+For each tutorial (NOT, AND, full adder, 2x2 multiplier, four queens,
+coin) the model is built the way the tutorial builds it, then sampled
+with each sampler at each num_reads. Every run records
+
+  stitch_seconds      building the BQM (0 for NOT, AND and coin, which
+                      are written out by hand)
+  sample_seconds      the sampler call
+  validate_seconds    checking every read against the tutorial's CSP
+  valid_fraction      valid reads / all reads
+  tts99_seconds       time to solution at 99% confidence:
+                        t_read * log(1 - 0.99) / log(1 - p)
+                      where t_read is sample_seconds per read and p is
+                      valid_fraction. One read if p is 1, null if p is
+                      0 (never solved).
+
+Times are the median over --repeats runs. The coin has no wrong
+answers, so its valid fraction is always 1; it is there to track plain
+sampling speed.
+
+Write the results with --output and compare two files between commits
+to catch regressions. Stitching goes through the penalty model cache in
+stitchcache.py; pass --cold-stitch to time dwavebinarycsp.stitch()
+itself. Four queens is stitched with templates.stitch() either way, as
+in fun-four-queens.py.
+"""
+
+confidence = 0.99
+
+
+def tts(seconds_per_read, p, confidence=confidence):
+    """Expected time to see a valid read with the given confidence."""
+    if p <= 0.0:
+        return None
+    if p >= 1.0:
+        return seconds_per_read
+    return seconds_per_read * math.log(1.0 - confidence) / math.log(1.0 - p)
+
+
+def not_problem(stitch):
+    csp = dwavebinarycsp.ConstraintSatisfactionProblem(dwavebinarycsp.BINARY)
+    csp.add_constraint(operator.ne, [0, 4])
+    return dimod.BinaryQuadraticModel.from_qubo(circuits.not_qubo), csp
+
+
+def and_problem(stitch):
+    csp = dwavebinarycsp.ConstraintSatisfactionProblem(dwavebinarycsp.BINARY)
+    csp.add_constraint(gates.and_gate(['x1', 'x2', 'z']))
+    return dimod.BinaryQuadraticModel.from_qubo(circuits.and_qubo), csp
+
+
+def full_adder_problem(stitch):
+    csp = circuits.full_adder_csp()
+    return stitch(csp, min_classical_gap=3.0), csp
+
+
+def multiplier_problem(stitch):
+    csp = circuits.multiplier_2x2_csp()
+    return stitch(csp), csp
+
+
+def four_queens_problem(stitch):
+    # The tutorial's own board, stitched the way board_bqm() does it.
+    csp = cli.load('fun/fun-four-queens.py').board_csp()
+    return stitch(csp, using=templates.stitch, min_classical_gap=3.2), csp
+
+
+def coin_problem(stitch):
+    csp = dwavebinarycsp.ConstraintSatisfactionProblem(dwavebinarycsp.BINARY)
+    return coins.empty_bqm(range(50)), csp
+
+
+problems = [('not', not_problem), ('and', and_problem), ('full-adder', full_adder_problem),
+            ('2x2-multiplier', multiplier_problem), ('four-queens', four_queens_problem),
+            ('coin', coin_problem)]
+
+samplers = {
+    'neal': neal.SimulatedAnnealingSampler,
+    'annealer': ScheduleAnnealingSampler,
+    'tempering': ParallelTemperingSampler,
+    'mockqpu': lambda: EmbeddingComposite(MockQPUSampler()),
+}
+
+# Keep every read as its own row, so valid_fraction counts reads.
+sample_params = {'annealer': {'answer_mode': 'raw'}, 'tempering': {'answer_mode': 'raw'},
+                 'mockqpu': {'answer_mode': 'raw'}}
+
+
+def run(bqm, checker, sampler, num_reads, params):
+    start = time.time()
+    response = sampler.sample(bqm, num_reads=num_reads, **params)
+    sample_seconds = time.time() - start
+
+    start = time.time()
+    mask = checker.check_matrix(response.record.sample, list(response.variables))
+    valid = int(response.record.num_occurrences[mask].sum())
+    validate_seconds = time.time() - start
+
+    reads = int(response.record.num_occurrences.sum())
+    return sample_seconds, validate_seconds, valid / float(reads)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Time to solution for every tutorial model, as JSON.')
+    parser.add_argument('--problems', nargs='+', default=[name for name, _ in problems],
+                        choices=[name for name, _ in problems])
+    parser.add_argument('--samplers', nargs='+', default=['neal', 'annealer', 'tempering'],
+                        choices=sorted(samplers))
+    parser.add_argument('--num-reads', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--cold-stitch', action='store_true')
+    parser.add_argument('--output', help='write the JSON here instead of stdout')
+    args = parser.parse_args()
+
+    stitch = dwavebinarycsp.stitch if args.cold_stitch else stitchcache.stitch
+    results = []
+    for name, build in problems:
+        if name not in args.problems:
+            continue
+        stitch_seconds = []
+
+        def timed_stitch(csp, using=None, **kwargs):
+            start = time.time()
+            bqm = (using or stitch)(csp, **kwargs)
+            stitch_seconds.append(time.time() - start)
+            return bqm
+
+        bqm, csp = build(timed_stitch)
+        stitch_seconds = float(sum(stitch_seconds))
+        checker = validate.CompiledCSP(csp)
+
+        for sampler_name in args.samplers:
+            sampler = samplers[sampler_name]()
+            for num_reads in args.num_reads:
+                runs = [run(bqm, checker, sampler, num_reads,
+                            sample_params.get(sampler_name, {}))
+                        for _ in range(args.repeats)]
+                sample_seconds, validate_seconds, valid_fraction = np.median(runs, axis=0)
+                result = {
+                    'problem': name,
+                    'num_variables': len(bqm),
+                    'sampler': sampler_name,
+                    'num_reads': num_reads,
+                    'stitch_seconds': stitch_seconds,
+                    'sample_seconds': sample_seconds,
+                    'validate_seconds': validate_seconds,
+                    'valid_fraction': valid_fraction,
+                    'tts99_seconds': tts(sample_seconds / num_reads, valid_fraction),
+                }
+                results.append(result)
+                sys.stderr.write('{problem:<15} {sampler:<10} {num_reads:>6} '
+                                 'valid {valid_fraction:>6.1%}  tts99 {tts}\n'.format(
+                                     tts='-' if result['tts99_seconds'] is None else
+                                     '{:.6f}s'.format(result['tts99_seconds']),
+                                     **result))
+
+    report = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'versions': {'dimod': dimod.__version__, 'neal': neal.__version__,
+                     'numpy': np.__version__},
+        'confidence': confidence,
+        'repeats': args.repeats,
+        'cold_stitch': args.cold_stitch,
+        'results': results,
+    }
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import dimod
+import dwavebinarycsp
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from dwave_tutorials import validate
+
+"""
+benchmarks-validate.py
+----------------------
+  Compare the csp.check() loop from the tutorials against the batched
+  checker in dwave_tutorials.validate.
+
+We use the four-queens CSP from fun-four-queens.py and random samples,
+so no sampler is needed. Random samples are almost all invalid, which
+is the worst case for the batched checker (it cannot stop early) and
+the best case for the loop (csp.check() stops at the first broken
+constraint).
+
+The loop gets very slow at a million reads, so by default it is only
+timed on the first --loop-limit rows and the rest is extrapolated.
+Extrapolated times are marked with a '~'.
+"""
+
+
+def nand(in0, in1):
+    return not (in0 and in1)
+
+
+def or4(i0, i1, i2, i3):
+    return (i0 or i1 or i2 or i3)
+
+
+def four_queens_csp():
+    # Same constraints as fun-four-queens.py, built with loops.
+    csp = dwavebinarycsp.ConstraintSatisfactionProblem(dwavebinarycsp.BINARY)
+    cells = [(row, col) for row in range(1, 5) for col in range(1, 5)]
+    for row in range(1, 5):
+        csp.add_constraint(or4, ['x'+str(row)+str(col) for col in range(1, 5)])
+    for a in range(len(cells)):
+        for b in range(a + 1, len(cells)):
+            (r1, c1), (r2, c2) = cells[a], cells[b]
+            if (r1 == r2) or (c1 == c2) or (abs(r1 - r2) == abs(c1 - c2)):
+                csp.add_constraint(nand, ['x'+str(r1)+str(c1), 'x'+str(r2)+str(c2)])
+    return csp
+
+
+def loop_check(csp, response, limit):
+    # This is the tally loop from the tutorials.
+    valid, invalid, rows = 0, 0, 0
+    for datum in response.data(sorted_by=None):
+        if rows >= limit:
+            break
+        sample, energy, num = datum
+        if (csp.check(sample)):
+            valid = valid + num
+        else:
+            invalid = invalid + num
+        rows += 1
+    return valid, invalid, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare csp.check() against dwave_tutorials.validate.')
+    parser.add_argument('--reads', type=int, nargs='+', default=[1000, 100000, 1000000])
+    parser.add_argument('--loop-limit', type=int, default=20000,
+                        help='time the csp.check() loop on at most this many rows')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    csp = four_queens_csp()
+    labels = sorted(csp.variables)
+    rng = np.random.RandomState(args.seed)
+
+    print('{:>9} {:>12} {:>12} {:>9}'.format('reads', 'loop (s)', 'batched (s)', 'speedup'))
+    for reads in args.reads:
+        matrix = rng.randint(0, 2, size=(reads, len(labels))).astype(np.int8)
+        response = dimod.SampleSet.from_samples((matrix, labels), dimod.BINARY,
+                                                energy=np.zeros(reads))
+
+        start = time.time()
+        valid, invalid, rows = loop_check(csp, response, args.loop_limit)
+        loop_time = (time.time() - start) * reads / rows
+
+        start = time.time()
+        checker = validate.CompiledCSP(csp)
+        mask, batch_valid, batch_invalid = checker.check(response)
+        batch_time = time.time() - start
+
+        # Both approaches must agree on the rows the loop looked at.
+        assert valid == int(mask[:rows].sum())
+
+        mark = '~' if rows < reads else ' '
+        print('{:>9} {:>11.4f}{} {:>12.4f} {:>8.1f}x'.format(
+            reads, loop_time, mark, batch_time, loop_time / batch_time))
+
+
+if __name__ == '__main__':
+    main()
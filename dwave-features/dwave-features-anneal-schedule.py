@@ -14,13 +14,21 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-from dwave.system.samplers import DWaveSampler
+# The shared tutorial helpers live in the dwave_tutorials package at the
+# top of this repository.
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from dwave_tutorials import cli
+
+useQpu = False  # change this to use a live QPU
 
 """
 dwave-features-anneal-schedule.py
 ---------------------------------
   Tutorial for a custom annealing schedule
-  This tutorial only works with a live QPU.
+  To use a live QPU, set useQpu to True, or run with --sampler qpu.
+  Run with --help to see the other options.
   Caution: It is easy to eat up QPU time when experimenting with
   tutorials.
 
@@ -37,10 +45,17 @@ a different annealing schedule. Note that the annealing schedule is only
 appropriate for the D-Wave solver. There is no such thing as a custom
 anneal schedule for the simulated annealer or for the exact solver.
 
+Without a QPU, this tutorial uses ScheduleAnnealingSampler from
+dwave_tutorials/annealer.py instead. It is a simulated annealer whose
+temperature follows the anneal schedule: s=0 is hot, s=1 is cold, and
+a pause is a stretch of sweeps at one temperature. It is not quantum,
+but it lets you try out schedules without spending QPU time.
+
 Requirements
 ------------
 
-This tutorial can only be run on a live D-Wave QPU.
+The real anneal schedule needs a live D-Wave QPU. Without one, the
+simulated stand-in described above is used.
 
 FAQ
 ---
@@ -71,6 +86,12 @@ Why would I change the annealing schedule?
   annealing cycle can produce better results, but investigating those
   details is an area of active research.
 
+How do I find out which schedule works best?
+  Try a lot of them. dwave_tutorials/schedules.py builds a grid of
+  schedules from pause points, pause lengths and quench times, checks
+  them all before spending any QPU time, submits several at once, and
+  prints the probability of getting the ground state for each one.
+
 References
 ----------
 
@@ -119,25 +140,38 @@ def anneal_sched_custom_3():
         (20.0, 1.0)   # End the full anneal at 20µs
     )
 
-print('Boolean NOT Gate with Default Annealing Schedule')
-sampler = DWaveSampler()
+schedules = [anneal_sched_custom_1, anneal_sched_custom_2, anneal_sched_custom_3]
+
 # We put a small bias for qubit 0 to see if the annealing schedule
 # makes a difference in the distribution of solutions.
 Q = {(0, 0): -1.1, (0, 4): 0, (4, 0): 2, (4, 4): -1}
 
-response_1 = sampler.sample_qubo(Q, anneal_schedule=anneal_sched_custom_1(), num_reads=1000)
-response_2 = sampler.sample_qubo(Q, anneal_schedule=anneal_sched_custom_2(), num_reads=1000)
-response_3 = sampler.sample_qubo(Q, anneal_schedule=anneal_sched_custom_3(), num_reads=1000)
-
-print('Anneal schedule 1:')
-for sample, energy, num_occurrences in response_1.data():
-    print(sample, "Energy: ", energy, "Occurrences: ", num_occurrences)
-print('Anneal schedule 2:')
-for sample, energy, num_occurrences in response_2.data():
-    print(sample, "Energy: ", energy, "Occurrences: ", num_occurrences)
-print('Anneal schedule 3:')
-for sample, energy, num_occurrences in response_3.data():
-    print(sample, "Energy: ", energy, "Occurrences: ", num_occurrences)
+
+def solve(sampler, num_reads=1000, seed=None):
+    """One response per schedule, in order."""
+    return [sampler.sample_qubo(Q, **cli.sample_params(sampler, seed, anneal_schedule=schedule(),
+                                                       num_reads=num_reads))
+            for schedule in schedules]
+
+
+def main(argv=None):
+    # At the top of this file, set useQpu to True to use a live QPU.
+    # Without one we use the simulated ScheduleAnnealingSampler.
+    args = cli.parser('Tutorial for a custom annealing schedule.', num_reads=1000,
+                      use_qpu=useQpu, sampler='annealer').parse_args(argv)
+    say = cli.narrator(args.quiet)
+
+    say('Boolean NOT Gate with Default Annealing Schedule')
+    responses = solve(cli.make_sampler(args.sampler), args.num_reads, args.seed)
+
+    for number, response in enumerate(responses, 1):
+        print('Anneal schedule %d:' % number)
+        for sample, energy, num_occurrences in response.data():
+            print(sample, "Energy: ", energy, "Occurrences: ", num_occurrences)
+
+
+if __name__ == '__main__':
+    main()
 
 """
 If we run it enough times, we can see some anomalies in the output.
@@ -0,0 +1,28 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+dwave_tutorials
+---------------
+  Shared helpers for the tutorials in this repository.
+
+The tutorials themselves are meant to be read top to bottom, so they
+keep most of their code inline. Anything that several tutorials (or the
+benchmarks) need lives here instead. Each module is imported on its
+own, for example:
+
+  from dwave_tutorials import validate
+"""
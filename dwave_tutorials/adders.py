@@ -0,0 +1,187 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+adders.py
+---------
+  k-bit adders built out of full adders and gates.
+
+logic-gates-full-adder.py adds three bits. Chain k of them together,
+each one's carry out wired to the next one's carry in, and you have a
+k-bit ripple-carry adder:
+
+  a0 b0 cin -> s0 k1,   a1 b1 k1 -> s1 k2,   ...,   -> s(k-1) sk
+
+The carry-lookahead adder computes the same sum without waiting for the
+carries to ripple. For every bit it makes
+
+  g_i = a_i AND b_i   (this bit generates a carry)
+  p_i = a_i XOR b_i   (this bit passes a carry along)
+
+which is exactly a half adder, and then combines the (g, p) pairs in
+log2(k) rounds (a Kogge-Stone prefix network):
+
+  G = G_hi OR (P_hi AND G_lo),   P = P_hi AND P_lo
+
+After the last round, G at bit i is the carry into bit i + 1, and the
+sum bits are s_i = p_i XOR carry_i. It takes more gates than the ripple
+adder, but the longest path through it only grows like log k.
+
+Both adders use the shared gate templates from templates.py, and wire
+gates together by giving their variables the same name. The inputs are
+a0..a(k-1), b0..b(k-1) and, with carry_in=True, cin. The sum is s0..sk
+(sk is the carry out). Each builder returns the circuit and a variable
+map {'a': [...], 'b': [...], 'cin': [...], 's': [...]} listing those
+labels, least significant bit first.
+
+Usage:
+
+  from dwave_tutorials import adders
+
+  bqm, variables = adders.adder_bqm(8, kind='lookahead')
+  response = sampler.sample(bqm, num_reads=100)
+  a = adders.decode(response, variables['a'])
+"""
+
+import numpy as np
+
+from dwave_tutorials import templates
+
+
+def _variables(k, carry_in):
+    return {
+        'a': ['a{}'.format(i) for i in range(k)],
+        'b': ['b{}'.format(i) for i in range(k)],
+        'cin': ['cin'] if carry_in else [],
+        's': ['s{}'.format(i) for i in range(k + 1)],
+    }
+
+
+def ripple_carry_adder(k, carry_in=False):
+    """A k-bit ripple-carry adder: a chain of full adders.
+
+    Without carry_in, bit 0 only has two inputs and gets a half adder.
+    Returns (circuit, variables).
+    """
+    if k < 1:
+        raise ValueError('an adder needs at least 1 bit, got {}'.format(k))
+    variables = _variables(k, carry_in)
+    circuit = templates.Circuit()
+    carry = 'cin' if carry_in else None
+    for i in range(k):
+        carry_out = 's{}'.format(k) if i == k - 1 else 'k{}'.format(i + 1)
+        if carry is None:
+            circuit.add(templates.half_adder, ['a0', 'b0', 's0', carry_out])
+        else:
+            circuit.add(templates.full_adder,
+                        ['a{}'.format(i), 'b{}'.format(i), carry, 's{}'.format(i), carry_out])
+        carry = carry_out
+    return circuit, variables
+
+
+def carry_lookahead_adder(k, carry_in=False):
+    """A k-bit carry-lookahead (Kogge-Stone) adder.
+
+    Returns (circuit, variables).
+    """
+    if k < 1:
+        raise ValueError('an adder needs at least 1 bit, got {}'.format(k))
+    variables = _variables(k, carry_in)
+    circuit = templates.Circuit()
+
+    # Generate and propagate for every bit. Without a carry in, p0 is
+    # already the sum bit s0.
+    p = ['p{}'.format(i) for i in range(k)]
+    if not carry_in:
+        p[0] = 's0'
+    g = ['g{}'.format(i) for i in range(k)]
+    for i in range(k):
+        circuit.add(templates.half_adder, ['a{}'.format(i), 'b{}'.format(i), p[i], g[i]])
+
+    G, P = list(g), list(p)
+    if carry_in:
+        # Fold the carry in into bit 0: G0 = g0 OR (p0 AND cin).
+        circuit.add(templates.and_gate, [p[0], 'cin', 'pc0'])
+        circuit.add(templates.or_gate, [g[0], 'pc0', 'gc0'])
+        G[0] = 'gc0'
+
+    d, level = 1, 0
+    while d < k:
+        level += 1
+        nextG, nextP = list(G), list(P)
+        for i in range(d, k):
+            and_wire = 'x{}_{}'.format(level, i)
+            nextG[i] = 'G{}_{}'.format(level, i)
+            circuit.add(templates.and_gate, [P[i], G[i - d], and_wire])
+            circuit.add(templates.or_gate, [G[i], and_wire, nextG[i]])
+            if i >= 2 * d:
+                # P is only needed by later rounds while it can still
+                # reach further left than bit 0.
+                nextP[i] = 'P{}_{}'.format(level, i)
+                circuit.add(templates.and_gate, [P[i], P[i - d], nextP[i]])
+        G, P = nextG, nextP
+        d *= 2
+
+    # G[i] is now the carry out of bit i.
+    carries = (['cin'] if carry_in else [None]) + G[:-1]
+    for i in range(k):
+        if carries[i] is not None:
+            circuit.add(templates.xor_gate, [p[i], carries[i], 's{}'.format(i)])
+
+    # The last carry out is the top sum bit.
+    carry_out = 's{}'.format(k)
+    circuit.gates = [(template, [carry_out if wire == G[-1] else wire for wire in wires])
+                     for template, wires in circuit.gates]
+    return circuit, variables
+
+
+builders = {
+    'ripple': ripple_carry_adder,
+    'lookahead': carry_lookahead_adder,
+}
+
+
+def adder_bqm(k, kind='ripple', carry_in=False, strength=1.0):
+    """The BQM of a k-bit adder and its variable map.
+
+    kind is 'ripple' or 'lookahead'. strength scales every gate penalty.
+    """
+    if kind not in builders:
+        raise ValueError('unknown adder {!r}, expected one of {}'.format(
+            kind, ', '.join(sorted(builders))))
+    circuit, variables = builders[kind](k, carry_in=carry_in)
+    return circuit.bqm(strength=strength), variables
+
+
+def decode(response, bits):
+    """The integer on bits (least significant first) in every read.
+
+    Returns an integer array with one entry per row of response.record.
+    """
+    column = {v: i for i, v in enumerate(response.variables)}
+    samples = response.record.sample
+    value = np.zeros(len(samples), dtype=object if len(bits) > 62 else np.int64)
+    for i, v in enumerate(bits):
+        value += samples[:, column[v]].astype(value.dtype) << i
+    return value
+
+
+def valid(response, variables):
+    """Boolean mask of the reads where a + b (+ cin) == s."""
+    total = decode(response, variables['a']) + decode(response, variables['b'])
+    if variables['cin']:
+        total = total + decode(response, variables['cin'])
+    return total == decode(response, variables['s'])
@@ -0,0 +1,169 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+aggregate.py
+------------
+  Count distinct solutions without building a string for every read.
+
+The tutorials aggregate results like this:
+
+  for datum in response.data():
+      sample, energy, num = datum
+      result = <draw the board or build a bit string from sample>
+      answers[result] += num
+
+That builds a Sample namedtuple, a dict, and a string for every read.
+With a million reads, that is a lot of garbage for what usually ends up
+being a handful of distinct answers.
+
+Instead, we walk the response's sample matrix a chunk of rows at a
+time. Each row is packed into bytes (8 variables per byte), distinct
+rows in the chunk are counted with NumPy, and only the packed key and
+its count are kept. Memory grows with the number of distinct solutions,
+not with num_reads. Strings are built only for the answers you print.
+
+Usage:
+
+  from dwave_tutorials import aggregate, validate
+
+  checker = validate.CompiledCSP(csp)
+  counter = aggregate.aggregate(response, ['x1', 'x2', 'x3', 'x4'],
+                                check=checker.check_matrix)
+  for row, num in counter.most_common(10):
+      print(row, num)
+  print(counter.valid, counter.invalid)
+"""
+
+from collections import Counter
+
+import numpy as np
+
+# How many rows of the sample matrix to look at in one go.
+chunk_size = 65536
+
+
+def _bits(samples):
+    # Works for both BINARY (0/1) and SPIN (-1/+1) samples.
+    return np.asarray(samples) > 0
+
+
+class SolutionCounter(object):
+    """Counts of distinct rows, keyed by packed bits.
+
+    variables are the labels of the columns that make up a solution.
+    If check is given, it is called as check(samples, labels) on every
+    chunk and must return a boolean mask; only rows where the mask is
+    True are counted as solutions.
+    """
+
+    def __init__(self, variables, check=None):
+        self.variables = list(variables)
+        self.check = check
+        self.counts = Counter()
+        self.valid = 0
+        self.invalid = 0
+
+    def add(self, samples, labels=None, num_occurrences=None):
+        """Add a chunk of samples.
+
+        samples is a 2D array (rows x columns). labels names its columns;
+        if omitted the columns must already be in self.variables order.
+        """
+        samples = np.asarray(samples)
+        if num_occurrences is None:
+            num_occurrences = np.ones(samples.shape[0], dtype=np.int64)
+        num_occurrences = np.asarray(num_occurrences)
+
+        if self.check is not None:
+            mask = self.check(samples, labels if labels is not None else self.variables)
+            self.invalid += int(num_occurrences[~mask].sum())
+            samples = samples[mask]
+            num_occurrences = num_occurrences[mask]
+        self.valid += int(num_occurrences.sum())
+
+        if labels is not None:
+            position = {v: i for i, v in enumerate(labels)}
+            samples = samples[:, [position[v] for v in self.variables]]
+
+        if samples.shape[0] == 0:
+            return
+        packed = np.packbits(_bits(samples), axis=1, bitorder='little')
+        # View each packed row as one opaque value so np.unique can
+        # compare whole rows at once.
+        rows = np.ascontiguousarray(packed).view(
+            np.dtype((np.void, packed.shape[1]))).ravel()
+        keys, first, inverse = np.unique(rows, return_index=True, return_inverse=True)
+        totals = np.bincount(inverse.ravel(), weights=num_occurrences)
+        # New keys go into counts in the order their rows came in.
+        for i in np.argsort(first, kind='stable'):
+            self.counts[keys[i].tobytes()] += int(totals[i])
+
+    def unpack(self, key):
+        """Turn a packed key back into an array of 0/1 values."""
+        bits = np.unpackbits(np.frombuffer(key, dtype=np.uint8), bitorder='little')
+        return bits[:len(self.variables)]
+
+    def most_common(self, k=None):
+        """Return [(row, count), ...] for the k most common solutions.
+
+        row is an array of 0/1 values in self.variables order.
+        """
+        return [(self.unpack(key), num) for key, num in self.counts.most_common(k)]
+
+    def items(self):
+        """Return [(row, count), ...] in the order the rows were first added."""
+        return [(self.unpack(key), num) for key, num in self.counts.items()]
+
+    def __len__(self):
+        return len(self.counts)
+
+
+def aggregate(response, variables=None, check=None, chunk_size=chunk_size,
+              sorted_by=None):
+    """Count distinct solutions in a response, one chunk at a time.
+
+    variables defaults to all the variables in the response. Use a
+    subset to leave out aux variables from stitch(). sorted_by is a
+    field of response.record to walk the rows in (as in
+    response.data()), so that items() lists, say, the lowest energy
+    solutions first; None walks them in record order.
+    """
+    labels = list(response.variables)
+    counter = SolutionCounter(labels if variables is None else variables, check)
+    record = response.record
+    if sorted_by is not None:
+        record = record[np.argsort(record[sorted_by], kind='stable')]
+    for start in range(0, len(record), chunk_size):
+        chunk = record[start:start + chunk_size]
+        counter.add(chunk.sample, labels, chunk.num_occurrences)
+    return counter
+
+
+def count_ones(response, chunk_size=chunk_size):
+    """Histogram of how many variables are 1 in each read.
+
+    Returns an array where entry n is the number of reads with exactly
+    n variables set. This is the heads-per-trial count from fun-coin.py.
+    """
+    record = response.record
+    distrib = np.zeros(len(response.variables) + 1, dtype=np.int64)
+    for start in range(0, len(record), chunk_size):
+        chunk = record[start:start + chunk_size]
+        heads = _bits(chunk.sample).sum(axis=1)
+        distrib += np.bincount(heads, weights=chunk.num_occurrences,
+                               minlength=len(distrib)).astype(np.int64)
+    return distrib
@@ -0,0 +1,157 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+annealer.py
+-----------
+  A simulated annealer that follows a QPU anneal schedule.
+
+dwave-features-anneal-schedule.py says there is no such thing as a
+custom anneal schedule for the simulated annealer. That is true of
+neal's SimulatedAnnealingSampler, but simulated annealing has a
+schedule of its own: the inverse temperature beta, which starts small
+(hot, anything goes) and ends large (cold, only downhill moves). The
+QPU's anneal fraction s plays the same role -- at s=0 nothing is
+settled, at s=1 the answer is frozen in.
+
+ScheduleAnnealingSampler maps one onto the other:
+
+  - time is turned into sweeps, sweeps_per_us sweeps per microsecond
+    (the same rate MockQPUSampler uses)
+  - for each sweep, s is read off the schedule at that time (straight
+    lines between the points, just like the QPU)
+  - s becomes beta on a geometric scale: beta_min at s=0, beta_max at
+    s=1
+
+So a pause at s=0.4 is a run of sweeps at one temperature, a quench is
+a jump to cold in a handful of sweeps, and a reverse anneal (starting
+and ending at s=1, from an initial_state) heats a known answer up and
+cools it back down.
+
+The annealing itself is done with NumPy, all reads at once: each sweep
+visits the variables in turn, and every read's Metropolis step for that
+variable is one vectorized operation.
+
+Usage:
+
+  from dwave_tutorials.annealer import ScheduleAnnealingSampler
+
+  sampler = ScheduleAnnealingSampler()
+  response = sampler.sample_qubo(Q, anneal_schedule=schedule, num_reads=1000)
+"""
+
+import numpy as np
+import dimod
+
+from dwave_tutorials.compiled import CompiledQUBO
+from dwave_tutorials.mockqpu import (default_annealing_time, sweeps_per_us,
+                                     validate_anneal_schedule)
+
+
+def default_beta_range(bqm):
+    """(hot, cold) betas for bqm, the same rule of thumb neal uses.
+
+    Hot: the biggest possible uphill flip is accepted half the time.
+    Cold: the smallest one is accepted 1% of the time.
+    """
+    h, (rows, cols, J), offset = bqm.spin.to_numpy_vectors()
+    strength = np.abs(h).astype(float)
+    np.add.at(strength, rows, np.abs(J))
+    np.add.at(strength, cols, np.abs(J))
+    biggest = 2.0 * strength.max() if len(strength) else 0.0
+    nonzero = np.abs(np.concatenate([h, J]))
+    nonzero = nonzero[nonzero > 0]
+    smallest = 2.0 * nonzero.min() if len(nonzero) else 0.0
+    if biggest == 0.0:
+        return 0.1, 1.0
+    return np.log(2.0) / biggest, np.log(100.0) / smallest
+
+
+def beta_schedule(anneal_schedule, beta_range, sweeps_per_us=sweeps_per_us):
+    """One beta per sweep for an anneal schedule of (time, s) points."""
+    points = np.asarray(anneal_schedule, dtype=float)
+    total = points[-1, 0]
+    num_sweeps = max(1, int(round(sweeps_per_us * total)))
+    # Each sweep takes the s at the middle of its slice of time.
+    times = (np.arange(num_sweeps) + 0.5) * (total / num_sweeps)
+    s = np.interp(times, points[:, 0], points[:, 1])
+    hot, cold = beta_range
+    return hot * (cold / hot) ** s
+
+
+class ScheduleAnnealingSampler(dimod.Sampler):
+    """Simulated annealing driven by a QPU-style anneal_schedule.
+
+    With neither anneal_schedule nor annealing_time, it runs the
+    standard 20us forward anneal. Like the QPU, identical reads are
+    merged unless answer_mode='raw'.
+    """
+
+    def __init__(self, sweeps_per_us=sweeps_per_us):
+        self.sweeps_per_us = sweeps_per_us
+
+    @property
+    def properties(self):
+        return {'sweeps_per_us': self.sweeps_per_us}
+
+    @property
+    def parameters(self):
+        return {'num_reads': [], 'anneal_schedule': [], 'annealing_time': [],
+                'beta_range': [], 'initial_state': [], 'seed': [], 'answer_mode': []}
+
+    def sample(self, bqm, num_reads=1, anneal_schedule=None, annealing_time=None,
+               beta_range=None, initial_state=None, seed=None, answer_mode='histogram'):
+        if anneal_schedule is not None and annealing_time is not None:
+            raise ValueError('annealing_time and anneal_schedule are mutually exclusive')
+        if anneal_schedule is not None:
+            # Any number of points is fine here; the other QPU rules apply.
+            schedule = validate_anneal_schedule(anneal_schedule, max_points=np.inf,
+                                                time_range=(0.0, np.inf))
+        else:
+            time = default_annealing_time if annealing_time is None else float(annealing_time)
+            schedule = [(0.0, 0.0), (time, 1.0)]
+        reverse = schedule[0][1] == 1.0
+        if reverse and initial_state is None:
+            raise ValueError('a reverse anneal needs an initial_state')
+
+        labels = list(bqm.variables)
+        qubo = CompiledQUBO.from_bqm(bqm, labels)
+        betas = beta_schedule(schedule, beta_range or default_beta_range(bqm),
+                              self.sweeps_per_us)
+
+        rng = np.random.RandomState(seed)
+        if initial_state is not None:
+            state = np.array([initial_state[v] for v in labels], dtype=np.int8)
+            if bqm.vartype is dimod.SPIN:
+                state = (state > 0).astype(np.int8)
+            X = np.tile(state, (num_reads, 1))
+        else:
+            X = rng.randint(0, 2, size=(num_reads, len(labels))).astype(np.int8)
+
+        for beta in betas:
+            threshold = np.log(rng.random_sample(X.shape)) / beta
+            for i in range(len(labels)):
+                # Metropolis: accept if exp(-beta * delta) > u, that is
+                # -delta > log(u) / beta.
+                flip = -qubo.column_delta(X, i) > threshold[:, i]
+                X[flip, i] ^= 1
+
+        samples = X if bqm.vartype is dimod.BINARY else 2 * X - 1
+        response = dimod.SampleSet.from_samples_bqm((samples, labels), bqm)
+        if answer_mode == 'histogram':
+            response = response.aggregate()
+        response.info['num_sweeps'] = len(betas)
+        return response
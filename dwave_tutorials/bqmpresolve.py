@@ -0,0 +1,301 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+bqmpresolve.py
+--------------
+  Shrink a binary quadratic model before sampling, and grow the
+  samples back afterwards.
+
+presolve.py works on the CSP. This works on the model itself, so it
+also takes models that never were a CSP (the NOT and AND QUBOs, the
+template multipliers, n-queens) and everything stitch() adds, like the
+aux variables. Over and over until nothing changes, it:
+
+  - fixes the variables that roof duality says take the same value in
+    every lowest-energy state (strict persistencies, from
+    dwave.preprocessing)
+  - fixes variables with no couplings left to whichever value has the
+    lower bias (0, or -1 for SPIN, on a tie)
+  - merges pairs of variables that are equal, or opposite, in every
+    lowest-energy state. In SPIN form, s_u has to follow s_v when
+    |J_uv| > |h_u| + the sum of |J_uw| over u's other neighbors w: no
+    matter what the rest does, the J_uv term wins.
+  - probes: fixes each variable to 0 and to 1 in turn, and runs roof
+    duality on what is left. Its lower bound says no state on that side
+    beats it. If that is above the energy of a state we already have
+    (from a short descent and tabu search, postprocess.py, or from a
+    probe that fixed everything), the lowest-energy states are all on
+    the other side, and the variable is fixed there. Plain roof duality
+    finds nothing in the 2x2 template multiplier with C fixed; probing
+    decides all of it.
+  - eliminates variables with at most two neighbors. With x_a's best
+    value filled in, h_a x_a + J_ap x_a x_p + J_aq x_a x_q becomes
+    min(0, h_a + J_ap x_p + J_aq x_q), a function of two binary
+    variables, and every function of two binary variables is a QUBO.
+    That can couple p and q, but each of them loses its coupling to
+    x_a at the same time, so no neighbor's degree grows, and
+    eliminating one variable can bring the next one down to two.
+
+Fixing and merging are substitutions, and elimination keeps the best
+value of what it removes, so every energy of the smaller model is the
+energy of the lifted state of the original. The lowest-energy states of
+the smaller model lift to lowest-energy states of the original.
+
+Reduction records each step. lift() replays them backwards on a whole
+sample matrix, one NumPy column operation per removed variable, and
+expand() does the same for a SampleSet.
+
+Usage:
+
+  from dwave_tutorials import bqmpresolve
+
+  reduction = bqmpresolve.reduce(bqm)
+  print(reduction.report())
+  response = reduction.expand(sampler.sample(reduction.bqm, num_reads=100))
+
+How much goes depends a lot on the model. The gate QUBOs and the 2x2
+template multiplier with C fixed go away entirely, and four queens
+loses two thirds of its variables, but the stitched full adder, the
+4x4 multiplier and 8 queens come through untouched: their roof duality
+bounds are far below their ground energy, so no probe gets cut off.
+benchmarks/benchmarks-bqmpresolve.py has the numbers.
+
+Ties (an isolated variable with no bias, an eliminated variable whose
+two values are equally good) are settled one way, so the expanded
+response can show fewer distinct solutions than sampling the whole
+model would.
+
+Everything is done on a BINARY copy; SPIN models come back as SPIN.
+"""
+
+import numpy as np
+import dimod
+from dwave.preprocessing import roof_duality
+
+from dwave_tutorials.compiled import CompiledQUBO
+from dwave_tutorials.postprocess import descend, tabu_search
+
+# Tolerance when comparing energies.
+atol = 1e-9
+
+
+def _merge_candidates(bqm):
+    # (u, v, opposite) for every u that must follow v, in SPIN terms.
+    spin = bqm.spin
+    total = {u: abs(bias) for u, bias in spin.linear.items()}
+    strongest = {}
+    for (u, v), bias in spin.quadratic.items():
+        for a, b in ((u, v), (v, u)):
+            total[a] += abs(bias)
+            if abs(bias) > abs(strongest.get(a, (None, 0.0))[1]):
+                strongest[a] = (b, bias)
+    for u, (v, bias) in strongest.items():
+        if abs(bias) > total[u] - abs(bias):
+            # J > 0 wants opposite spins, J < 0 equal ones.
+            yield u, v, bias > 0
+
+
+def _upper_bound(bqm, num_starts, seed):
+    # The lowest energy a quick local search finds, from random starts.
+    qubo = CompiledQUBO.from_bqm(bqm)
+    X = np.random.RandomState(seed).randint(2, size=(num_starts, len(qubo)))
+    X, _ = descend(qubo, X)
+    X = tabu_search(qubo, X, 4 * len(qubo))
+    return qubo.energies(X).min()
+
+
+def _probe(bqm, upper):
+    # Returns ({v: value}, upper): the values the probes rule out the
+    # other side of, and the upper bound, lowered by any probe that left
+    # nothing to decide.
+    bounds = {}
+    for v in list(bqm.variables):
+        for value in (0, 1):
+            branch = bqm.copy()
+            branch.fix_variable(v, value)
+            if branch.num_interactions:
+                lower, persistent = roof_duality(branch, strict=True)
+                if len(persistent) == branch.num_variables:
+                    upper = min(upper, branch.energy(persistent))
+            else:
+                # Nothing coupled: the bound is the lowest energy.
+                lower = branch.offset + sum(min(0.0, bias) for bias in branch.linear.values())
+                upper = min(upper, lower)
+            bounds[v, value] = lower
+    fixed = {}
+    for v in bqm.variables:
+        for value in (0, 1):
+            if bounds[v, 1 - value] > upper + atol >= bounds[v, value]:
+                fixed[v] = value
+    return fixed, upper
+
+
+def _eliminate(bqm, a):
+    # Fold min over x_a into a's neighbors (at most two). Returns the
+    # step that lifts it back: (a, bias, neighbors, couplings).
+    h = bqm.get_linear(a)
+    neighbors = list(bqm.adj[a])
+    couplings = [bqm.adj[a][v] for v in neighbors]
+    bqm.remove_variable(a)
+
+    def best(*values):
+        return min(0.0, h + sum(J * x for J, x in zip(couplings, values)))
+
+    f0 = best(*[0] * len(neighbors))
+    bqm.offset += f0
+    if len(neighbors) >= 1:
+        p = neighbors[0]
+        rest = [0] * (len(neighbors) - 1)
+        fp = best(1, *rest)
+        bqm.add_linear(p, fp - f0)
+    if len(neighbors) == 2:
+        q = neighbors[1]
+        fq = best(0, 1)
+        bqm.add_linear(q, fq - f0)
+        bqm.add_quadratic(p, q, best(1, 1) - fp - fq + f0)
+    return a, h, neighbors, couplings
+
+
+class Reduction(object):
+    """A smaller model and the steps that map it back.
+
+    bqm is the smaller model, over reduced_labels. labels are the
+    original variables. steps lists what was done, in order:
+
+      ('fix', v, value)
+      ('merge', u, v, opposite)       u is v, or 1 - v if opposite
+      ('eliminate', a, h, nbrs, J)    x_a = 1 if h + J . x_nbrs < 0
+    """
+
+    def __init__(self, original, bqm, steps):
+        self.original = original
+        self.bqm = bqm
+        self.steps = steps
+        self.labels = list(original.variables)
+        self.reduced_labels = list(bqm.variables)
+
+        # Compile the steps to column indices, last step first.
+        column = {v: i for i, v in enumerate(self.labels)}
+        self.kept = np.array([column[v] for v in self.reduced_labels], dtype=np.intp)
+        self.program = []
+        for step in reversed(steps):
+            kind, v = step[0], column[step[1]]
+            if kind == 'fix':
+                self.program.append((kind, v, step[2]))
+            elif kind == 'merge':
+                self.program.append((kind, v, column[step[2]], step[3]))
+            else:
+                self.program.append((kind, v, step[2],
+                                     np.array([column[u] for u in step[3]], dtype=np.intp),
+                                     np.array(step[4], dtype=float)))
+
+    def lift(self, samples):
+        """Samples of the original model from samples of the smaller one.
+
+        samples has one column per variable, in reduced_labels order.
+        Returns a matrix with one column per variable in labels order.
+        """
+        samples = np.atleast_2d(np.asarray(samples, dtype=np.int8))
+        spin = self.original.vartype is dimod.SPIN
+        lifted = np.zeros((samples.shape[0], len(self.labels)), dtype=np.int8)
+        lifted[:, self.kept] = (samples > 0) if spin else samples
+        for step in self.program:
+            if step[0] == 'fix':
+                lifted[:, step[1]] = step[2]
+            elif step[0] == 'merge':
+                lifted[:, step[1]] = lifted[:, step[2]] ^ int(step[3])
+            else:
+                _, a, h, nbrs, J = step
+                lifted[:, a] = h + lifted[:, nbrs].dot(J) < 0
+        return 2 * lifted - 1 if spin else lifted
+
+    def expand(self, response):
+        """response (from sampling bqm) as samples of the original model.
+
+        Energies, num_occurrences and any other record fields are kept.
+        """
+        record = response.record
+        position = {v: i for i, v in enumerate(response.variables)}
+        samples = record.sample[:, [position[v] for v in self.reduced_labels]]
+        vectors = {name: record[name] for name in record.dtype.names
+                   if name not in ('sample', 'energy')}
+        return dimod.SampleSet.from_samples((self.lift(samples), self.labels),
+                                            self.original.vartype, record.energy,
+                                            info=dict(response.info), **vectors)
+
+    def report(self):
+        counts = {'fix': 0, 'merge': 0, 'eliminate': 0}
+        for step in self.steps:
+            counts[step[0]] += 1
+        return ('bqm presolve: {} of {} variables left '
+                '({fix} fixed, {merge} merged, {eliminate} eliminated)').format(
+                    len(self.reduced_labels), len(self.labels), **counts)
+
+
+def reduce(bqm, use_roof_duality=True, probe=True, max_degree=2, num_starts=10, seed=None):
+    """Shrink bqm as far as the rules above go, and return a Reduction.
+
+    use_roof_duality and probe turn those rules off; probing costs two
+    roof duality runs per variable per round. max_degree=1 or 0 limits
+    elimination to variables with fewer neighbors, -1 turns it off.
+    num_starts and seed are for the local search behind the probes.
+    """
+    reduced = bqm.change_vartype(dimod.BINARY, inplace=False)
+    steps = []
+    upper = np.inf
+    if use_roof_duality and probe and reduced.num_interactions:
+        upper = _upper_bound(reduced, num_starts, seed)
+
+    changed = True
+    while changed and reduced.num_variables:
+        changed = False
+
+        if use_roof_duality and reduced.num_interactions:
+            _, persistent = roof_duality(reduced, strict=True)
+            for v, value in persistent.items():
+                steps.append(('fix', v, int(value)))
+                reduced.fix_variable(v, value)
+                changed = True
+
+        if use_roof_duality and probe and reduced.num_interactions and not changed:
+            persistent, upper = _probe(reduced, upper)
+            for v, value in persistent.items():
+                steps.append(('fix', v, value))
+                reduced.fix_variable(v, value)
+                changed = True
+
+        # Lowest degree first, so each elimination leaves the most
+        # behind for the next.
+        for a in sorted(reduced.variables, key=reduced.degree):
+            if a in reduced.variables and reduced.degree(a) <= max_degree:
+                steps.append(('eliminate',) + _eliminate(reduced, a))
+                changed = True
+
+        # Merges that do not touch each other can all be made at once;
+        # making one can only lower the other variables' totals.
+        touched = set()
+        for u, v, opposite in list(_merge_candidates(reduced)):
+            if u in touched or v in touched:
+                continue
+            touched.update((u, v))
+            if opposite:
+                reduced.flip_variable(u)
+            reduced.contract_variables(v, u)
+            steps.append(('merge', u, v, opposite))
+            changed = True
+
+    return Reduction(bqm, reduced.change_vartype(bqm.vartype, inplace=True), steps)
@@ -0,0 +1,245 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+canonical.py
+------------
+  Compile constraint functions to truth tables once, and find one
+  penalty model per constraint shape.
+
+The tutorials pass plain Python functions as constraints:
+
+  csp.add_constraint(nand, ['x1', 'x2'])
+  csp.add_constraint(operator.truth, ['c0'])
+
+dwavebinarycsp cannot see inside a function, so every add_constraint()
+calls it on all 2^k inputs, and stitch() searches for a penalty model
+for every constraint, even if it searched for the very same one a line
+earlier. stitchcache.py already reuses models for constraints with the
+same truth table. This goes a step further.
+
+ConstraintCompiler:
+
+  - calls each function on all 2^k inputs once, and keeps the truth
+    table, packed the same way as validate.truth_table()
+  - reduces each truth table to a canonical form: the smallest table
+    you can get by reordering the variables and negating some of them.
+    AND and OR have the same canonical form (OR(a, b) = z is AND(!a,
+    !b) = !z), and so do operator.truth and operator.not_.
+  - searches for one penalty model per canonical form, and turns it
+    into the model for each constraint by renaming the variables and
+    substituting 1 - x for every negated x. Both leave every energy as
+    it was, so the classical gap is the same.
+
+The canonical form tries every ordering and negation, which is k! * 2^k
+tables. Tables with more than max_canonical variables are only matched
+exactly.
+
+Usage:
+
+  from dwave_tutorials import canonical
+
+  csp.add_constraint(canonical.constraint(nand, ['x1', 'x2']))
+  bqm = canonical.stitch(csp, min_classical_gap=3.2)
+  print(canonical.default_compiler.report())
+
+Functions are assumed to always give the same answer for the same
+inputs, since each one is only called once per number of variables.
+"""
+
+import itertools
+
+import numpy as np
+import dimod
+import dwavebinarycsp
+
+from dwave_tutorials import stitchcache
+from dwave_tutorials.validate import truth_table
+
+# Tables with up to this many variables are put in canonical form; 6
+# variables is 720 orderings times 64 negations.
+max_canonical = 6
+
+
+def pack(table):
+    """The truth table as an integer: bit i is entry i."""
+    return sum(1 << int(i) for i in np.flatnonzero(table))
+
+
+def unpack(code, num_variables):
+    """The truth table for an integer from pack()."""
+    return np.array([(code >> i) & 1 for i in range(1 << num_variables)], dtype=bool)
+
+
+def canonical_form(table):
+    """Return (code, order, flips) for a packed truth table.
+
+    code is pack() of the canonical table. In it, variable i is
+    variable order[i] of the original, negated if bit order[i] of flips
+    is set.
+    """
+    num_variables = len(table).bit_length() - 1
+    if num_variables > max_canonical:
+        return pack(table), tuple(range(num_variables)), 0
+
+    index = np.arange(1 << num_variables)
+    bits = (index[:, None] >> np.arange(num_variables)) & 1
+    shifts = index.astype(np.uint64)
+    best = None
+    for order in itertools.permutations(range(num_variables)):
+        # Entry i of the reordered table is entry permuted[i] of the
+        # original; negating variables XORs their bits into the index.
+        permuted = bits.dot(1 << np.array(order, dtype=np.intp))
+        tables = table[permuted[None, :] ^ index[:, None]]
+        codes = np.bitwise_or.reduce(tables.astype(np.uint64) << shifts, axis=1)
+        flips = int(codes.argmin())
+        if best is None or codes[flips] < best[0]:
+            best = (codes[flips], order, flips)
+    code, order, flips = best
+    return int(code), tuple(order), flips
+
+
+class ConstraintCompiler(object):
+    """Truth tables, configurations and penalty models, each made once.
+
+    cache is the stitchcache.PenaltyModelCache that the penalty model
+    searches go through (stitchcache.default_cache by default), so the
+    canonical models are kept on disk between runs too.
+    """
+
+    def __init__(self, cache=None):
+        self.cache = cache
+        self.tables = {}          # (func, k, vartype) -> truth table
+        self.forms = {}           # (k, table) -> canonical_form()
+        self.configurations = {}  # (k, table, vartype) -> configurations
+        self.models = {}          # (k, code, gap, max_graph_size) -> BQM
+        self.evaluations = 0      # functions compiled
+        self.searches = 0         # penalty models looked for
+        self.hits = 0             # penalty models reused
+
+    def table(self, func, num_variables, vartype=dimod.BINARY):
+        """func's truth table over num_variables inputs."""
+        vartype = dimod.as_vartype(vartype)
+        key = (func, num_variables, vartype)
+        table = self.tables.get(key)
+        if table is None:
+            self.evaluations += 1
+            values = (-1, 1) if vartype is dimod.SPIN else (0, 1)
+            table = np.zeros(1 << num_variables, dtype=bool)
+            for index in range(1 << num_variables):
+                table[index] = bool(func(*(values[(index >> j) & 1]
+                                           for j in range(num_variables))))
+            self.tables[key] = table
+        return table
+
+    def _configurations(self, table, vartype):
+        num_variables = len(table).bit_length() - 1
+        key = (num_variables, table.tobytes(), vartype)
+        configurations = self.configurations.get(key)
+        if configurations is None:
+            values = (-1, 1) if vartype is dimod.SPIN else (0, 1)
+            configurations = frozenset(
+                tuple(values[(index >> j) & 1] for j in range(num_variables))
+                for index in np.flatnonzero(table))
+            self.configurations[key] = configurations
+        return configurations
+
+    def constraint(self, func, variables, vartype=dimod.BINARY, name=None):
+        """The same dwavebinarycsp Constraint that add_constraint(func,
+        variables) would make, without calling func again."""
+        vartype = dimod.as_vartype(vartype)
+        table = self.table(func, len(variables), vartype)
+        return dwavebinarycsp.Constraint.from_configurations(
+            self._configurations(table, vartype), variables, vartype, name)
+
+    def canonical_form(self, table):
+        key = (len(table).bit_length() - 1, table.tobytes())
+        form = self.forms.get(key)
+        if form is None:
+            form = self.forms[key] = canonical_form(table)
+        return form
+
+    def penalty_model(self, constraint, min_classical_gap=2.0, max_graph_size=8, aux=None):
+        """A BINARY penalty model for constraint.
+
+        aux yields labels for the aux variables ('aux0', 'aux1', ... if
+        not given); the caller makes sure they are not taken.
+        """
+        if aux is None:
+            aux = ('aux{}'.format(i) for i in itertools.count())
+        variables = list(constraint.variables)
+        code, order, flips = self.canonical_form(truth_table(constraint))
+
+        key = (len(variables), code, float(min_classical_gap), max_graph_size)
+        model = self.models.get(key)
+        if model is None and code == 1 and len(variables) == 1:
+            # "x must be 0". penaltymodel fails to store a model with no
+            # couplings once min_classical_gap is above 2, and this one
+            # needs no search anyway. Built, not reused: neither counter.
+            model = self.models[key] = dimod.BinaryQuadraticModel(
+                {0: min_classical_gap}, {}, 0.0, dimod.BINARY)
+        elif model is None:
+            self.searches += 1
+            table = unpack(code, len(variables))
+            single = dwavebinarycsp.ConstraintSatisfactionProblem(dimod.BINARY)
+            single.add_constraint(self._configurations(table, dimod.BINARY),
+                                  range(len(variables)))
+            model = stitchcache.stitch(single, min_classical_gap, max_graph_size, self.cache)
+            for i in range(len(variables)):
+                model.add_variable(i, 0.0)
+            model = self.models[key] = model.change_vartype(dimod.BINARY, inplace=False)
+        else:
+            self.hits += 1
+
+        mapping = {i: variables[order[i]] for i in range(len(variables))}
+        for v in model.variables:
+            if v not in mapping:
+                mapping[v] = next(aux)
+        model = model.relabel_variables(mapping, inplace=False)
+        for i in range(len(variables)):
+            if (flips >> order[i]) & 1:
+                model.flip_variable(variables[order[i]])
+        return model
+
+    def stitch(self, csp, min_classical_gap=2.0, max_graph_size=8):
+        """Same as dwavebinarycsp.stitch(), one search per constraint shape."""
+        taken = set(csp.variables)
+        aux = (label for label in ('aux{}'.format(i) for i in itertools.count())
+               if label not in taken)
+        bqm = dimod.BinaryQuadraticModel.empty(dimod.BINARY)
+        for const in csp.constraints:
+            if len(const) == 0:
+                continue
+            bqm.update(self.penalty_model(const, min_classical_gap, max_graph_size, aux))
+        return bqm.change_vartype(csp.vartype, inplace=True)
+
+    def report(self):
+        return ('constraint compiler: {} functions compiled, {} shapes, '
+                '{} penalty searches, {} reused').format(
+                    self.evaluations, len(self.forms), self.searches, self.hits)
+
+
+default_compiler = ConstraintCompiler()
+
+
+def constraint(func, variables, vartype=dimod.BINARY, name=None):
+    """default_compiler.constraint()"""
+    return default_compiler.constraint(func, variables, vartype, name)
+
+
+def stitch(csp, min_classical_gap=2.0, max_graph_size=8):
+    """default_compiler.stitch()"""
+    return default_compiler.stitch(csp, min_classical_gap, max_graph_size)
@@ -0,0 +1,72 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+circuits.py
+-----------
+  The circuits from the logic-gates tutorials, as functions.
+
+The tutorials build their problems inline so you can read them top to
+bottom. The benchmarks need the very same problems without running the
+tutorials, so here they are again. If you change a circuit in a
+tutorial, change it here too.
+"""
+
+import operator
+
+import dwavebinarycsp
+import dwavebinarycsp.factories.constraint.gates as gates
+
+# The QUBOs from logic-gates-not.py and logic-gates-and.py.
+not_qubo = {(0, 0): -1, (0, 4): 0, (4, 0): 2, (4, 4): -1}
+and_qubo = {('x1', 'x2'): 1, ('x1', 'z'): -2, ('x2', 'z'): -2, ('z', 'z'): 3}
+
+
+def full_adder_csp():
+    """The full-adder from logic-gates-full-adder.py."""
+    csp = dwavebinarycsp.ConstraintSatisfactionProblem(dwavebinarycsp.BINARY)
+    csp.add_constraint(gates.xor_gate(['a',    'b',   'xor1' ]))  # xor(a,b) = xor1
+    csp.add_constraint(gates.xor_gate(['xor1', 'cIn', 's'    ]))  # xor(xor1,cIn) = s
+    csp.add_constraint(gates.and_gate(['xor1', 'cIn', 'and1' ]))  # and(xor1,cIn) = and1
+    csp.add_constraint(gates.and_gate(['a',    'b',   'and2' ]))  # and(a,b) = and2
+    csp.add_constraint(gates.or_gate( ['and1', 'and2', 'cOut']))  # or(and1,and2) = cOut
+    return csp
+
+
+def multiplier_2x2_csp(c=9):
+    """The 2 by 2 multiplier from logic-gates-2by2-multiplier.py.
+
+    The output bits c3..c0 are fixed to the number c with operator.truth
+    and operator.not_ constraints, just like the tutorial. Pass c=None
+    to leave the output free.
+    """
+    csp = dwavebinarycsp.ConstraintSatisfactionProblem(dwavebinarycsp.BINARY)
+    csp.add_constraint(gates.and_gate(['a0', 'b1', 'and1' ]))  # and(a0, b1) = and1
+    csp.add_constraint(gates.and_gate(['a0', 'b0', 'c0'   ]))  # and(a0, b0) = c0
+    csp.add_constraint(gates.and_gate(['a1', 'b0', 'and3' ]))  # and(a1, b0) = and3
+    csp.add_constraint(gates.and_gate(['a1', 'b1', 'and4' ]))  # and(a1, b1) = and4
+
+    csp.add_constraint(gates.xor_gate(['and1', 'and3', 'c1'   ]))  # xor(and1, and3) = c1
+    csp.add_constraint(gates.and_gate(['and1', 'and3', 'and5' ]))  # and(and1, and3) = and5
+
+    csp.add_constraint(gates.xor_gate(['and5', 'and4', 'c2' ]))  # xor(and5, and4) = c2
+    csp.add_constraint(gates.and_gate(['and5', 'and4', 'c3' ]))  # and(and5, and4) = c3
+
+    if c is not None:
+        for bit in (3, 2, 1, 0):
+            fix = operator.truth if (c >> bit) & 1 else operator.not_
+            csp.add_constraint(fix, ['c'+str(bit)])
+    return csp
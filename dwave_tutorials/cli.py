@@ -0,0 +1,139 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+cli.py
+------
+  The command line the tutorials share, and samplers built on demand.
+
+Every tutorial keeps its problem-building and solving code in functions
+and only does its printing (and asking) in main(), so a tutorial can be
+imported without anything happening. Each main() starts with the same
+arguments:
+
+  --sampler     neal (the default for most), annealer, tempering,
+                mockqpu or qpu. useQpu = True at the top of a tutorial
+                makes qpu the default, as before.
+  --num-reads   how many samples to ask for
+  --seed        a seed for samplers that take one
+  --batch       never stop to ask a question; use the defaults
+  --quiet       print only the results, not the explanations around them
+
+plus whatever sizes that tutorial has (--coins, --size, --number).
+
+The explanations go through narrator(), which prints nothing with
+--quiet; the results are printed with print(). For a script that just
+wants the answers, use both --batch and --quiet.
+
+No sampler is created, and no Ocean sampler package is imported, until
+make_sampler() is called, which the tutorials do right before they
+sample.
+
+The tutorial file names have dashes in them, so use load() to import
+one:
+
+  from dwave_tutorials import cli
+
+  tutorial = cli.load('logic-gates/logic-gates-full-adder.py')
+  csp = tutorial.build_csp()
+  response = tutorial.solve(csp, cli.make_sampler('neal'), num_reads=100)
+"""
+
+import argparse
+import importlib.util
+import os
+
+samplers = ('neal', 'annealer', 'tempering', 'mockqpu', 'qpu')
+
+# The top of the repository, which is where load() looks for tutorials.
+root = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+def parser(description, num_reads, use_qpu=False, sampler='neal'):
+    """An ArgumentParser with the arguments every tutorial shares.
+
+    sampler is the default when use_qpu is False.
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--sampler', choices=samplers, default='qpu' if use_qpu else sampler)
+    parser.add_argument('--num-reads', type=int, default=num_reads)
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--batch', action='store_true',
+                        help='do not stop for input; use the defaults')
+    parser.add_argument('--quiet', action='store_true',
+                        help='print only the results, not the explanations')
+    return parser
+
+
+def narrator(quiet=False):
+    """print, or a function that prints nothing if quiet is set."""
+    if quiet:
+        return lambda *args, **kwargs: None
+    return print
+
+
+def make_sampler(name, composite=None):
+    """Build the sampler called name.
+
+    composite wraps the structured samplers (qpu and mockqpu), for
+    example EmbeddingComposite. The simulators take any problem as is,
+    so they are returned unwrapped.
+    """
+    if name == 'neal':
+        from neal import SimulatedAnnealingSampler
+        return SimulatedAnnealingSampler()
+    if name == 'annealer':
+        from dwave_tutorials.annealer import ScheduleAnnealingSampler
+        return ScheduleAnnealingSampler()
+    if name == 'tempering':
+        from dwave_tutorials.tempering import ParallelTemperingSampler
+        return ParallelTemperingSampler()
+    if name == 'mockqpu':
+        from dwave_tutorials.mockqpu import MockQPUSampler
+        sampler = MockQPUSampler()
+    elif name == 'qpu':
+        from dwave.system.samplers import DWaveSampler
+        sampler = DWaveSampler()
+    else:
+        raise ValueError('unknown sampler {!r}; pick one of {}'.format(name, ', '.join(samplers)))
+    return composite(sampler) if composite is not None else sampler
+
+
+def sample_params(sampler, seed=None, **params):
+    """params, plus seed if it is set and the sampler takes one."""
+    if seed is not None and 'seed' in sampler.parameters:
+        params['seed'] = seed
+    return params
+
+
+def ask(prompt, default, batch=False):
+    """input(prompt), or default in batch mode or when there is no input."""
+    if batch:
+        return default
+    try:
+        return input(prompt)
+    except EOFError:
+        return default
+
+
+def load(path):
+    """Import the tutorial at path (relative to the top of the repository)."""
+    path = os.path.join(root, path)
+    name = os.path.splitext(os.path.basename(path))[0].replace('-', '_')
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,141 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+coins.py
+--------
+  Flip lots of coins, lots of times.
+
+fun-coin.py builds its QUBO as a dict with a (i, i): 0 entry per coin,
+asks for all the trials in one sample_qubo() call, and stops at 2000
+coins because that is about what a 2000Q can hold.
+
+CoinFlipper does the same experiment at scale:
+
+- the empty model is built from NumPy arrays (all zeros), not a dict
+- trials are asked for in batches, so the sample matrix for a million
+  trials never has to exist all at once
+- heads per trial is one row-sum over each batch's sample matrix, and
+  the histogram is one np.bincount() per batch
+
+On a structured sampler (a QPU, or MockQPUSampler) each coin goes
+straight onto a working qubit, so there is no embedding step, and the
+number of coins is limited by the number of qubits. num_reads per call
+is capped the same way the QPU caps it.
+
+Usage:
+
+  from dwave_tutorials.coins import CoinFlipper
+
+  flipper = CoinFlipper(SimulatedAnnealingSampler(), 100000, num_sweeps=1)
+  distrib = flipper.histogram(1000000)
+  print(flipper.throughput(), 'coins/s')
+"""
+
+import time
+
+import numpy as np
+import dimod
+
+# Roughly how many sample matrix entries to ask for per sampler call.
+batch_cells = 1 << 24
+
+
+def empty_bqm(labels):
+    """A BINARY model over labels with every bias zero."""
+    labels = list(labels)
+    return dimod.BinaryQuadraticModel.from_numpy_vectors(
+        np.zeros(len(labels)), ([], [], []), 0.0, dimod.BINARY, variable_order=labels)
+
+
+class CoinFlipper(object):
+    """Flip num_coins coins per trial on sampler, in batches of trials.
+
+    batch_size is the number of trials per sampler call. By default it
+    is picked so that one batch is about batch_cells samples. Any other
+    keyword arguments go to sampler.sample() on every call.
+    """
+
+    def __init__(self, sampler, num_coins, batch_size=None, **parameters):
+        if num_coins < 1:
+            raise ValueError('need at least one coin, got {}'.format(num_coins))
+
+        nodelist = getattr(sampler, 'nodelist', None)
+        if nodelist is not None:
+            if num_coins > len(nodelist):
+                raise ValueError('{} coins do not fit on {} working qubits'.format(
+                    num_coins, len(nodelist)))
+            labels = nodelist[:num_coins]
+        else:
+            labels = range(num_coins)
+
+        if batch_size is None:
+            batch_size = max(1, batch_cells // num_coins)
+        max_reads = getattr(sampler, 'properties', {}).get('num_reads_range', [0, None])[1]
+        if max_reads:
+            batch_size = min(batch_size, max_reads)
+
+        # Histogram mode would merge identical trials; we want every one.
+        if 'answer_mode' in getattr(sampler, 'parameters', {}):
+            parameters.setdefault('answer_mode', 'raw')
+
+        self.sampler = sampler
+        self.num_coins = num_coins
+        self.batch_size = batch_size
+        self.parameters = parameters
+        self.bqm = empty_bqm(labels)
+        self.elapsed = 0.0
+        self.flipped = 0
+        self.qpu_access_time = 0.0  # microseconds, if the sampler reports it
+
+    def batches(self, trials):
+        """Yield the sample matrix of each batch: trials x num_coins, 0/1.
+
+        Columns are in coin order. Rows are individual trials, even if
+        the sampler aggregated identical ones.
+        """
+        remaining = trials
+        while remaining > 0:
+            num_reads = min(self.batch_size, remaining)
+            start = time.time()
+            response = self.sampler.sample(self.bqm, num_reads=num_reads, **self.parameters)
+            record = response.record
+            column = {v: i for i, v in enumerate(response.variables)}
+            samples = record.sample[:, [column[v] for v in self.bqm.variables]]
+            if (record.num_occurrences != 1).any():
+                samples = np.repeat(samples, record.num_occurrences, axis=0)
+            self.elapsed += time.time() - start
+            self.flipped += samples.size
+            timing = response.info.get('timing', {})
+            self.qpu_access_time += timing.get('qpu_access_time', 0.0)
+            remaining -= num_reads
+            yield samples
+
+    def histogram(self, trials):
+        """Entry n is the number of trials with exactly n heads."""
+        distrib = np.zeros(self.num_coins + 1, dtype=np.int64)
+        for samples in self.batches(trials):
+            heads = samples.sum(axis=1, dtype=np.int64)
+            distrib += np.bincount(heads, minlength=len(distrib))
+        return distrib
+
+    def throughput(self):
+        """Coins flipped per second of wall-clock time so far."""
+        return self.flipped / self.elapsed if self.elapsed else 0.0
+
+    def qpu_throughput(self):
+        """Coins flipped per second of reported QPU access time."""
+        return self.flipped / (self.qpu_access_time / 1e6) if self.qpu_access_time else 0.0
@@ -0,0 +1,208 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+compiled.py
+-----------
+  A QUBO packed into NumPy arrays, for fast energies and flips.
+
+The tutorials write QUBOs as dicts, Q = {(0, 0): -1, (0, 4): 2, ...},
+and every energy goes through dict lookups. That is fine for reading,
+and slow for anything that evaluates energies over and over: local
+search, exhaustive enumeration, post-processing.
+
+CompiledQUBO numbers the variables 0..n-1 and stores
+
+  linear       h[i], the bias of variable i
+  offset       the constant
+  indptr,      the couplings in compressed sparse row (CSR) form: the
+  indices,     neighbors of i are indices[indptr[i]:indptr[i+1]] and
+  data         their couplings data[indptr[i]:indptr[i+1]]. Every
+               coupling is stored twice, once for each end.
+
+With that, the energy change from flipping one variable of one sample
+is a sum over just that variable's neighbors:
+
+  delta(x, i) = (1 - 2 x_i) * (h_i + sum of J_ij x_j over neighbors j)
+
+and the energies, local fields (h_i + sum J_ij x_j) and flip deltas for
+a whole matrix of samples are a couple of matrix products (dense ones
+while the model is small enough, see dense_limit).
+
+All samples here are 0/1 (BINARY) matrices with one column per variable
+in the compiled order (see columns()).
+
+Usage:
+
+  from dwave_tutorials.compiled import CompiledQUBO
+
+  qubo = CompiledQUBO.from_qubo(Q)
+  X = qubo.columns(response)
+  energies = qubo.energies(X)
+  best_flip = qubo.flip_deltas(X).argmin(axis=1)
+"""
+
+import numpy as np
+import dimod
+from scipy import sparse
+
+# Up to this many variables, batched products use a dense copy of the
+# coupling matrix (BLAS beats sparse products by a wide margin there).
+dense_limit = 2048
+
+# Rows of samples handled at once by energies().
+chunk_size = 16384
+
+
+class CompiledQUBO(object):
+    """A BINARY quadratic model as NumPy arrays. See the module notes."""
+
+    def __init__(self, labels, linear, rows, cols, biases, offset=0.0):
+        self.labels = list(labels)
+        self.index = {v: i for i, v in enumerate(self.labels)}
+        n = len(self.labels)
+        self.linear = np.asarray(linear, dtype=float)
+        self.offset = float(offset)
+
+        rows = np.asarray(rows, dtype=np.intp)
+        cols = np.asarray(cols, dtype=np.intp)
+        biases = np.asarray(biases, dtype=float)
+        # Both directions, summed where the same pair shows up twice.
+        self.matrix = sparse.csr_matrix(
+            (np.concatenate([biases, biases]),
+             (np.concatenate([rows, cols]), np.concatenate([cols, rows]))),
+            shape=(n, n))
+        self.matrix.sum_duplicates()
+        self.matrix.eliminate_zeros()
+        self.indptr = self.matrix.indptr
+        self.indices = self.matrix.indices
+        self.data = self.matrix.data
+        self._dense = None
+
+    @classmethod
+    def from_bqm(cls, bqm, labels=None):
+        """Compile bqm (any vartype); labels fixes the variable order."""
+        labels = list(bqm.variables) if labels is None else list(labels)
+        h, (rows, cols, J), offset = bqm.binary.to_numpy_vectors(variable_order=labels)
+        return cls(labels, h, rows, cols, J, offset)
+
+    @classmethod
+    def from_qubo(cls, Q, offset=0.0):
+        """Compile a QUBO dict like the ones in the logic-gates tutorials."""
+        return cls.from_bqm(dimod.BinaryQuadraticModel.from_qubo(Q, offset))
+
+    def __len__(self):
+        return len(self.labels)
+
+    def degree(self, i):
+        return self.indptr[i + 1] - self.indptr[i]
+
+    def neighbors(self, i):
+        """(neighbor indices, couplings) of variable i."""
+        lo, hi = self.indptr[i], self.indptr[i + 1]
+        return self.indices[lo:hi], self.data[lo:hi]
+
+    def dense(self):
+        """The symmetric n x n coupling matrix as a NumPy array."""
+        if self._dense is None:
+            self._dense = self.matrix.toarray()
+        return self._dense
+
+    def _couplings(self, X):
+        # sum of J_ij x_j for every i, for every row of the float matrix X.
+        if len(self) <= dense_limit:
+            return X.dot(self.dense())
+        return np.asarray(self.matrix.dot(X.T)).T
+
+    def columns(self, response):
+        """The samples of a SampleSet as a 0/1 matrix in compiled order."""
+        position = {v: i for i, v in enumerate(response.variables)}
+        X = response.record.sample[:, [position[v] for v in self.labels]]
+        if response.vartype is dimod.SPIN:
+            X = (X > 0).astype(np.int8)
+        return X
+
+    # One sample, one variable: O(degree).
+
+    def field(self, x, i):
+        """h_i + sum of J_ij x_j, for a single sample x."""
+        nbrs, J = self.neighbors(i)
+        return self.linear[i] + x[nbrs].dot(J)
+
+    def delta(self, x, i):
+        """Energy change from flipping variable i of a single sample x."""
+        return (1 - 2 * x[i]) * self.field(x, i)
+
+    # Many samples, one variable: O(degree) per sample.
+
+    def column_field(self, X, i):
+        """h_i + sum of J_ij x_j for every row of X."""
+        nbrs, J = self.neighbors(i)
+        return self.linear[i] + X[:, nbrs].dot(J)
+
+    def column_delta(self, X, i):
+        """Energy change from flipping variable i in every row of X."""
+        return (1 - 2 * X[:, i]) * self.column_field(X, i)
+
+    # Many samples, every variable.
+
+    def energies(self, X):
+        """Energy of every row of X."""
+        X = np.asarray(X)
+        energies = np.empty(len(X))
+        for start in range(0, len(X), chunk_size):
+            chunk = X[start:start + chunk_size].astype(float)
+            energies[start:start + chunk_size] = (
+                self.offset + chunk.dot(self.linear)
+                + 0.5 * np.einsum('ij,ij->i', self._couplings(chunk), chunk))
+        return energies
+
+    def fields(self, X):
+        """Local field of every variable in every row of X."""
+        return self.linear + self._couplings(np.asarray(X, dtype=float))
+
+    def flip_deltas(self, X, fields=None):
+        """Energy change from flipping each variable of each row of X."""
+        if fields is None:
+            fields = self.fields(X)
+        return (1 - 2 * np.asarray(X, dtype=float)) * fields
+
+    def flip(self, X, fields, rows, variables):
+        """Flip variables[k] in row rows[k] of X, and keep fields current.
+
+        X and fields are updated in place. Each row may appear at most
+        once.
+        """
+        rows = np.asarray(rows, dtype=np.intp)
+        variables = np.asarray(variables, dtype=np.intp)
+        if len(rows) == 0:
+            return
+        # +1 where the variable goes 0 -> 1, -1 where it goes 1 -> 0.
+        sign = 1.0 - 2.0 * X[rows, variables]
+        X[rows, variables] ^= 1
+        # Only the neighbors of each flipped variable change: gather their
+        # stretches of indices/data and scatter them into the rows, so the
+        # cost is the total degree of the flipped variables.
+        starts = self.indptr[variables]
+        counts = self.indptr[variables + 1] - starts
+        total = int(counts.sum())
+        if total == 0:
+            return
+        ends = np.cumsum(counts)
+        positions = np.arange(total) + np.repeat(starts - (ends - counts), counts)
+        # A row appears once, so every (row, neighbor) pair is distinct.
+        fields[np.repeat(rows, counts), self.indices[positions]] += \
+            self.data[positions] * np.repeat(sign, counts)
@@ -0,0 +1,248 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+embedcache.py
+-------------
+  EmbeddingComposite with a memory.
+
+EmbeddingComposite(DWaveSampler()) runs minorminer on every call. That
+is the slowest step before a problem is submitted, and every run rolls
+the dice again: the multiplier and full-adder tutorials admit that
+sometimes you just get an unlucky embedding.
+
+CachedEmbeddingComposite remembers embeddings on disk. An embedding only
+depends on the shape of the problem graph and on the working graph of
+the QPU, so it is keyed by:
+
+  - a hash of the QPU's edge list (dead qubits change the key), and
+  - a hash of the problem graph's degrees (each variable's degree and
+    the degrees of its neighbors), which does not care what the
+    variables are called.
+
+Problems with the same hash are checked with a proper isomorphism test
+before an embedding is reused, and the embedding is translated onto the
+new variable names. Only the best embedding seen so far is kept, where
+best means the shortest longest-chain (ties go to fewer qubits). Use
+warm() to search harder for a list of problems ahead of time.
+
+Usage:
+
+  from dwave_tutorials.embedcache import CachedEmbeddingComposite
+
+  sampler = CachedEmbeddingComposite(DWaveSampler())
+  sampler.warm([bqm], tries=10)
+  response = sampler.sample(bqm, num_reads=1000)
+  print(sampler.cache.report())
+
+The cache lives next to the penalty model cache from stitchcache.py.
+"""
+
+import hashlib
+import json
+import time
+
+import networkx as nx
+from networkx.algorithms.isomorphism import GraphMatcher
+import dimod
+import minorminer
+from dwave.system.composites import FixedEmbeddingComposite
+
+from dwave_tutorials.stitchcache import JSONCache, default_directory
+
+
+class EmbeddingCache(JSONCache):
+    """Best known embeddings, keyed by target and problem graph shape."""
+
+    def report(self):
+        return ('embedding cache: {} hits, {} misses, '
+                '{:.3f}s embedding, {:.3f}s saved').format(
+                    self.hits, self.misses, self.time_spent, self.time_saved)
+
+
+default_cache = EmbeddingCache(default_directory('embeddings'))
+
+
+def source_graph(bqm):
+    """The problem graph: one node per variable, one edge per interaction."""
+    graph = nx.Graph()
+    graph.add_nodes_from(bqm.variables)
+    graph.add_edges_from(bqm.quadratic)
+    return graph
+
+
+def target_hash(edgelist):
+    edges = sorted(tuple(sorted(edge)) for edge in edgelist)
+    return hashlib.sha256(json.dumps(edges).encode('utf-8')).hexdigest()[:16]
+
+
+def graph_hash(graph):
+    """A label-free fingerprint of graph.
+
+    Isomorphic graphs always get the same fingerprint. Different graphs
+    usually do not, but can, so a match still needs an isomorphism test.
+    """
+    degree = dict(graph.degree)
+    signature = sorted((degree[v], sorted(degree[u] for u in graph[v])) for v in graph)
+    return hashlib.sha256(json.dumps(signature).encode('utf-8')).hexdigest()[:16]
+
+
+def quality(embedding):
+    """Smaller is better: (longest chain, total qubits)."""
+    chains = list(embedding.values())
+    return (max(len(chain) for chain in chains) if chains else 0,
+            sum(len(chain) for chain in chains))
+
+
+def _stored_graph(candidate):
+    graph = nx.Graph()
+    graph.add_nodes_from(range(candidate['num_nodes']))
+    graph.add_edges_from(map(tuple, candidate['edges']))
+    return graph
+
+
+def _find(graph, target, nodelist, seed, params):
+    embedding = minorminer.find_embedding(list(graph.edges), target,
+                                          random_seed=seed, **params)
+    if graph.number_of_edges() and not embedding:
+        return None  # minorminer gave up
+    # minorminer only places variables that have interactions. Put any
+    # loners on qubits nobody is using.
+    used = set(q for chain in embedding.values() for q in chain)
+    free = (q for q in nodelist if q not in used)
+    for v in graph.nodes:
+        if v not in embedding:
+            try:
+                embedding[v] = [next(free)]
+            except StopIteration:
+                raise ValueError('not enough qubits for the isolated variables: '
+                                 'the target has {} qubits, {} variables'.format(
+                                     len(nodelist), graph.number_of_nodes()))
+    return {v: list(chain) for v, chain in embedding.items()}
+
+
+class CachedEmbeddingComposite(dimod.ComposedSampler):
+    """Embed onto a structured child sampler, reusing known embeddings.
+
+    tries is how many minorminer searches to run when there is nothing
+    in the cache; the best one is kept. Any other keyword arguments are
+    passed to minorminer.find_embedding().
+    """
+
+    def __init__(self, child, cache=None, tries=1, seed=None, **find_embedding_params):
+        self._children = [child]
+        self.cache = default_cache if cache is None else cache
+        self.tries = tries
+        self.seed = seed
+        self.find_embedding_params = find_embedding_params
+        self._target = child.edgelist
+        self._target_hash = target_hash(child.edgelist)
+
+    @property
+    def children(self):
+        return self._children
+
+    @property
+    def parameters(self):
+        parameters = dict(self.child.parameters)
+        parameters.update(chain_strength=[], chain_break_method=[],
+                          chain_break_fraction=[], return_embedding=[])
+        return parameters
+
+    @property
+    def properties(self):
+        return {'child_properties': self.child.properties}
+
+    def _search(self, graph, tries):
+        best, seconds = None, 0.0
+        for attempt in range(tries):
+            seed = None if self.seed is None else self.seed + attempt
+            start = time.time()
+            embedding = _find(graph, self._target, self.child.nodelist, seed,
+                              self.find_embedding_params)
+            seconds += time.time() - start
+            if embedding is not None and (best is None or quality(embedding) < quality(best)):
+                best = embedding
+        self.cache.time_spent += seconds
+        if best is None:
+            raise ValueError('no embedding found')
+        return best, seconds / tries
+
+    def _lookup(self, graph, key):
+        entry = self.cache.get(key)
+        if entry is None:
+            return None, None
+        for candidate in entry['candidates']:
+            matcher = GraphMatcher(graph, _stored_graph(candidate))
+            if matcher.is_isomorphic():
+                mapping = matcher.mapping
+                embedding = {v: candidate['embedding'][mapping[v]] for v in graph.nodes}
+                return embedding, candidate
+        return None, None
+
+    def _store(self, graph, key, embedding, seconds):
+        entry = self.cache.get(key) or {'candidates': []}
+        index = {v: i for i, v in enumerate(graph.nodes)}
+        candidate = {
+            'num_nodes': len(index),
+            'edges': [[index[u], index[v]] for u, v in graph.edges],
+            'embedding': [embedding[v] for v in graph.nodes],
+            'seconds': seconds,
+        }
+        # Drop any stored candidate for the same graph; we only keep the best.
+        kept = [other for other in entry['candidates']
+                if not nx.is_isomorphic(graph, _stored_graph(other))]
+        entry['candidates'] = kept + [candidate]
+        self.cache.put(key, entry)
+
+    def find_embedding(self, bqm, tries=None):
+        """Return an embedding for bqm, from the cache if possible.
+
+        If tries is given, search that many more times even on a cache
+        hit, and keep whichever embedding is best.
+        """
+        graph = source_graph(bqm)
+        key = '{}:{}'.format(self._target_hash, graph_hash(graph))
+        embedding, candidate = self._lookup(graph, key)
+
+        if embedding is not None:
+            self.cache.hits += 1
+            self.cache.time_saved += candidate['seconds']
+            if not tries:
+                return embedding
+        else:
+            self.cache.misses += 1
+
+        found, seconds = self._search(graph, tries or self.tries)
+        if embedding is None or quality(found) < quality(embedding):
+            if candidate is not None:
+                seconds = max(seconds, candidate['seconds'])
+            self._store(graph, key, found, seconds)
+            embedding = found
+        return embedding
+
+    def warm(self, bqms, tries=None):
+        """Make sure every bqm in bqms has a cached embedding.
+
+        With tries, also search that many times for a better one.
+        """
+        for bqm in bqms:
+            self.find_embedding(bqm, tries=tries)
+
+    def sample(self, bqm, **parameters):
+        embedding = self.find_embedding(bqm)
+        sampler = FixedEmbeddingComposite(self.child, embedding)
+        return sampler.sample(bqm, **parameters)
@@ -0,0 +1,150 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+exact.py
+--------
+  Check every possible answer, fast enough for about 30 variables.
+
+dimod.ExactSolver() returns the energy of every one of the 2^n states,
+so it runs out of memory somewhere in the low twenties. Usually we only
+want to know the ground states -- for example, to check that a model
+has exactly the answers it should -- and maybe how many states sit at
+each energy.
+
+EnumerationSolver splits the variables in two:
+
+  - the first low_bits variables (20 by default): the energies of all
+    2^20 settings of these are built at once, as one NumPy array, by
+    doubling -- the energies with bit i set are the energies without it
+    plus bit i's bias and its couplings to the bits below
+  - the rest: walked through in Gray code order, where each step flips
+    exactly one variable. Flipping variable j changes every energy in
+    the array by the same bias-plus-couplings amount, plus its couplings
+    to the low bits, which is a precomputed array. So each step is one
+    vector add over the array, not a recomputation.
+
+After each step only the states at (or tied with) the lowest energy so
+far are kept. 30 variables is 1024 steps over an array of a million
+energies, a few seconds.
+
+Usage:
+
+  from dwave_tutorials.exact import EnumerationSolver
+
+  response = EnumerationSolver().sample(bqm)
+  response.info['ground_energy'], response.info['degeneracy']
+
+Pass spectrum=True to also count how many states have each energy. That
+needs a sort per step, so it is much slower for large n.
+"""
+
+from collections import Counter
+
+import numpy as np
+import dimod
+
+from dwave_tutorials.compiled import CompiledQUBO
+
+max_variables = 34
+
+
+def _doubling(weights):
+    # v[idx] = sum of weights[i] for every bit i set in idx.
+    v = np.zeros(1)
+    for w in weights:
+        v = np.concatenate([v, v + w])
+    return v
+
+
+class EnumerationSolver(dimod.Sampler):
+    """Exact ground states of a BQM by enumerating every state.
+
+    Returns the ground states (at most max_ground_states of them) as a
+    SampleSet. info has ground_energy, degeneracy (the total number of
+    ground states, even past the cap) and, with spectrum=True, spectrum:
+    a list of (energy, number of states), lowest first.
+    """
+
+    properties = {}
+    parameters = {'low_bits': [], 'max_ground_states': [], 'spectrum': [],
+                  'decimals': [], 'atol': []}
+
+    def sample(self, bqm, low_bits=20, max_ground_states=65536, spectrum=False,
+               decimals=6, atol=1e-9):
+        labels = list(bqm.variables)
+        n = len(labels)
+        if n > max_variables:
+            raise ValueError('{} variables is too many to enumerate (limit {})'.format(
+                n, max_variables))
+
+        qubo = CompiledQUBO.from_bqm(bqm, labels)
+        h, dense, offset = qubo.linear, qubo.dense(), qubo.offset
+
+        k = min(n, low_bits)
+        high = range(k, n)
+
+        # Energies of every setting of the low bits, with the high bits 0.
+        energy = np.full(1, float(offset))
+        for i in range(k):
+            energy = np.concatenate([energy, energy + h[i] + _doubling(dense[:i, i])])
+
+        # How much each high variable's couplings to the low bits add.
+        coupling = [_doubling(dense[:k, j]) for j in high]
+
+        best = np.inf
+        found = []      # arrays of state indices tied at the best energy
+        degeneracy = 0
+        counts = Counter() if spectrum else None
+        high_bits = np.zeros(n, dtype=np.int64)
+
+        for step in range(1 << (n - k)):
+            if step:
+                # Gray code: step t flips the bit at t's lowest set bit.
+                j = k + ((step & -step).bit_length() - 1)
+                change = h[j] + dense[j, k:].dot(high_bits[k:])
+                if high_bits[j]:
+                    energy -= coupling[j - k]
+                    energy -= change
+                else:
+                    energy += coupling[j - k]
+                    energy += change
+                high_bits[j] ^= 1
+
+            if counts is not None:
+                values, numbers = np.unique(np.round(energy, decimals), return_counts=True)
+                counts.update(dict(zip(values.tolist(), numbers.tolist())))
+
+            low = energy.min()
+            if low > best + atol:
+                continue
+            if low < best - atol:
+                best, found, degeneracy = low, [], 0
+            ties = np.flatnonzero(energy <= best + atol)
+            degeneracy += len(ties)
+            if sum(len(f) for f in found) < max_ground_states:
+                high_index = int(high_bits[k:].dot(1 << np.arange(n - k, dtype=np.int64)))
+                found.append(ties.astype(np.int64) | (high_index << k))
+
+        index = np.concatenate(found)[:max_ground_states] if found else np.zeros(0, np.int64)
+        samples = ((index[:, None] >> np.arange(n, dtype=np.int64)) & 1).astype(np.int8)
+        if bqm.vartype is dimod.SPIN:
+            samples = 2 * samples - 1
+        response = dimod.SampleSet.from_samples_bqm((samples, labels), bqm)
+        response.info.update(ground_energy=float(best), degeneracy=degeneracy)
+        if counts is not None:
+            response.info['spectrum'] = sorted(counts.items())
+        return response
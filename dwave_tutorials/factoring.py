@@ -0,0 +1,136 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+factoring.py
+------------
+  Factor a whole list of numbers with the 2 by 2 multiplier circuit.
+
+logic-gates-2by2-multiplier.py factors one number: it adds four
+operator.truth/operator.not_ constraints to fix C, stitches, and
+samples. To factor another number you start over from stitching.
+
+The multiplier circuit is the same for every C, though. BatchFactorer
+stitches it once with the outputs left free. For each target it copies
+that model and fixes c3..c0 with fix_variable(), which just folds the
+fixed values into the linear biases -- no stitching, no penalty search.
+
+The fixed copies for all the distinct targets are then relabeled so
+they do not share variables, and placed side by side in one big model.
+One call to the sampler solves all of them at once. Each read is
+checked with plain integer arithmetic (A * B == C) for every target.
+
+A 2 by 2 multiplier only has 4 output bits, so targets must be between
+0 and 15. Numbers that have no 2-bit factors (like 5) come back with no
+factor pairs.
+
+Usage:
+
+  from dwave_tutorials.factoring import BatchFactorer
+
+  factorer = BatchFactorer()
+  results = factorer.factor([9, 6, 4, 9, 0])
+  results[9]   # {(3, 3)}
+"""
+
+import time
+
+import numpy as np
+import dimod
+from neal import SimulatedAnnealingSampler
+
+from dwave_tutorials import circuits, stitchcache
+
+output_bits = ('c0', 'c1', 'c2', 'c3')
+max_target = 15
+
+
+class BatchFactorer(object):
+    """Factor many numbers with one stitched 2x2 multiplier.
+
+    sampler defaults to SimulatedAnnealingSampler(); anything with a
+    sample(bqm, num_reads=...) method works, including an embedding
+    composite around a QPU. num_reads is per submission, and every
+    target in the submission shares those reads. Other keyword
+    arguments go to sampler.sample() (a seed, for example).
+    """
+
+    def __init__(self, sampler=None, num_reads=100, min_classical_gap=2.0, **parameters):
+        self.sampler = sampler if sampler is not None else SimulatedAnnealingSampler()
+        self.num_reads = num_reads
+        self.parameters = parameters
+        self.bqm = stitchcache.stitch(circuits.multiplier_2x2_csp(None),
+                                      min_classical_gap=min_classical_gap)
+        self.elapsed = 0.0
+        self.factored = 0
+
+    def target_bqm(self, c):
+        """The multiplier model with the output fixed to c."""
+        if not 0 <= c <= max_target:
+            raise ValueError('a 2 by 2 multiplier can only factor 0..{}, got {}'.format(
+                max_target, c))
+        bqm = self.bqm.copy()
+        for bit, label in enumerate(output_bits):
+            bqm.fix_variable(label, (c >> bit) & 1)
+        return bqm
+
+    def batch_bqm(self, targets):
+        """One model holding an independent copy of the circuit per target.
+
+        Variable v of target c is labeled (v, c).
+        """
+        batch = dimod.BinaryQuadraticModel.empty(self.bqm.vartype)
+        for c in targets:
+            bqm = self.target_bqm(c)
+            batch.update(bqm.relabel_variables({v: (v, c) for v in bqm.variables},
+                                               inplace=False))
+        return batch
+
+    def solve(self, targets):
+        """Sample all the distinct targets in one submission.
+
+        Returns {c: set of (a, b)} with every factor pair that showed up
+        in the reads.
+        """
+        targets = sorted(set(targets))
+        response = self.sampler.sample(self.batch_bqm(targets), num_reads=self.num_reads,
+                                       **self.parameters)
+        samples = response.record.sample
+        column = {v: i for i, v in enumerate(response.variables)}
+
+        found = {}
+        for c in targets:
+            a = samples[:, column[('a0', c)]] + 2 * samples[:, column[('a1', c)]]
+            b = samples[:, column[('b0', c)]] + 2 * samples[:, column[('b1', c)]]
+            ok = (a * b == c)
+            pairs = np.unique(np.stack([a[ok], b[ok]], axis=1), axis=0)
+            found[c] = set((int(x), int(y)) for x, y in pairs)
+        return found
+
+    def factor(self, numbers):
+        """Factor every number in numbers.
+
+        Duplicates are only solved once. Returns {number: set of (a, b)}.
+        """
+        start = time.time()
+        results = self.solve(numbers) if len(numbers) else {}
+        self.elapsed += time.time() - start
+        self.factored += len(numbers)
+        return results
+
+    def throughput(self):
+        """Factorizations per second so far."""
+        return self.factored / self.elapsed if self.elapsed else 0.0
@@ -0,0 +1,137 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+interning.py
+------------
+  Number the variables 0..n-1 once, and use the labels only for output.
+
+The tutorials label variables with strings: 'x11' for a square in four
+queens, 'a0', 'p1_0', 'c3' for the wires of a multiplier. dimod keeps a
+label table next to every model and every SampleSet, and anything that
+looks a value up by label goes through it:
+
+  for sample in response.samples():
+      board = [sample[label] for label in cells]    # n*n dict lookups
+
+The labels also have to be made carefully. The tutorial's
+'x'+str(row)+str(col) gives 'x111' for both row 1 column 11 and row 11
+column 1 once the board reaches 10 squares a side, and nothing
+complains. (nqueens.label() puts an underscore in between.)
+
+A LabelIndex gives each label an integer the first time it sees it,
+counting up from 0. The model is then built with those integers as its
+variables, in that order, so column i of every sample matrix is
+variable i: the checks, the drawing and compiled.py work on the sample
+matrix with no lookups at all. The labels come back at the end, for
+printing or for handing the response to code that wants them, with
+sampleset() or sample().
+
+nqueens.model() and multiplier.multiplier_model() build their models
+this way and return the LabelIndex with them.
+
+Usage:
+
+  from dwave_tutorials import nqueens
+
+  bqm, index = nqueens.model(8)
+  response = sampler.sample(bqm, num_reads=100)
+  X = index.columns(response)                  # column i is variable i
+  ok = nqueens.check_matrix(X, 8)
+  print(index.sample(X[0]))                    # {'x1_1': 0, ...}
+
+Any other model can be brought over with bqm():
+
+  index = interning.LabelIndex()
+  small = index.bqm(circuit_bqm)
+"""
+
+import numpy as np
+import dimod
+
+
+class LabelIndex(object):
+    """Labels numbered 0..n-1 in the order they were interned.
+
+    labels is the list of labels, so labels[i] is the label of i, and
+    index maps each label back to its number.
+    """
+
+    def __init__(self, labels=()):
+        self.labels = []
+        self.index = {}
+        for label in labels:
+            self.intern(label)
+
+    def __len__(self):
+        return len(self.labels)
+
+    def __contains__(self, label):
+        return label in self.index
+
+    def intern(self, label):
+        """The number of label, giving it the next one if it is new."""
+        i = self.index.get(label)
+        if i is None:
+            i = self.index[label] = len(self.labels)
+            self.labels.append(label)
+        return i
+
+    def indices(self, labels):
+        """The numbers of labels (interning any new ones), as an array."""
+        return np.fromiter((self.intern(label) for label in labels), dtype=np.intp)
+
+    def label_list(self, indices):
+        """The labels of the numbers in indices."""
+        return [self.labels[i] for i in indices]
+
+    def bqm(self, bqm):
+        """bqm with its variables replaced by their numbers.
+
+        bqm's variables are interned in its order, and have to be all
+        of this index's labels: use a new LabelIndex, or one made from
+        the same labels in the order you want the numbers in.
+        """
+        self.indices(bqm.variables)
+        if len(self.labels) != bqm.num_variables:
+            raise ValueError('the index has {} labels, the model {} variables'.format(
+                len(self.labels), bqm.num_variables))
+        linear, quadratic, offset = bqm.to_numpy_vectors(variable_order=self.labels)
+        return dimod.BinaryQuadraticModel.from_numpy_vectors(
+            linear, quadratic, offset, bqm.vartype)
+
+    def columns(self, response):
+        """A response's samples as a matrix, column i for variable i.
+
+        The response has to come from a model with numbered variables.
+        Variables the response does not have are left 0.
+        """
+        numbers = np.fromiter(response.variables, dtype=np.intp, count=len(response.variables))
+        samples = response.record.sample
+        if np.array_equal(numbers, np.arange(len(self.labels))):
+            return samples
+        X = np.zeros((len(samples), len(self.labels)), dtype=samples.dtype)
+        X[:, numbers] = samples
+        return X
+
+    def sample(self, row):
+        """One row of columns() as a dict keyed by label."""
+        return dict(zip(self.labels, (int(value) for value in row)))
+
+    def sampleset(self, response):
+        """A copy of a numbered response, with the labels put back."""
+        return response.relabel_variables(
+            {v: self.labels[v] for v in response.variables}, inplace=False)
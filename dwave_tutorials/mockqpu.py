@@ -0,0 +1,252 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+mockqpu.py
+----------
+  A local stand-in for DWaveSampler().
+
+Every tutorial has a useQpu branch that builds DWaveSampler(), usually
+wrapped in EmbeddingComposite(). Without a network connection and QPU
+time, none of that code can run, and fun-coin.py never gets to print a
+real qpu_access_time.
+
+MockQPUSampler looks like a QPU from the outside:
+
+- it has a Chimera or Pegasus working graph (nodelist and edgelist),
+  optionally with some dead qubits, so EmbeddingComposite has to find
+  a real embedding
+- it refuses problems that do not fit the working graph, just like the
+  real thing
+- it accepts annealing_time and anneal_schedule, and checks the
+  schedule the same way the QPU does
+- it returns a timing dictionary with the same keys as the QPU, and the
+  books balance (see the notes at the bottom of fun-coin.py)
+
+Under the hood it is the simulated annealer. The anneal length sets the
+number of sweeps, so a 5us quench really does give worse answers than
+a 20us anneal. The shape of the schedule (pauses and so on) is ignored;
+ScheduleAnnealingSampler in annealer.py follows it.
+
+The timing numbers are synthetic, but they are computed from the same
+formula the QPU uses, so they are consistent from run to run:
+
+  qpu_sampling_time = num_reads * (anneal + readout + delay)
+  qpu_access_time = qpu_programming_time + qpu_sampling_time
+
+Set simulate_latency=True to have sample() actually take that long,
+which is handy when benchmarking code that overlaps QPU calls.
+
+Usage:
+
+  from dwave.system.composites import EmbeddingComposite
+  from dwave_tutorials.mockqpu import MockQPUSampler
+
+  sampler = EmbeddingComposite(MockQPUSampler())
+"""
+
+import time
+
+import numpy as np
+import dimod
+from neal import SimulatedAnnealingSampler
+
+try:
+    import dwave_networkx as dnx
+except ImportError:  # newer Ocean releases renamed the package
+    import dwave.graphs as dnx
+
+# Timing constants, in microseconds. These are the numbers from the
+# sample timing at the bottom of fun-coin.py.
+programming_time = 7589.0
+readout_time_per_sample = 123.0
+delay_time_per_sample = 21.0
+post_processing_overhead_time = 360.0
+access_overhead_time = 2487.0
+post_processing_time_per_sample = 0.365
+
+default_annealing_time = 20.0
+max_anneal_schedule_points = 4
+annealing_time_range = (1.0, 2000.0)
+num_reads_range = (1, 10000)
+
+# How many simulated annealing sweeps one microsecond of anneal buys.
+# 50 sweeps/us makes the default 20us anneal the annealer's default of
+# 1000 sweeps.
+sweeps_per_us = 50
+
+
+def validate_anneal_schedule(schedule, max_points=max_anneal_schedule_points,
+                             time_range=annealing_time_range):
+    """Raise ValueError if schedule is not a valid QPU anneal schedule.
+
+    These are the rules from the D-Wave documentation: time must
+    increase, the schedule starts at time 0, ends at s=1, and s stays
+    between 0 and 1. A forward anneal starts at s=0 and s never goes
+    down; a reverse anneal starts and ends at s=1.
+    """
+    points = [(float(t), float(s)) for t, s in schedule]
+    if len(points) < 2:
+        raise ValueError('an anneal schedule needs at least two points')
+    if len(points) > max_points:
+        raise ValueError('an anneal schedule can have at most {} points, got {}'.format(
+            max_points, len(points)))
+    if points[0][0] != 0.0:
+        raise ValueError('an anneal schedule must start at time 0')
+    if points[-1][1] != 1.0:
+        raise ValueError('an anneal schedule must end at s=1')
+    for (t0, s0), (t1, s1) in zip(points, points[1:]):
+        if t1 <= t0:
+            raise ValueError('anneal schedule time must increase: {} then {}'.format(t0, t1))
+    for t, s in points:
+        if not 0.0 <= s <= 1.0:
+            raise ValueError('anneal schedule s must be between 0 and 1, got {}'.format(s))
+    if points[0][1] == 0.0:
+        for (t0, s0), (t1, s1) in zip(points, points[1:]):
+            if s1 < s0:
+                raise ValueError('a forward anneal schedule must not decrease s')
+    elif points[0][1] != 1.0:
+        raise ValueError('an anneal schedule must start at s=0 (forward) or s=1 (reverse)')
+    if not time_range[0] <= points[-1][0] <= time_range[1]:
+        raise ValueError('anneal schedule length {}us is outside {}'.format(
+            points[-1][0], time_range))
+    return points
+
+
+def timing(num_reads, anneal_time):
+    """The QPU timing dictionary for num_reads anneals of anneal_time us."""
+    sampling = num_reads * (anneal_time + readout_time_per_sample + delay_time_per_sample)
+    post_processing = post_processing_time_per_sample * num_reads
+    access = programming_time + sampling
+    return {
+        'total_real_time': access,
+        'qpu_access_time': access,
+        'qpu_access_overhead_time': access_overhead_time,
+        'qpu_programming_time': programming_time,
+        'qpu_sampling_time': sampling,
+        'run_time_chip': sampling,
+        'anneal_time_per_run': anneal_time,
+        'readout_time_per_run': readout_time_per_sample,
+        'qpu_anneal_time_per_sample': anneal_time,
+        'qpu_readout_time_per_sample': readout_time_per_sample,
+        'qpu_delay_time_per_sample': delay_time_per_sample,
+        'post_processing_overhead_time': post_processing_overhead_time,
+        'total_post_processing_time': post_processing_overhead_time + post_processing,
+    }
+
+
+class MockQPUSampler(dimod.Sampler, dimod.Structured):
+    """A simulated QPU with a Chimera or Pegasus working graph.
+
+    topology is 'chimera' (shape (m, n, t), default a 16x16x4 C16 like
+    the 2000Q) or 'pegasus' (shape (m,), default 16). broken_fraction
+    removes that fraction of qubits at random, seeded by seed, so the
+    working graph has holes like a real chip.
+    """
+
+    def __init__(self, topology='chimera', shape=None, broken_fraction=0.0,
+                 seed=None, simulate_latency=False):
+        if topology == 'chimera':
+            shape = tuple(shape or (16, 16, 4))
+            graph = dnx.chimera_graph(*shape)
+        elif topology == 'pegasus':
+            shape = tuple(shape or (16,))
+            graph = dnx.pegasus_graph(*shape)
+        else:
+            raise ValueError("topology must be 'chimera' or 'pegasus', got {!r}".format(topology))
+
+        if broken_fraction:
+            rng = np.random.RandomState(seed)
+            nodes = sorted(graph.nodes)
+            broken = rng.choice(len(nodes), int(round(broken_fraction * len(nodes))),
+                                replace=False)
+            graph.remove_nodes_from(nodes[i] for i in broken)
+
+        self.topology = topology
+        self.shape = shape
+        self.simulate_latency = simulate_latency
+        self._nodelist = sorted(graph.nodes)
+        self._edgelist = sorted(tuple(sorted(edge)) for edge in graph.edges)
+        self._annealer = SimulatedAnnealingSampler()
+
+    @property
+    def nodelist(self):
+        return self._nodelist
+
+    @property
+    def edgelist(self):
+        return self._edgelist
+
+    @property
+    def properties(self):
+        return {
+            'chip_id': 'MOCK_{}{}'.format(self.topology[0].upper(), self.shape[0]),
+            'topology': {'type': self.topology, 'shape': list(self.shape)},
+            'qubits': self._nodelist,
+            'couplers': self._edgelist,
+            'h_range': [-2.0, 2.0],
+            'j_range': [-1.0, 1.0],
+            'default_annealing_time': default_annealing_time,
+            'annealing_time_range': list(annealing_time_range),
+            'max_anneal_schedule_points': max_anneal_schedule_points,
+            'num_reads_range': list(num_reads_range),
+        }
+
+    @property
+    def parameters(self):
+        return {'num_reads': [], 'annealing_time': [], 'anneal_schedule': [],
+                'seed': [], 'answer_mode': []}
+
+    @dimod.bqm_structured
+    def sample(self, bqm, num_reads=1, annealing_time=None, anneal_schedule=None,
+               seed=None, answer_mode='histogram'):
+        """Sample bqm as if it were running on the QPU.
+
+        bqm must fit the working graph; use EmbeddingComposite for
+        anything else.
+        """
+        if not num_reads_range[0] <= num_reads <= num_reads_range[1]:
+            raise ValueError('num_reads must be in {}, got {}'.format(
+                num_reads_range, num_reads))
+        if anneal_schedule is not None and annealing_time is not None:
+            raise ValueError('annealing_time and anneal_schedule are mutually exclusive')
+
+        if anneal_schedule is not None:
+            anneal_time = validate_anneal_schedule(anneal_schedule)[-1][0]
+        elif annealing_time is not None:
+            anneal_time = float(annealing_time)
+            if not annealing_time_range[0] <= anneal_time <= annealing_time_range[1]:
+                raise ValueError('annealing_time must be in {}, got {}'.format(
+                    annealing_time_range, anneal_time))
+        else:
+            anneal_time = default_annealing_time
+
+        start = time.time()
+        response = self._annealer.sample(
+            bqm, num_reads=num_reads, seed=seed,
+            num_sweeps=max(1, int(round(sweeps_per_us * anneal_time))))
+        if answer_mode == 'histogram':
+            response = response.aggregate()
+
+        info = timing(num_reads, anneal_time)
+        if self.simulate_latency:
+            remaining = info['qpu_access_time'] / 1e6 - (time.time() - start)
+            if remaining > 0:
+                time.sleep(remaining)
+
+        response.info.clear()
+        response.info['timing'] = info
+        return response
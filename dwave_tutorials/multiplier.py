@@ -0,0 +1,168 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+multiplier.py
+-------------
+  N by M array multipliers, of any size.
+
+logic-gates-2by2-multiplier.py wires up a 2 by 2 multiplier by hand. The
+same circuit works for any size; it is the grade-school method:
+
+  - partial products: a_j AND b_i, worth 2^(i+j)
+  - row 0 is the running sum; every later row of partial products is
+    added into it with a row of half and full adders, shifted one place
+    further left each time
+
+The inputs are a0..a(n-1) and b0..b(m-1), and the product comes out on
+c0..c(n+m-1), just like the tutorial. The other wires are named 'pI_J'
+(partial products), 'sI_W' (sums) and 'kI_W' (carries), where I is the
+row and W the bit weight.
+
+The models are built from the precomputed gate templates in
+templates.py, not with stitch(), so even a 16 by 16 multiplier takes
+only milliseconds.
+
+Usage:
+
+  from dwave_tutorials import multiplier
+
+  bqm = multiplier.multiplier_bqm(4, 4, c=143)   # 11 * 13
+
+multiplier_model() builds the same model over numbered variables and
+returns an interning.LabelIndex for the labels.
+"""
+
+import operator
+
+import dimod
+import dwavebinarycsp
+import dwavebinarycsp.factories.constraint.gates as gates
+
+from dwave_tutorials import interning, templates
+
+
+def array_multiplier(n, m):
+    """The gate netlist of an n-bit by m-bit array multiplier.
+
+    Returns a templates.Circuit whose gates are in evaluation order, so
+    Circuit.simulate() works on it.
+    """
+    if n < 1 or m < 1:
+        raise ValueError('multiplier sizes must be at least 1, got {} by {}'.format(n, m))
+
+    circuit = templates.Circuit()
+    for i in range(m):
+        for j in range(n):
+            circuit.add(templates.and_gate,
+                        ['a{}'.format(j), 'b{}'.format(i), 'p{}_{}'.format(i, j)])
+
+    # acc[w] is the wire holding bit w of the running sum.
+    acc = ['p0_{}'.format(j) for j in range(n)]
+    for i in range(1, m):
+        carry = None
+        for j in range(n):
+            w = i + j
+            terms = [wire for wire in (acc[w] if w < len(acc) else None,
+                                       'p{}_{}'.format(i, j), carry) if wire is not None]
+            if len(terms) == 1:
+                total, carry = terms[0], None
+            else:
+                total, carry = 's{}_{}'.format(i, w), 'k{}_{}'.format(i, w)
+                adder = templates.half_adder if len(terms) == 2 else templates.full_adder
+                circuit.add(adder, terms + [total, carry])
+            if w < len(acc):
+                acc[w] = total
+            else:
+                acc.append(total)
+        if carry is not None:
+            acc.append(carry)
+
+    # With a 1-bit factor nothing carries out of the top bit, so the
+    # last product bit is a wire that is always 0.
+    for w in range(len(acc), n + m):
+        acc.append('zero{}'.format(w))
+        circuit.add(templates.zero_gate, acc[-1:])
+
+    # Give the product bits their tutorial names.
+    rename = {wire: 'c{}'.format(w) for w, wire in enumerate(acc)}
+    circuit.gates = [(template, [rename.get(wire, wire) for wire in wires])
+                     for template, wires in circuit.gates]
+    return circuit
+
+
+def multiplier_bqm(n, m, c=None, strength=1.0):
+    """The BQM of an n by m array multiplier.
+
+    With c, the product bits are fixed to the binary digits of c, so the
+    ground states are the factorizations of c. strength scales every
+    gate penalty.
+    """
+    numbered, index = multiplier_model(n, m, c, strength)
+    return numbered.relabel_variables(dict(enumerate(index.labels)), inplace=True)
+
+
+def multiplier_model(n, m, c=None, strength=1.0):
+    """multiplier_bqm() with the variables numbered 0, 1, 2, ...
+
+    Returns (bqm, index), where index is the interning.LabelIndex from
+    those numbers to multiplier_bqm()'s labels. The fixed product bits
+    are left out of the numbering.
+    """
+    circuit = array_multiplier(n, m)
+    bqm = circuit.bqm(strength=strength, labeled=False)
+    labels = circuit.labels()
+    if c is None:
+        return bqm, interning.LabelIndex(labels)
+
+    width = n + m
+    if not 0 <= c < 2 ** width:
+        raise ValueError('{} does not fit in {} product bits'.format(c, width))
+    index = interning.LabelIndex(labels)
+    fixed = {}
+    for bit in range(width):
+        label = 'c{}'.format(bit)
+        if label not in index:
+            # Dropping the bit would drop its part of c from the problem.
+            raise ValueError('the circuit has no product bit {}'.format(label))
+        fixed[index.index[label]] = (c >> bit) & 1
+    bqm.fix_variables(fixed)
+
+    # Number what is left from 0 again, in the circuit's order.
+    keep = [v for v in range(len(labels)) if v not in fixed]
+    linear, quadratic, offset = bqm.to_numpy_vectors(variable_order=keep)
+    return (dimod.BinaryQuadraticModel.from_numpy_vectors(
+                linear, quadratic, offset, dimod.BINARY),
+            interning.LabelIndex(labels[v] for v in keep))
+
+
+def multiplier_csp(n, m):
+    """The same netlist as a dwavebinarycsp CSP, for stitch() to chew on.
+
+    This is the slow way, kept for comparison (see
+    benchmarks/benchmarks-multiplier.py).
+    """
+    factories = {
+        'zero': lambda wires: dwavebinarycsp.Constraint.from_func(
+            operator.not_, wires, dwavebinarycsp.BINARY),
+        'and': gates.and_gate,
+        'halfadder': gates.halfadder_gate,
+        'fulladder': gates.fulladder_gate,
+    }
+    csp = dwavebinarycsp.ConstraintSatisfactionProblem(dwavebinarycsp.BINARY)
+    for template, wires in array_multiplier(n, m).gates:
+        csp.add_constraint(factories[template.name](wires))
+    return csp
@@ -0,0 +1,193 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+nqueens.py
+----------
+  Build an n-queens problem of any size.
+
+fun-four-queens.py builds its problem from or4 and nand constraints and
+hands them to dwavebinarycsp.stitch(). stitch() searches for a penalty
+model for every constraint, which takes seconds for a 4x4 board and
+gets out of hand quickly after that.
+
+We do not need the search. The penalties for n-queens are well known:
+
+  exactly one queen per row:     P * (x1 + x2 + ... + xn - 1)^2
+  exactly one queen per column:  P * (x1 + x2 + ... + xn - 1)^2
+  at most one queen per diagonal: P * (sum of xi * xj for every pair)
+
+Expanding (sum - 1)^2 for binary variables gives -1 on every variable,
++2 on every pair, and +1 in the offset. Every pair of squares shares at
+most one row, column or diagonal, so each line contributes its own
+pairs and nothing is counted twice. A valid board has energy 0 and
+anything else has energy of at least P.
+
+The model is built from NumPy arrays in O(n^3) time, so 8, 16 and 32
+queens take milliseconds.
+
+Variables are labeled 'x<row>_<col>', counting from 1. (The tutorial's
+'x'+str(row)+str(col) labels collide once n reaches 10: 'x111' could be
+row 1 column 11 or row 11 column 1.)
+
+model() builds the same model with the squares numbered 0..n*n-1, and
+hands back the labels in an interning.LabelIndex for the output.
+"""
+
+import numpy as np
+import dimod
+
+from dwave_tutorials import interning
+
+# The tutorial's ASCII art for an empty square and a queen.
+squares = {0: '*', 1: 'Q'}
+
+
+def label(row, col):
+    """Label for the square at row, col (both counting from 1)."""
+    return 'x{}_{}'.format(row, col)
+
+
+def labels(n):
+    """All labels for an n by n board, row by row."""
+    return [label(row, col) for row in range(1, n + 1) for col in range(1, n + 1)]
+
+
+def lines(n):
+    """Yield the squares (as flat indices) on every line of the board.
+
+    Yields (kind, indices) where kind is 'row', 'col' or 'diag'. Only
+    diagonals with at least two squares are included.
+    """
+    grid = np.arange(n * n).reshape(n, n)
+    for i in range(n):
+        yield 'row', grid[i, :]
+    for i in range(n):
+        yield 'col', grid[:, i]
+    flipped = grid[:, ::-1]
+    for offset in range(-(n - 2), n - 1):
+        yield 'diag', np.diagonal(grid, offset)
+        yield 'diag', np.diagonal(flipped, offset)
+
+
+def bqm(n, penalty=1.0):
+    """Return the n-queens BinaryQuadraticModel.
+
+    Valid boards have energy 0; every broken constraint adds at least
+    penalty to the energy.
+    """
+    numbered, index = model(n, penalty)
+    return numbered.relabel_variables(dict(enumerate(index.labels)), inplace=True)
+
+
+def model(n, penalty=1.0):
+    """bqm(n, penalty) with the squares numbered row by row instead.
+
+    Returns (bqm, index): square (row, col) is variable (row - 1) * n +
+    (col - 1), and index is the interning.LabelIndex that maps those
+    numbers to labels(n). Samples come back with columns in the order
+    check_matrix() and draw() want.
+    """
+    linear = np.zeros(n * n)
+    rows, cols = [], []
+    offset = 0.0
+    for kind, line in lines(n):
+        i, j = np.triu_indices(len(line), k=1)
+        rows.append(line[i])
+        cols.append(line[j])
+        if kind == 'diag':
+            continue
+        # (sum - 1)^2 = -sum + 2 * pairs + 1 for binary variables
+        linear[line] -= penalty
+        offset += penalty
+    rows = np.concatenate(rows)
+    cols = np.concatenate(cols)
+
+    # Row and column pairs get 2 * penalty, diagonal pairs get penalty.
+    # The row and column pairs come first in rows/cols.
+    num_line_pairs = 2 * n * (n * (n - 1) // 2)
+    data = np.full(len(rows), float(penalty))
+    data[:num_line_pairs] *= 2
+
+    return (dimod.BinaryQuadraticModel.from_numpy_vectors(
+                linear, (rows, cols, data), offset, dimod.BINARY),
+            interning.LabelIndex(labels(n)))
+
+
+def csp(n):
+    """Return the n-queens ConstraintSatisfactionProblem.
+
+    This is the same construction as fun-four-queens.py (an OR for each
+    row plus a NAND for every pair of squares in a line), generalized to
+    any n. It is here so the direct bqm() can be compared against
+    stitch(). Be warned: stitch() cannot find a penalty model for an OR
+    of more than 8 variables.
+    """
+    import dwavebinarycsp
+
+    def any_(*args):
+        return any(args)
+
+    def nand(in0, in1):
+        return not (in0 and in1)
+
+    names = labels(n)
+    problem = dwavebinarycsp.ConstraintSatisfactionProblem(dwavebinarycsp.BINARY)
+    for kind, line in lines(n):
+        if kind == 'row':
+            problem.add_constraint(any_, [names[s] for s in line])
+        i, j = np.triu_indices(len(line), k=1)
+        for a, b in zip(line[i], line[j]):
+            problem.add_constraint(nand, [names[a], names[b]])
+    return problem
+
+
+def check_matrix(samples, n):
+    """Return a boolean mask of the rows of samples that are valid boards.
+
+    samples is a (rows x n*n) array with columns in labels(n) order.
+    """
+    boards = np.asarray(samples).reshape(-1, n, n).astype(np.int32)
+    ok = (boards.sum(axis=2) == 1).all(axis=1)
+    ok &= (boards.sum(axis=1) == 1).all(axis=1)
+
+    # Sum each diagonal by multiplying with a square-to-diagonal matrix.
+    r, c = np.divmod(np.arange(n * n), n)
+    flat = boards.reshape(-1, n * n)
+    for diag in (r - c + n - 1, r + c):
+        incidence = np.zeros((n * n, 2 * n - 1), dtype=np.int32)
+        incidence[np.arange(n * n), diag] = 1
+        ok &= ((flat @ incidence) <= 1).all(axis=1)
+    return ok
+
+
+def draw(sample, n):
+    """Draw a board the same way fun-four-queens.py does.
+
+    sample is either a dict keyed by label or a row in labels(n) order.
+    """
+    if isinstance(sample, dict):
+        values = [sample[name] for name in labels(n)]
+    else:
+        values = list(sample)
+    border = '+-' * n + '+\n'
+    result = border
+    for row in range(n):
+        for col in range(n):
+            result += '|' + squares[int(values[row * n + col])]
+        result += '|\n'
+        result += border
+    return result
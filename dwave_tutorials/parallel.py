@@ -0,0 +1,130 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+parallel.py
+-----------
+  Spread the reads of a simulated annealer across several processes.
+
+SimulatedAnnealingSampler() runs on one core. Every read is an
+independent anneal, though, so nothing stops us from splitting
+num_reads into shards, annealing each shard in its own process with its
+own seed, and gluing the results back together.
+
+Usage:
+
+  from dwave_tutorials.parallel import ParallelSampler
+
+  with ParallelSampler(num_workers=8) as sampler:
+      response = sampler.sample(bqm, num_reads=100000, seed=42)
+
+The worker processes are started on the first call and reused until
+close() (or the end of the with block). Starting processes costs tens
+of milliseconds, so for a few dozen reads the plain annealer is faster.
+
+Any other sampler that takes num_reads and seed can be used by passing
+its class (or any picklable function that returns a sampler) as
+sampler_factory.
+
+Note: on platforms that start worker processes by re-importing the
+main script (Windows, and macOS by default), the calling script needs
+an "if __name__ == '__main__':" guard.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import dimod
+from neal import SimulatedAnnealingSampler
+
+# One sampler per worker process, made the first time it is needed.
+_samplers = {}
+
+
+def _sample_shard(sampler_factory, bqm, num_reads, seed, parameters):
+    sampler = _samplers.get(sampler_factory)
+    if sampler is None:
+        sampler = _samplers[sampler_factory] = sampler_factory()
+    return sampler.sample(bqm, num_reads=num_reads, seed=seed, **parameters)
+
+
+def shard_sizes(num_reads, num_shards):
+    """Split num_reads into at most num_shards nearly equal parts."""
+    base, extra = divmod(num_reads, num_shards)
+    sizes = [base + 1] * extra + [base] * (num_shards - extra)
+    return [size for size in sizes if size > 0]
+
+
+class ParallelSampler(dimod.Sampler):
+    """A sampler that shards num_reads across a pool of processes.
+
+    num_workers defaults to the number of CPUs.
+    """
+
+    def __init__(self, num_workers=None, sampler_factory=SimulatedAnnealingSampler):
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.sampler_factory = sampler_factory
+        self._child = sampler_factory()
+        self._pool = None
+
+    @property
+    def parameters(self):
+        return self._child.parameters
+
+    @property
+    def properties(self):
+        return {'num_workers': self.num_workers,
+                'child_properties': self._child.properties}
+
+    def sample(self, bqm, num_reads=1, seed=None, **parameters):
+        """Sample bqm, splitting num_reads across the worker processes.
+
+        Each shard gets its own seed, drawn from seed, so a run with a
+        given seed and worker count is repeatable.
+        """
+        if num_reads < 1:
+            raise ValueError('num_reads must be at least 1, got {}'.format(num_reads))
+        sizes = shard_sizes(num_reads, self.num_workers)
+        seeds = np.random.RandomState(seed).randint(0, 2**31 - 1, size=len(sizes))
+
+        if len(sizes) == 1:
+            # Not worth a trip through the pool.
+            return _sample_shard(self.sampler_factory, bqm, sizes[0],
+                                 int(seeds[0]), parameters)
+
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.num_workers)
+        futures = [
+            self._pool.submit(_sample_shard, self.sampler_factory, bqm,
+                              size, int(shard_seed), parameters)
+            for size, shard_seed in zip(sizes, seeds)
+        ]
+        responses = [future.result() for future in futures]
+        response = dimod.concatenate(responses)
+        response.info['num_workers'] = len(responses)
+        return response
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
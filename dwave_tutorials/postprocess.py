@@ -0,0 +1,171 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+postprocess.py
+--------------
+  Walk every sample downhill before it is checked.
+
+The sample QPU output in logic-gates-full-adder.py has 152 valid
+solutions and 4848 invalid ones, and the tutorial throws the invalid
+ones away. Many of them are near misses: one or two bits away from a
+valid answer, sitting just above a ground state. A little classical
+local search fixes those for almost nothing.
+
+SteepestDescentComposite wraps any sampler. After the child returns,
+every row of the response goes through
+
+  - steepest descent: flip the variable that lowers the energy the
+    most, and repeat until no single flip helps (a local minimum)
+  - optionally, a short tabu search (tabu_steps > 0): keep taking the
+    best flip even when it goes uphill, but do not undo a recent flip
+    for tabu_tenure steps. This climbs out of shallow local minima. The
+    lowest energy seen is kept.
+
+All rows move at once: each step is one batch of flip deltas from
+compiled.CompiledQUBO and one in-place flip per row, and rows drop out
+as soon as they reach a local minimum. The number of occurrences of
+each row is left alone, so the valid/invalid tallies in the tutorials
+still count reads.
+
+Usage:
+
+  from dwave_tutorials.postprocess import SteepestDescentComposite
+
+  sampler = SteepestDescentComposite(sampler_embedded)
+  response = sampler.sample(bqm, num_reads=5000)
+  response.info['postprocessing']
+
+or, for a response you already have:
+
+  response = postprocess.repair(response, bqm)
+"""
+
+import time
+
+import numpy as np
+import dimod
+
+from dwave_tutorials.compiled import CompiledQUBO
+
+
+def descend(qubo, X, max_steps=None, atol=1e-9):
+    """Steepest descent on every row of the 0/1 matrix X.
+
+    Returns (X, steps): a descended copy of X and the number of steps
+    the slowest row needed.
+    """
+    X = np.array(X, dtype=np.int8)
+    fields = qubo.fields(X)
+    active = np.arange(len(X)) if len(qubo) else np.arange(0)
+    steps = 0
+    while len(active) and (max_steps is None or steps < max_steps):
+        deltas = qubo.flip_deltas(X[active], fields[active])
+        best = deltas.argmin(axis=1)
+        improving = deltas[np.arange(len(active)), best] < -atol
+        active, best = active[improving], best[improving]
+        qubo.flip(X, fields, active, best)
+        steps += len(active) > 0
+    return X, steps
+
+
+def tabu_search(qubo, X, num_steps, tenure=None, atol=1e-9):
+    """A short tabu search from every row of X; returns each row's best."""
+    X = np.array(X, dtype=np.int8)
+    if tenure is None:
+        tenure = max(1, min(20, len(qubo) // 4))
+    fields = qubo.fields(X)
+    energies = qubo.energies(X)
+    best_X, best_energies = X.copy(), energies.copy()
+    tabu_until = np.zeros(X.shape, dtype=np.int64)
+    rows = np.arange(len(X))
+
+    for step in range(1, num_steps + 1 if len(qubo) else 1):
+        deltas = qubo.flip_deltas(X, fields)
+        # A tabu flip is still allowed if it beats the row's best energy.
+        allowed = ((tabu_until < step) |
+                   (energies[:, None] + deltas < best_energies[:, None] - atol))
+        deltas = np.where(allowed, deltas, np.inf)
+        move = deltas.argmin(axis=1)
+        change = deltas[rows, move]
+        moving = np.isfinite(change)
+        qubo.flip(X, fields, rows[moving], move[moving])
+        energies[moving] += change[moving]
+        tabu_until[rows[moving], move[moving]] = step + tenure
+
+        better = energies < best_energies - atol
+        best_X[better] = X[better]
+        best_energies[better] = energies[better]
+    return best_X
+
+
+def repair(response, bqm, max_steps=None, tabu_steps=0, tabu_tenure=None):
+    """response with every row run through descent (and tabu search).
+
+    The new SampleSet keeps the rows in record order, with their
+    num_occurrences, and adds info['postprocessing'].
+    """
+    start = time.time()
+    qubo = CompiledQUBO.from_bqm(bqm)
+    record = response.record
+    X = qubo.columns(response)
+    before = qubo.energies(X)
+    X, steps = descend(qubo, X, max_steps)
+    if tabu_steps:
+        X = tabu_search(qubo, X, tabu_steps, tabu_tenure)
+    after = qubo.energies(X)
+
+    samples = X if bqm.vartype is dimod.BINARY else 2 * X - 1
+    vectors = {name: record[name] for name in record.dtype.names
+               if name not in ('sample', 'energy')}
+    info = dict(response.info)
+    info['postprocessing'] = {
+        'seconds': time.time() - start,
+        'descent_steps': steps,
+        'tabu_steps': tabu_steps,
+        'rows_improved': int((after < before - 1e-9).sum()),
+    }
+    return dimod.SampleSet.from_samples_bqm((samples, qubo.labels), bqm,
+                                            info=info, **vectors)
+
+
+class SteepestDescentComposite(dimod.ComposedSampler):
+    """Run repair() on whatever the child sampler returns.
+
+    max_steps, tabu_steps and tabu_tenure are taken by this composite;
+    every other keyword argument goes to the child.
+    """
+
+    def __init__(self, child):
+        self._children = [child]
+
+    @property
+    def children(self):
+        return self._children
+
+    @property
+    def parameters(self):
+        parameters = dict(self.child.parameters)
+        parameters.update(max_steps=[], tabu_steps=[], tabu_tenure=[])
+        return parameters
+
+    @property
+    def properties(self):
+        return {'child_properties': self.child.properties}
+
+    def sample(self, bqm, max_steps=None, tabu_steps=0, tabu_tenure=None, **parameters):
+        response = self.child.sample(bqm, **parameters)
+        return repair(response, bqm, max_steps, tabu_steps, tabu_tenure)
@@ -0,0 +1,168 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+presolve.py
+-----------
+  Decide what the constraints already decide, before stitching.
+
+The 2 by 2 multiplier fixes c3..c0 with operator.truth and
+operator.not_ constraints, and then all 12 variables go through
+stitch() and the sampler anyway. But c0 = 1 and and(a0, b0) = c0
+leave only one choice for a0 and b0, and so on through the circuit.
+For C = 9 nothing is left to sample at all.
+
+presolve() works that out with constraint propagation (generalized arc
+consistency). Every variable starts with both values possible. Each
+constraint keeps only the configurations that fit what is still
+possible, and a value no remaining configuration uses is crossed off
+for that variable. A single-variable constraint like operator.truth
+does this in one step (unit propagation). Whenever a variable loses a
+value, the other constraints on it are checked again, until nothing
+changes.
+
+Then every variable with one value left is decided. Each constraint is
+restricted to the decided values and rewritten over just its undecided
+variables; constraints with nothing left to say are dropped. A
+variable that only shows up in dropped constraints can take either
+value, and is decided too, to its first possible value.
+
+The smaller CSP goes to stitch() and the sampler. expand() puts the
+decided variables back into the samples, under their original labels,
+so the samples can be checked against the original CSP.
+
+Usage:
+
+  from dwave_tutorials import presolve
+
+  presolved = presolve.presolve(csp)
+  print(presolved.report())
+  if presolved.csp.variables:
+      bqm = canonical.stitch(presolved.csp)
+      response = presolved.expand(sampler.sample(bqm, num_reads=100))
+  else:
+      response = presolved.sampleset(num_reads=100)
+
+Energies in the expanded response are the energies of the smaller
+model. Every decided variable satisfies its constraints, so it adds
+nothing. When every variable is decided there is nothing to stitch or
+sample, and sampleset() gives the answer as a response.
+"""
+
+import collections
+
+import dimod
+import dwavebinarycsp
+
+
+class Presolved(object):
+    """The result of presolve().
+
+    csp is the smaller CSP, fixed maps every decided variable to its
+    value, and eliminated lists the decided variables in the order of
+    the original CSP's variables.
+    """
+
+    def __init__(self, original, csp, fixed):
+        self.original = original
+        self.csp = csp
+        self.fixed = fixed
+        self.eliminated = [v for v in original.variables if v in fixed]
+
+    def expand(self, response):
+        """response with the decided variables added to every sample."""
+        if not self.fixed:
+            return response
+        return response.append_variables(self.fixed)
+
+    def sampleset(self, num_reads=1):
+        """The decided values as a response, num_reads times at energy 0.
+
+        Only for when every variable is decided, so there is nothing left
+        to sample.
+        """
+        if self.csp.variables:
+            raise ValueError('{} variables are not decided yet'.format(
+                len(self.csp.variables)))
+        return dimod.SampleSet.from_samples(
+            ([[self.fixed[v] for v in self.eliminated]], self.eliminated),
+            self.original.vartype, energy=[0.0], num_occurrences=[num_reads])
+
+    def report(self):
+        return ('presolve: {} of {} variables decided, {} of {} constraints left').format(
+            len(self.eliminated), len(self.original.variables),
+            len(self.csp.constraints), len(self.original.constraints))
+
+
+def propagate(csp):
+    """Arc consistency over csp.
+
+    Returns (domains, supports): the values still possible for each
+    variable, and the configurations still possible for each of
+    csp.constraints. Raises ValueError if a constraint has none left,
+    which means the CSP cannot be satisfied.
+    """
+    domains = {v: set(csp.vartype.value) for v in csp.variables}
+    supports = [set(const.configurations) for const in csp.constraints]
+    watching = collections.defaultdict(list)
+    for k, const in enumerate(csp.constraints):
+        for v in const.variables:
+            watching[v].append(k)
+
+    queue = collections.deque(range(len(supports)))
+    queued = set(queue)
+    while queue:
+        k = queue.popleft()
+        queued.discard(k)
+        variables = csp.constraints[k].variables
+        supports[k] = {config for config in supports[k]
+                       if all(value in domains[v] for v, value in zip(variables, config))}
+        if not supports[k] and variables:
+            raise ValueError('constraint on {} cannot be satisfied'.format(list(variables)))
+        for j, v in enumerate(variables):
+            values = {config[j] for config in supports[k]}
+            if values != domains[v]:
+                domains[v] = values
+                for other in watching[v]:
+                    if other != k and other not in queued:
+                        queue.append(other)
+                        queued.add(other)
+    return domains, supports
+
+
+def presolve(csp):
+    """Decide what propagation decides, and return a Presolved."""
+    domains, supports = propagate(csp)
+    fixed = {v: next(iter(values)) for v, values in domains.items() if len(values) == 1}
+
+    reduced = dwavebinarycsp.ConstraintSatisfactionProblem(csp.vartype)
+    for const, configurations in zip(csp.constraints, supports):
+        keep = [j for j, v in enumerate(const.variables) if v not in fixed]
+        if not keep:
+            continue
+        configurations = {tuple(config[j] for j in keep) for config in configurations}
+        if len(configurations) == len(csp.vartype.value) ** len(keep):
+            continue  # any values will do
+        reduced.add_constraint(dwavebinarycsp.Constraint.from_configurations(
+            configurations, [const.variables[j] for j in keep], csp.vartype,
+            name=const.name))
+
+    # Variables left without a constraint can take any value they still
+    # have.
+    for v in csp.variables:
+        if v not in fixed and v not in reduced.variables:
+            fixed[v] = min(domains[v])
+    return Presolved(csp, reduced, fixed)
@@ -0,0 +1,214 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+randomness.py
+-------------
+  Is the coin fair? Statistical tests for coin-flip samples.
+
+fun-coin.py draws a histogram of heads per trial, and a bell curve looks
+reassuring, but plenty of bad random sources draw nice bell curves.
+These are the standard first checks for a random bit source:
+
+  monobit       are there as many 1s as 0s overall?
+  runs          does the bit stream switch between 0 and 1 as often as
+                a fair coin would? (Bits are read trial by trial, coin
+                by coin.)
+  chi-square    does the heads-per-trial histogram match the binomial
+                distribution?
+  serial, reads is a coin correlated with itself on the next trial?
+  serial, coins is a coin correlated with its neighbor in the same
+                trial? (Neighbors on the QPU are often coupled qubits.)
+
+Each test gives a p-value: the chance a truly fair coin would look at
+least this far off. A tiny p-value (say below 0.001) means the coins
+are not fair. With many tests, expect one to dip low now and then.
+
+The tests only keep running totals, and each batch of samples is
+handled with a few whole-matrix NumPy operations, so tens of millions
+of bits go by in a second or so, and they can be fed from
+CoinFlipper.batches() without ever holding all the samples.
+
+Usage:
+
+  from dwave_tutorials.randomness import RandomnessTests
+
+  tests = RandomnessTests(num_coins)
+  for samples in flipper.batches(trials):
+      tests.update(samples)
+  for name, statistic, p_value in tests.results():
+      print(name, statistic, p_value)
+"""
+
+import time
+
+import numpy as np
+from scipy import special, stats
+
+
+def _p_normal(z):
+    # Two-sided p-value of a standard normal statistic.
+    return float(special.erfc(abs(z) / np.sqrt(2.0)))
+
+
+def _correlation(sum_xy, sum_x, sum_y, n):
+    # Pearson correlation of two 0/1 sequences from their running sums,
+    # and the z-score that goes with it. With no pairs there is nothing
+    # to hold against the coin, so p is 1. If either sequence never
+    # changes the correlation is undefined, but a coin that always lands
+    # the same way is not fair, so p is 0.
+    if n == 0:
+        return 0.0, 1.0
+    mean_x, mean_y = sum_x / n, sum_y / n
+    var = np.sqrt(mean_x * (1 - mean_x) * mean_y * (1 - mean_y))
+    if var == 0:
+        return 0.0, 0.0
+    r = (sum_xy / n - mean_x * mean_y) / var
+    return float(r), _p_normal(r * np.sqrt(n))
+
+
+class RandomnessTests(object):
+    """Running totals for the tests, fed one batch of samples at a time.
+
+    num_coins is the number of columns in every batch. Samples may be
+    0/1 or -1/+1.
+    """
+
+    def __init__(self, num_coins):
+        self.num_coins = num_coins
+        self.bits = 0
+        self.ones = 0
+        self.transitions = 0
+        self.heads = np.zeros(num_coins + 1, dtype=np.int64)
+        # Serial correlation, trial t versus trial t + 1, per coin.
+        self.read_pairs = 0
+        self.read_xy = 0
+        self.read_x = 0
+        self.read_y = 0
+        # Serial correlation, coin i versus coin i + 1, per trial.
+        self.coin_pairs = 0
+        self.coin_xy = 0
+        self.coin_x = 0
+        self.coin_y = 0
+        self._last = None
+        self.elapsed = 0.0
+
+    def update(self, samples):
+        """Add a batch: a 2D array, one row per trial, one column per coin."""
+        start = time.time()
+        x = np.asarray(samples) > 0
+        if x.ndim != 2 or x.shape[1] != self.num_coins:
+            raise ValueError('expected a batch with {} columns, got shape {}'.format(
+                self.num_coins, x.shape))
+        if x.shape[0] == 0:
+            return
+
+        # Put the last trial of the previous batch on top, so pairs that
+        # straddle two batches are counted too.
+        if self._last is not None:
+            joined = np.vstack([self._last, x])
+        else:
+            joined = x
+
+        row_ones = x.sum(axis=1, dtype=np.int64)
+        self.bits += x.size
+        self.ones += int(row_ones.sum())
+        self.heads += np.bincount(row_ones, minlength=len(self.heads))
+
+        flat = joined.ravel()
+        if self._last is not None:
+            flat = flat[self.num_coins - 1:]  # only the last bit of the old trial
+        self.transitions += int(np.count_nonzero(flat[1:] != flat[:-1]))
+
+        if joined.shape[0] > 1:
+            before, after = joined[:-1], joined[1:]
+            self.read_pairs += before.size
+            self.read_xy += int(np.count_nonzero(before & after))
+            self.read_x += int(np.count_nonzero(before))
+            self.read_y += int(np.count_nonzero(after))
+
+        if self.num_coins > 1:
+            left, right = x[:, :-1], x[:, 1:]
+            self.coin_pairs += left.size
+            self.coin_xy += int(np.count_nonzero(left & right))
+            self.coin_x += int(np.count_nonzero(left))
+            self.coin_y += int(np.count_nonzero(right))
+
+        self._last = x[-1:]
+        self.elapsed += time.time() - start
+
+    def monobit(self):
+        s = 2 * self.ones - self.bits
+        return float(s), float(special.erfc(abs(s) / np.sqrt(2.0 * self.bits)))
+
+    def runs(self):
+        """The NIST runs test. Returns (number of runs, p-value)."""
+        n = self.bits
+        pi = self.ones / float(n)
+        runs = self.transitions + 1
+        if abs(pi - 0.5) >= 2.0 / np.sqrt(n):
+            # The runs test assumes the monobit test passed.
+            return float(runs), 0.0
+        expected = 2.0 * n * pi * (1 - pi)
+        p = special.erfc(abs(runs - expected) / (2.0 * np.sqrt(2.0 * n) * pi * (1 - pi)))
+        return float(runs), float(p)
+
+    def chi_square(self):
+        """Heads per trial against Binomial(num_coins, 1/2).
+
+        Returns (chi-square, p-value).
+        """
+        trials = self.heads.sum()
+        expected = trials * stats.binom.pmf(np.arange(self.num_coins + 1), self.num_coins, 0.5)
+
+        # Every tail bin that expects fewer than 5 trials is pooled into
+        # the nearest bin that expects at least 5.
+        big = np.flatnonzero(expected >= 5.0)
+        if len(big) < 2:
+            return 0.0, 1.0
+        first, last = big[0], big[-1]
+        observed_bins = np.concatenate([[self.heads[:first + 1].sum()],
+                                        self.heads[first + 1:last],
+                                        [self.heads[last:].sum()]])
+        expected_bins = np.concatenate([[expected[:first + 1].sum()],
+                                        expected[first + 1:last],
+                                        [expected[last:].sum()]])
+        chi2 = float(((observed_bins - expected_bins) ** 2 / expected_bins).sum())
+        return chi2, float(stats.chi2.sf(chi2, len(observed_bins) - 1))
+
+    def serial_reads(self):
+        """Correlation of each coin with itself on the next trial."""
+        return _correlation(self.read_xy, self.read_x, self.read_y, self.read_pairs)
+
+    def serial_coins(self):
+        """Correlation of each coin with the next coin in the same trial."""
+        return _correlation(self.coin_xy, self.coin_x, self.coin_y, self.coin_pairs)
+
+    def results(self):
+        """[(test name, statistic, p-value), ...] for every test."""
+        if self.bits == 0:
+            raise ValueError('no samples yet')
+        return [
+            ('monobit',) + self.monobit(),
+            ('runs',) + self.runs(),
+            ('chi-square',) + self.chi_square(),
+            ('serial, reads',) + self.serial_reads(),
+            ('serial, coins',) + self.serial_coins(),
+        ]
+
+    def throughput(self):
+        """Bits tested per second so far."""
+        return self.bits / self.elapsed if self.elapsed else 0.0
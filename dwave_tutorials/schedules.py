@@ -0,0 +1,183 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+schedules.py
+------------
+  Sweep over many anneal schedules at once.
+
+dwave-features-anneal-schedule.py tries three hand-written schedules,
+one after the other. To find out where a pause actually helps you need
+to try a whole grid of them:
+
+  pause point    the anneal fraction s where the anneal stops
+  pause length   how long it stays there, in microseconds
+  quench time    how long the final ramp from the pause to s=1 takes
+                 (None means the normal ramp rate)
+
+pause_schedule() turns one set of those into a QPU schedule, and
+grid() makes the whole grid. ScheduleSweep checks every schedule before
+anything is submitted -- time and s must not go backwards, and the
+schedule must fit the sampler's point limit (four on the 2000Q) -- then
+submits them from a pool of threads. Most of a QPU call is waiting, so
+with a few workers a sweep of hundreds of schedules takes a fraction of
+the time it would one by one.
+
+For each schedule the sweep reports the probability of a ground state:
+the fraction of reads at the lowest energy. If you do not pass
+ground_energy, the lowest energy seen anywhere in the sweep is used.
+
+Usage:
+
+  from dwave_tutorials import schedules
+
+  grid = schedules.grid([0.3, 0.4, 0.5], [0, 10, 50], [None, 1.0])
+  sweep = schedules.ScheduleSweep(sampler, Q, num_reads=1000, max_workers=8)
+  rows = sweep.run(grid)
+  print(schedules.format_table(rows))
+"""
+
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import dimod
+
+from dwave_tutorials.mockqpu import (annealing_time_range, max_anneal_schedule_points,
+                                     validate_anneal_schedule)
+
+
+def pause_schedule(pause_point, pause_length, quench_time=None, annealing_time=20.0):
+    """A forward anneal that pauses at s=pause_point for pause_length us.
+
+    The ramp up to the pause runs at the normal rate (all the way from
+    s=0 to 1 in annealing_time). After the pause, the ramp to s=1 takes
+    quench_time, or the normal rate if quench_time is None.
+    """
+    if not 0.0 < pause_point < 1.0:
+        raise ValueError('pause_point must be between 0 and 1, got {}'.format(pause_point))
+    start = pause_point * annealing_time
+    points = [(0.0, 0.0), (start, pause_point)]
+    if pause_length > 0:
+        points.append((start + pause_length, pause_point))
+    ramp = (1.0 - pause_point) * annealing_time if quench_time is None else quench_time
+    points.append((points[-1][0] + ramp, 1.0))
+    return tuple(points)
+
+
+def grid(pause_points, pause_lengths, quench_times=(None,), annealing_time=20.0):
+    """Every combination of the parameters, as a list of dicts.
+
+    Each dict has the parameters and the schedule under 'schedule'.
+    """
+    return [{'pause_point': point, 'pause_length': length, 'quench_time': quench,
+             'schedule': pause_schedule(point, length, quench, annealing_time)}
+            for point, length, quench in itertools.product(pause_points, pause_lengths,
+                                                           quench_times)]
+
+
+class ScheduleSweep(object):
+    """Sample one problem under many anneal schedules, concurrently.
+
+    problem is a BinaryQuadraticModel or a QUBO dict. max_workers is
+    the number of submissions in flight at once; 1 runs the sweep
+    serially. Other keyword arguments go to sampler.sample().
+    """
+
+    def __init__(self, sampler, problem, num_reads=1000, max_workers=8,
+                 ground_energy=None, **parameters):
+        if not isinstance(problem, dimod.BinaryQuadraticModel):
+            problem = dimod.BinaryQuadraticModel.from_qubo(problem)
+        self.sampler = sampler
+        self.bqm = problem
+        self.num_reads = num_reads
+        self.max_workers = max_workers
+        self.ground_energy = ground_energy
+        self.parameters = parameters
+
+        properties = getattr(sampler, 'properties', {})
+        self.max_points = properties.get('max_anneal_schedule_points',
+                                         max_anneal_schedule_points)
+        self.time_range = tuple(properties.get('annealing_time_range', annealing_time_range))
+
+    def validate(self, entries):
+        """Check every schedule, and raise ValueError naming the first bad one."""
+        for i, entry in enumerate(entries):
+            try:
+                validate_anneal_schedule(entry['schedule'], self.max_points, self.time_range)
+            except ValueError as error:
+                raise ValueError('schedule {} {}: {}'.format(i, entry['schedule'], error))
+
+    def _submit(self, entry):
+        start = time.time()
+        response = self.sampler.sample(self.bqm, num_reads=self.num_reads,
+                                       anneal_schedule=entry['schedule'], **self.parameters)
+        record = response.record
+        return {
+            'energies': record.energy,
+            'num_occurrences': record.num_occurrences,
+            'qpu_access_time': response.info.get('timing', {}).get('qpu_access_time', 0.0),
+            'seconds': time.time() - start,
+        }
+
+    def run(self, entries):
+        """Sample under every schedule in entries (as made by grid()).
+
+        Plain schedules (lists of (time, s) points) are accepted too.
+        Returns one row per schedule, in order: the entry's keys plus
+        ground_probability, reads, qpu_access_time and seconds.
+        """
+        entries = [entry if isinstance(entry, dict) else {'schedule': tuple(entry)}
+                   for entry in entries]
+        self.validate(entries)
+
+        start = time.time()
+        if self.max_workers > 1:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                results = list(pool.map(self._submit, entries))
+        else:
+            results = [self._submit(entry) for entry in entries]
+        self.elapsed = time.time() - start
+
+        ground = self.ground_energy
+        if ground is None:
+            ground = min(result['energies'].min() for result in results)
+
+        rows = []
+        for entry, result in zip(entries, results):
+            reads = int(result['num_occurrences'].sum())
+            hits = result['num_occurrences'][np.isclose(result['energies'], ground)].sum()
+            row = dict(entry)
+            row.update(ground_probability=float(hits) / reads, reads=reads,
+                       qpu_access_time=result['qpu_access_time'], seconds=result['seconds'])
+            rows.append(row)
+        return rows
+
+
+def format_table(rows):
+    """A plain text table of sweep rows, one line per schedule."""
+    lines = ['{:>6} {:>8} {:>8} {:>7} {:>10}  {}'.format(
+        'pause', 'length', 'quench', 'P(gs)', 'QPU us', 'schedule')]
+    for row in rows:
+        quench = row.get('quench_time', '-')
+        lines.append('{:>6} {:>8} {:>8} {:>7.3f} {:>10.0f}  {}'.format(
+            '-' if row.get('pause_point') is None else row['pause_point'],
+            '-' if row.get('pause_length') is None else row['pause_length'],
+            'normal' if quench is None else quench,
+            row['ground_probability'], row['qpu_access_time'],
+            ' '.join('({:g}, {:g})'.format(t, s) for t, s in row['schedule'])))
+    return '\n'.join(lines)
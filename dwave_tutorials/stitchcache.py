@@ -0,0 +1,238 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+stitchcache.py
+--------------
+  dwavebinarycsp.stitch() with a penalty model cache on disk.
+
+stitch() builds a small binary quadratic model (a "penalty model") for
+every constraint, and finding each one means searching with a solver.
+The full-adder and 2x2 multiplier tutorials spend most of their startup
+time in "Begin stitching..." doing that search for the same handful of
+AND, OR and XOR gates, every single run.
+
+A penalty model only depends on the shape of its constraint, not on the
+variable names. So we key each model by:
+
+  (vartype, number of variables, truth table, min_classical_gap,
+   max_graph_size)
+
+and store it with the variables renamed to 0, 1, 2, ... (aux variables
+come after the constraint variables). On a cache hit we rename the
+variables back and we are done -- no solver call at all.
+
+Models are stored as small JSON files, one per key, named by a hash of
+the key. When there are more than max_entries files, the least recently
+used ones are removed.
+
+Usage:
+
+  from dwave_tutorials import stitchcache
+
+  bqm = stitchcache.stitch(csp, min_classical_gap=3.0)
+  print(stitchcache.default_cache.report())
+
+The default cache lives in ~/.cache/dwave-tutorials/penaltymodels. Set
+the DWAVE_TUTORIALS_CACHE environment variable to put it somewhere else.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+import dimod
+import dwavebinarycsp
+
+from dwave_tutorials.validate import truth_table
+
+
+def default_directory(name='penaltymodels'):
+    """Where the on-disk caches live, one subdirectory per kind."""
+    root = os.environ.get('DWAVE_TUTORIALS_CACHE')
+    if not root:
+        root = os.path.join(os.path.expanduser('~'), '.cache', 'dwave-tutorials')
+    return os.path.join(root, name)
+
+
+class JSONCache(object):
+    """A string-keyed store of JSON entries, in memory and on disk.
+
+    Each entry is one file, named by a hash of its key. directory=None
+    keeps the cache in memory only. When there are more than
+    max_entries files, the least recently used ones are removed.
+    """
+
+    def __init__(self, directory=None, max_entries=1024):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.memory = {}
+        self.hits = 0
+        self.misses = 0
+        self.time_saved = 0.0  # seconds of searching avoided by hits
+        self.time_spent = 0.0  # seconds spent searching on misses
+
+    def _path(self, key):
+        name = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, name + '.json')
+
+    def get(self, key):
+        """Return the stored entry for key, or None."""
+        entry = self.memory.get(key)
+        if entry is None and self.directory is not None:
+            path = self._path(key)
+            try:
+                with open(path) as f:
+                    entry = json.load(f)
+                os.utime(path, None)  # mark as recently used
+            except (IOError, OSError, ValueError):
+                entry = None
+            if entry is not None and entry.get('key') != key:
+                entry = None  # hash collision or a damaged file
+            if entry is not None:
+                self.memory[key] = entry
+        return entry
+
+    def put(self, key, entry):
+        entry['key'] = key
+        self.memory[key] = entry
+        if self.directory is None:
+            return
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+        # Write to a temporary file first so that a reader never sees a
+        # half-written entry.
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(entry, f)
+        os.replace(tmp, self._path(key))
+        self._evict()
+
+    def _evict(self):
+        names = [name for name in os.listdir(self.directory) if name.endswith('.json')]
+        if len(names) <= self.max_entries:
+            return
+        paths = [os.path.join(self.directory, name) for name in names]
+        paths.sort(key=os.path.getmtime)
+        for path in paths[:len(paths) - self.max_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def clear(self):
+        self.memory.clear()
+        if self.directory is not None and os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                if name.endswith('.json'):
+                    os.remove(os.path.join(self.directory, name))
+
+
+class PenaltyModelCache(JSONCache):
+    """Content-addressed penalty models."""
+
+    @staticmethod
+    def key(constraint, min_classical_gap, max_graph_size):
+        table = truth_table(constraint)
+        return '{}:{}:{}:{!r}:{}'.format(
+            constraint.vartype.name, len(constraint.variables),
+            ''.join('1' if bit else '0' for bit in table),
+            float(min_classical_gap), max_graph_size)
+
+    def report(self):
+        return ('penalty model cache: {} hits, {} misses, '
+                '{:.3f}s searching, {:.3f}s saved').format(
+                    self.hits, self.misses, self.time_spent, self.time_saved)
+
+
+default_cache = PenaltyModelCache(default_directory())
+
+
+def _normalize(bqm, variables):
+    # Rename the constraint's variables to 0..k-1 and the aux variables
+    # to k, k+1, ... so the model no longer depends on any names.
+    index = {v: i for i, v in enumerate(variables)}
+    for v in sorted(set(bqm.variables) - set(index), key=str):
+        index[v] = len(index)
+    return {
+        'vartype': bqm.vartype.name,
+        'linear': [[index[v], bias] for v, bias in bqm.linear.items()],
+        'quadratic': [[index[u], index[v], bias] for (u, v), bias in bqm.quadratic.items()],
+        'offset': bqm.offset,
+    }
+
+
+def _denormalize(entry, variables, aux):
+    names = list(variables)
+    size = 1 + max([i for i, _ in entry['linear']] + [len(names) - 1])
+    while len(names) < size:
+        names.append(next(aux))
+    return dimod.BinaryQuadraticModel(
+        {names[i]: bias for i, bias in entry['linear']},
+        {(names[i], names[j]): bias for i, j, bias in entry['quadratic']},
+        entry['offset'], entry['vartype'])
+
+
+def stitch(csp, min_classical_gap=2.0, max_graph_size=8, cache=None):
+    """Same as dwavebinarycsp.stitch(), with penalty models cached.
+
+    Each constraint is looked up in the cache. Misses are handed to
+    dwavebinarycsp.stitch() one constraint at a time, so the models are
+    exactly the ones stitch() would have built.
+    """
+    if cache is None:
+        cache = default_cache
+
+    taken = set(csp.variables)
+
+    def aux_factory():
+        i = 0
+        while True:
+            label = 'aux{}'.format(i)
+            i += 1
+            if label not in taken:
+                yield label
+
+    aux = aux_factory()
+    bqm = dimod.BinaryQuadraticModel.empty(csp.vartype)
+
+    for const in csp.constraints:
+        if len(const) == 0:
+            continue
+
+        key = cache.key(const, min_classical_gap, max_graph_size)
+        entry = cache.get(key)
+        if entry is not None:
+            cache.hits += 1
+            cache.time_saved += entry['seconds']
+        else:
+            cache.misses += 1
+            single = dwavebinarycsp.ConstraintSatisfactionProblem(csp.vartype)
+            single.add_constraint(const)
+            start = time.time()
+            model = dwavebinarycsp.stitch(single, min_classical_gap=min_classical_gap,
+                                          max_graph_size=max_graph_size)
+            seconds = time.time() - start
+            cache.time_spent += seconds
+            entry = _normalize(model, const.variables)
+            entry['seconds'] = seconds
+            cache.put(key, entry)
+
+        bqm.update(_denormalize(entry, const.variables, aux))
+
+    return bqm
@@ -0,0 +1,165 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+tempering.py
+------------
+  Parallel tempering (replica exchange), all replicas at once.
+
+Simulated annealing cools each read once, from hot to cold. If a read
+freezes into a wrong answer on the way down, it stays there. With a
+stitched model like four-queens at min_classical_gap=3.2, that happens
+a lot, and fun-four-queens.py warns that you may need A LOT of samples.
+
+Parallel tempering keeps several copies (replicas) of each read, each
+at its own fixed temperature on a ladder from hot to cold. Every sweep:
+
+  - each replica takes one Metropolis sweep at its own temperature
+  - neighbors on the ladder offer to trade states. A trade is accepted
+    with probability min(1, exp((beta_i - beta_j) * (E_i - E_j))), so
+    good states drift down to the cold end and stuck states get sent
+    up to be shaken loose.
+
+The returned sample for each read is the lowest energy state its
+coldest replica held at any point.
+
+All reads and all replicas live in one NumPy matrix of
+num_replicas * num_reads rows, and a sweep is one vectorized Metropolis
+step per color group: variables that share no couplings are updated
+together, since none of their flip deltas depend on each other. A trade
+is a couple of masked row swaps.
+
+Usage:
+
+  from dwave_tutorials.tempering import ParallelTemperingSampler
+
+  sampler = ParallelTemperingSampler()
+  response = sampler.sample(bqm, num_reads=100)
+
+The ladder is num_replicas betas spaced geometrically over beta_range
+(by default the same hot and cold ends as annealer.py), or pass betas
+to set it yourself.
+"""
+
+import numpy as np
+import dimod
+
+from dwave_tutorials.annealer import default_beta_range
+from dwave_tutorials.compiled import CompiledQUBO, dense_limit
+
+
+def color_classes(qubo):
+    """Split the variables into groups with no couplings inside a group.
+
+    A variable's flip delta only depends on its neighbors, so every
+    variable in a group can take its Metropolis step at the same time.
+    Greedy coloring, most connected variables first.
+    """
+    if len(qubo) == 0:
+        return []
+    color = np.full(len(qubo), -1)
+    for i in np.argsort([-qubo.degree(i) for i in range(len(qubo))], kind='stable'):
+        taken = set(color[qubo.neighbors(i)[0]].tolist())
+        color[i] = next(c for c in range(len(qubo) + 1) if c not in taken)
+    return [np.flatnonzero(color == c) for c in range(color.max() + 1)]
+
+
+def geometric_ladder(beta_range, num_replicas):
+    """num_replicas betas from hot to cold, evenly spaced in log(beta)."""
+    hot, cold = beta_range
+    if num_replicas == 1:
+        return np.array([float(cold)])
+    return np.geomspace(hot, cold, num_replicas)
+
+
+class ParallelTemperingSampler(dimod.Sampler):
+    """Replica-exchange Monte Carlo with a temperature ladder.
+
+    num_sweeps is the number of sweeps each replica takes; a trade
+    between ladder neighbors is offered after every sweep. Like
+    ScheduleAnnealingSampler, identical reads are merged unless
+    answer_mode='raw'. info has the ladder (betas) and the fraction of
+    offered trades accepted between each pair of neighbors.
+    """
+
+    properties = {}
+    parameters = {'num_reads': [], 'num_sweeps': [], 'num_replicas': [], 'betas': [],
+                  'beta_range': [], 'seed': [], 'answer_mode': []}
+
+    def sample(self, bqm, num_reads=1, num_sweeps=100, num_replicas=8, betas=None,
+               beta_range=None, seed=None, answer_mode='histogram'):
+        if betas is None:
+            betas = geometric_ladder(beta_range or default_beta_range(bqm), num_replicas)
+        betas = np.sort(np.asarray(betas, dtype=float))
+        if len(betas) == 0 or betas[0] <= 0:
+            raise ValueError('betas must be a non-empty list of positive numbers')
+        num_replicas = len(betas)
+
+        labels = list(bqm.variables)
+        n = len(labels)
+        qubo = CompiledQUBO.from_bqm(bqm, labels)
+        # Each group's biases and its columns of the coupling matrix.
+        couplings = qubo.dense() if n <= dense_limit else qubo.matrix
+        groups = [(group, qubo.linear[group], couplings[:, group])
+                  for group in color_classes(qubo)]
+        rng = np.random.RandomState(seed)
+
+        # Replica r of read k is row r * num_reads + k; the ladder runs
+        # hot (r = 0) to cold (r = num_replicas - 1).
+        X = rng.randint(0, 2, size=(num_replicas * num_reads, n)).astype(np.int8)
+        row_betas = np.repeat(betas, num_reads)
+        energies = qubo.energies(X)
+        cold = slice((num_replicas - 1) * num_reads, None)
+        best, best_energies = X[cold].copy(), energies[cold].copy()
+        accepted = np.zeros(max(num_replicas - 1, 0))
+
+        for sweep in range(num_sweeps):
+            threshold = np.log(rng.random_sample(X.shape)) / row_betas[:, None]
+            for group, h, J in groups:
+                # Metropolis for a whole color group at once: accept if
+                # -delta > log(u) / beta.
+                fields = h + X @ J
+                delta = (1 - 2 * X[:, group]) * fields
+                flip = -delta > threshold[:, group]
+                X[:, group] ^= flip.astype(np.int8)
+                energies += (delta * flip).sum(axis=1)
+
+            # Offer trades between replica pairs (0,1), (2,3), ... on
+            # even sweeps and (1,2), (3,4), ... on odd ones.
+            lower = np.arange(sweep % 2, num_replicas - 1, 2)
+            if len(lower):
+                E = energies.reshape(num_replicas, num_reads)
+                log_p = (betas[lower] - betas[lower + 1])[:, None] * (E[lower] - E[lower + 1])
+                trade = np.log(rng.random_sample(log_p.shape)) < log_p
+                accepted[lower] += trade.mean(axis=1)
+                r, k = np.nonzero(trade)
+                hot_rows, cold_rows = lower[r] * num_reads + k, (lower[r] + 1) * num_reads + k
+                # Fancy indexing copies, so these swap cleanly.
+                X[hot_rows], X[cold_rows] = X[cold_rows], X[hot_rows]
+                energies[hot_rows], energies[cold_rows] = energies[cold_rows], energies[hot_rows]
+
+            better = energies[cold] < best_energies
+            best[better] = X[cold][better]
+            best_energies[better] = energies[cold][better]
+
+        samples = best if bqm.vartype is dimod.BINARY else 2 * best - 1
+        response = dimod.SampleSet.from_samples_bqm((samples, labels), bqm)
+        if answer_mode == 'histogram':
+            response = response.aggregate()
+        offers = np.array([len(range(r % 2, num_sweeps, 2)) for r in range(num_replicas - 1)])
+        response.info.update(betas=betas.tolist(),
+                             acceptance=(accepted / np.maximum(offers, 1)).tolist())
+        return response
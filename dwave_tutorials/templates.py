@@ -0,0 +1,497 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+templates.py
+------------
+  Precomputed penalty models for logic gates, and a circuit builder
+  that uses them.
+
+dwavebinarycsp.stitch() searches for a penalty model for every gate in
+a circuit. For the common gates we already know good penalty models,
+so we can write them down once and reuse them by renaming variables:
+
+  AND(a, b) = z:      ab - 2az - 2bz + 3z
+  OR(a, b) = z:       ab + a + b + z - 2az - 2bz
+  NOT(a) = z:         1 - a - z + 2az
+  half adder a + b = s + 2c:            (a + b - s - 2c)^2
+  full adder a + b + cin = s + 2cout:   (a + b + cin - s - 2cout)^2
+  XOR(a, b) = z:      a half adder, with the carry as an aux variable
+
+Each is 0 when the gate is satisfied and at least 1 when it is not. The
+adders need no aux variables at all, because a + b + cin = s + 2cout
+already pins down s and cout.
+
+NAND, NOR and XNOR are AND, OR and XOR with z replaced by 1 - z, and
+the k-input ORs and ANDs (or_gates[k] and and_gates[k], k up to
+max_inputs) are chains of 2-input gates, with the partial results as
+aux variables. Template.fix() sets some ports to constants, which is
+how a constraint like "x1 | x2 | x3 | x4 must be true" or "NAND(x1, x2)
+must be true" becomes a template.
+
+A Circuit is a list of gates and the wires they connect. Circuit.bqm()
+turns each gate into index arrays and builds the whole model in one go
+with BinaryQuadraticModel.from_numpy_vectors(), so it scales to
+thousands of gates without calling stitch() once.
+
+stitch() does for a ConstraintSatisfactionProblem what Circuit does
+for a netlist. It recognizes each constraint by its truth table (the
+same one stitchcache.py keys on), so the opaque or4 and nand functions
+in fun-four-queens.py are matched to templates without ever calling
+the penalty model search. Anything it does not recognize goes to
+canonical.stitch().
+
+Usage:
+
+  from dwave_tutorials import templates
+
+  circuit = templates.Circuit()
+  circuit.add(templates.and_gate, ['a', 'b', 'ab'])
+  circuit.add(templates.full_adder, ['ab', 'c', 'cin', 's', 'cout'])
+  bqm = circuit.bqm()
+
+  bqm = templates.stitch(csp, min_classical_gap=3.2)
+"""
+
+import itertools
+
+import numpy as np
+import dimod
+import dwavebinarycsp
+
+from dwave_tutorials.validate import truth_table
+
+
+class Template(object):
+    """A penalty model for one gate, with its variables numbered.
+
+    ports are the gate's variables (inputs first, then outputs). Aux
+    variables are numbered after the ports. func maps a tuple of input
+    values to a tuple of output values, and is used to check the model
+    and to simulate circuits. aux_func does the same for the aux
+    variables' ground-state values.
+
+    A template made by fix() is a constraint rather than a gate: it has
+    no func, and configurations lists the port values that satisfy it.
+    """
+
+    def __init__(self, name, ports, num_inputs, qubo, func, aux=(), aux_func=None,
+                 configurations=None):
+        self.name = name
+        self.ports = tuple(ports)
+        self.num_inputs = num_inputs
+        self.aux = tuple(aux)
+        self.func = func
+        self.aux_func = aux_func
+        self.configurations = None if configurations is None else set(configurations)
+
+        index = {v: i for i, v in enumerate(self.ports + self.aux)}
+        self.num_variables = len(index)
+        self.linear = np.zeros(self.num_variables)
+        rows, cols, biases = [], [], []
+        self.offset = 0.0
+        for (u, v), bias in qubo.items():
+            if u == ():
+                self.offset += bias
+            elif u == v:
+                self.linear[index[u]] += bias
+            else:
+                rows.append(index[u])
+                cols.append(index[v])
+                biases.append(bias)
+        self.rows = np.array(rows, dtype=np.intp)
+        self.cols = np.array(cols, dtype=np.intp)
+        self.biases = np.array(biases, dtype=float)
+
+    def __repr__(self):
+        return 'Template({!r})'.format(self.name)
+
+    def qubo(self):
+        """The penalty model as a QUBO dict keyed by port and aux names."""
+        names = self.ports + self.aux
+        qubo = {(v, v): bias for v, bias in zip(names, self.linear) if bias}
+        for i, j, bias in zip(self.rows, self.cols, self.biases):
+            key = (names[i], names[j])
+            qubo[key] = qubo.get(key, 0.0) + bias
+        if self.offset:
+            qubo[(), ()] = self.offset
+        return qubo
+
+    def valid(self, config):
+        """True if the port values config satisfy the gate."""
+        config = tuple(int(value) for value in config)
+        if self.configurations is not None:
+            return config in self.configurations
+        inputs = config[:self.num_inputs]
+        return config[self.num_inputs:] == tuple(int(z) for z in self.func(*inputs))
+
+    def table(self):
+        """The truth table, packed like validate.truth_table().
+
+        Entry i is True when the port values whose bits are i (bit j is
+        ports[j]) satisfy the gate.
+        """
+        return np.array([self.valid(((i >> j) & 1 for j in range(len(self.ports))))
+                         for i in range(1 << len(self.ports))], dtype=bool)
+
+    def fix(self, values, name=None):
+        """This template with some ports set to constants.
+
+        values maps port names to 0 or 1. The result is a constraint on
+        the remaining ports, satisfied exactly when the gate is with
+        those ports fixed, and it keeps at least this template's gap.
+        """
+        unknown = set(values) - set(self.ports)
+        if unknown:
+            raise ValueError('{} has no ports {}'.format(self.name, sorted(unknown)))
+        qubo = {}
+        for (u, v), bias in self.qubo().items():
+            # Substitute the constants, term by term.
+            free = []
+            for w in ((u, v) if u != v else (u,)):
+                if w in values:
+                    bias *= values[w]
+                elif w != ():
+                    free.append(w)
+            if len(free) == 1:
+                free.append(free[0])
+            key = tuple(free) if free else ((), ())
+            qubo[key] = qubo.get(key, 0.0) + bias
+
+        ports = [v for v in self.ports if v not in values]
+        keep = [i for i, v in enumerate(self.ports) if v not in values]
+        configurations = []
+        for config in itertools.product((0, 1), repeat=len(self.ports)):
+            if all(config[self.ports.index(v)] == value for v, value in values.items()) \
+                    and self.valid(config):
+                configurations.append(tuple(config[i] for i in keep))
+        if name is None:
+            name = '{}[{}]'.format(self.name, ','.join(
+                '{}={}'.format(v, values[v]) for v in self.ports if v in values))
+        return Template(name, ports, len(ports), qubo, None, aux=self.aux,
+                        configurations=configurations)
+
+    def energies(self, samples):
+        """Energy of each row of samples (columns: ports, then aux)."""
+        samples = np.asarray(samples, dtype=float)
+        return (samples.dot(self.linear)
+                + (samples[:, self.rows] * samples[:, self.cols]).dot(self.biases)
+                + self.offset)
+
+    def verify(self):
+        """Check the model against func and return its classical gap.
+
+        Raises ValueError unless every valid configuration has ground
+        energy 0 (for some setting of the aux variables) and every
+        invalid one is strictly above it.
+        """
+        states = (np.arange(1 << self.num_variables)[:, None] >> np.arange(self.num_variables)) & 1
+        energies = self.energies(states)
+        # The lowest energy of each setting of the ports, indexed like
+        # table().
+        index = states[:, :len(self.ports)].dot(1 << np.arange(len(self.ports)))
+        ground = np.full(1 << len(self.ports), np.inf)
+        np.minimum.at(ground, index, energies)
+
+        table = self.table()
+        bad = np.flatnonzero(table & (np.abs(ground) > 1e-9))
+        if len(bad):
+            key = tuple(int(bad[0] >> j) & 1 for j in range(len(self.ports)))
+            raise ValueError('{}: valid {} has energy {}'.format(self.name, key, ground[bad[0]]))
+        gap = ground[~table].min() if (~table).any() else np.inf
+        if gap <= 1e-9:
+            raise ValueError('{}: no gap between valid and invalid'.format(self.name))
+        return gap
+
+
+and_gate = Template(
+    'and', ('a', 'b', 'z'), 2,
+    {('a', 'b'): 1, ('a', 'z'): -2, ('b', 'z'): -2, ('z', 'z'): 3},
+    lambda a, b: (a & b,))
+
+or_gate = Template(
+    'or', ('a', 'b', 'z'), 2,
+    {('a', 'b'): 1, ('a', 'a'): 1, ('b', 'b'): 1, ('z', 'z'): 1,
+     ('a', 'z'): -2, ('b', 'z'): -2},
+    lambda a, b: (a | b,))
+
+not_gate = Template(
+    'not', ('a', 'z'), 1,
+    {('a', 'a'): -1, ('z', 'z'): -1, ('a', 'z'): 2, ((), ()): 1},
+    lambda a: (1 - a,))
+
+# No inputs: z is always 0. Not in gates below, since it is not a gate
+# a constraint would be matched against.
+zero_gate = Template(
+    'zero', ('z',), 0,
+    {('z', 'z'): 1},
+    lambda: (0,))
+
+# AND with z replaced by 1 - z.
+nand_gate = Template(
+    'nand', ('a', 'b', 'z'), 2,
+    {('a', 'b'): 1, ('a', 'a'): -2, ('b', 'b'): -2, ('z', 'z'): -3,
+     ('a', 'z'): 2, ('b', 'z'): 2, ((), ()): 3},
+    lambda a, b: (1 - (a & b),))
+
+# OR with z replaced by 1 - z.
+nor_gate = Template(
+    'nor', ('a', 'b', 'z'), 2,
+    {('a', 'b'): 1, ('a', 'a'): -1, ('b', 'b'): -1, ('z', 'z'): -1,
+     ('a', 'z'): 2, ('b', 'z'): 2, ((), ()): 1},
+    lambda a, b: (1 - (a | b),))
+
+# (a + b - s - 2c)^2, expanded using x^2 = x for binary variables.
+half_adder = Template(
+    'halfadder', ('a', 'b', 's', 'c'), 2,
+    {('a', 'a'): 1, ('b', 'b'): 1, ('s', 's'): 1, ('c', 'c'): 4,
+     ('a', 'b'): 2, ('a', 's'): -2, ('a', 'c'): -4,
+     ('b', 's'): -2, ('b', 'c'): -4, ('s', 'c'): 4},
+    lambda a, b: (a ^ b, a & b))
+
+xor_gate = Template(
+    'xor', ('a', 'b', 'z'), 2,
+    {('a', 'a'): 1, ('b', 'b'): 1, ('z', 'z'): 1, ('c', 'c'): 4,
+     ('a', 'b'): 2, ('a', 'z'): -2, ('a', 'c'): -4,
+     ('b', 'z'): -2, ('b', 'c'): -4, ('z', 'c'): 4},
+    lambda a, b: (a ^ b,), aux=('c',), aux_func=lambda a, b: (a & b,))
+
+# XOR with z replaced by 1 - z.
+xnor_gate = Template(
+    'xnor', ('a', 'b', 'z'), 2,
+    {('a', 'a'): -1, ('b', 'b'): -1, ('z', 'z'): -1, ('c', 'c'): 8,
+     ('a', 'b'): 2, ('a', 'z'): 2, ('a', 'c'): -4,
+     ('b', 'z'): 2, ('b', 'c'): -4, ('z', 'c'): -4, ((), ()): 1},
+    lambda a, b: (1 - (a ^ b),), aux=('c',), aux_func=lambda a, b: (a & b,))
+
+# (a + b + cin - s - 2cout)^2
+full_adder = Template(
+    'fulladder', ('a', 'b', 'cin', 's', 'cout'), 3,
+    {('a', 'a'): 1, ('b', 'b'): 1, ('cin', 'cin'): 1, ('s', 's'): 1, ('cout', 'cout'): 4,
+     ('a', 'b'): 2, ('a', 'cin'): 2, ('b', 'cin'): 2,
+     ('a', 's'): -2, ('b', 's'): -2, ('cin', 's'): -2,
+     ('a', 'cout'): -4, ('b', 'cout'): -4, ('cin', 'cout'): -4,
+     ('s', 'cout'): 4},
+    lambda a, b, cin: ((a + b + cin) & 1, (a + b + cin) >> 1))
+
+# The widest k-input OR and AND. stitch() in dwavebinarycsp gives up
+# past 8 variables too.
+max_inputs = 8
+
+
+def chain(name, gate, k):
+    """A k-input gate made of k - 1 copies of the 2-input gate.
+
+    Ports are x1..xk and z. Aux variable yi holds the gate applied to
+    x1..x(i+1), and feeds the next copy.
+    """
+    ports = ['x{}'.format(i) for i in range(1, k + 1)] + ['z']
+    aux = ['y{}'.format(i) for i in range(1, k - 1)]
+    wires = [ports[0]] + aux + ['z']
+    qubo = {}
+    for i in range(k - 1):
+        names = {'a': wires[i], 'b': ports[i + 1], 'z': wires[i + 1], (): ()}
+        for (u, v), bias in gate.qubo().items():
+            key = (names[u], names[v])
+            qubo[key] = qubo.get(key, 0.0) + bias
+
+    def partials(*inputs):
+        values = [inputs[0]]
+        for value in inputs[1:]:
+            values.append(gate.func(values[-1], value)[0])
+        return values[1:]
+
+    return Template(name, ports, k, qubo, lambda *inputs: partials(*inputs)[-1:],
+                    aux=aux, aux_func=lambda *inputs: partials(*inputs)[:-1])
+
+
+# or_gates[k] and and_gates[k] take k inputs, for k = 2..max_inputs.
+or_gates = {2: or_gate}
+and_gates = {2: and_gate}
+for k in range(3, max_inputs + 1):
+    or_gates[k] = chain('or{}'.format(k), or_gate, k)
+    and_gates[k] = chain('and{}'.format(k), and_gate, k)
+del k
+
+gates = [not_gate, and_gate, or_gate, nand_gate, nor_gate, xor_gate, xnor_gate,
+         half_adder, full_adder] + \
+    [or_gates[k] for k in range(3, max_inputs + 1)] + \
+    [and_gates[k] for k in range(3, max_inputs + 1)]
+
+
+class Circuit(object):
+    """A netlist of gates, each a Template plus the wires it connects."""
+
+    def __init__(self):
+        self.gates = []
+
+    def add(self, template, wires):
+        wires = list(wires)
+        if len(wires) != len(template.ports):
+            raise ValueError('{} takes {} wires, got {}'.format(
+                template.name, len(template.ports), len(wires)))
+        self.gates.append((template, wires))
+
+    def wires(self):
+        """Every wire, in the order it first appears."""
+        seen = {}
+        for template, wires in self.gates:
+            for wire in wires:
+                seen.setdefault(wire, None)
+        return list(seen)
+
+    def labels(self, rename=None, taken=()):
+        """The labels of bqm()'s variables, in order: the wires (renamed
+        with rename, if given), then 'aux0', 'aux1', ..., skipping any
+        name that is a wire label or in taken."""
+        wires = self.wires()
+        labels = [rename.get(wire, wire) for wire in wires] if rename else wires
+        num_aux = sum(len(template.aux) for template, _ in self.gates)
+        taken = set(labels).union(taken)
+        aux = (label for label in ('aux{}'.format(i) for i in itertools.count())
+               if label not in taken)
+        return labels + list(itertools.islice(aux, num_aux))
+
+    def bqm(self, strength=1.0, rename=None, labeled=True, taken=()):
+        """Build the circuit's BinaryQuadraticModel.
+
+        strength scales every gate penalty (and so the classical gap).
+        rename optionally maps wire names to the labels you want in the
+        model. Aux variables are labeled 'aux0', 'aux1', ..., skipping
+        the wire labels and any name in taken. With labeled=False the
+        variables are numbered instead, variable i being
+        labels(rename, taken)[i].
+        """
+        wires = self.wires()
+        index = {wire: i for i, wire in enumerate(wires)}
+
+        # Number every variable of every gate, then gather the template
+        # arrays through those numbers.
+        variables, linear, rows, cols, biases = [], [], [], [], []
+        offset = 0.0
+        num_variables = len(wires)
+        for template, gate_wires in self.gates:
+            numbers = np.empty(template.num_variables, dtype=np.intp)
+            numbers[:len(gate_wires)] = [index[wire] for wire in gate_wires]
+            numbers[len(gate_wires):] = np.arange(num_variables,
+                                                  num_variables + len(template.aux))
+            num_variables += len(template.aux)
+
+            variables.append(numbers)
+            linear.append(template.linear)
+            rows.append(numbers[template.rows])
+            cols.append(numbers[template.cols])
+            biases.append(template.biases)
+            offset += template.offset
+
+        total = np.zeros(num_variables)
+        if variables:
+            np.add.at(total, np.concatenate(variables), np.concatenate(linear))
+            quadratic = (np.concatenate(rows), np.concatenate(cols),
+                         strength * np.concatenate(biases))
+        else:
+            quadratic = ([], [], [])
+
+        return dimod.BinaryQuadraticModel.from_numpy_vectors(
+            strength * total, quadratic, strength * offset, dimod.BINARY,
+            variable_order=self.labels(rename, taken) if labeled else None)
+
+    def simulate(self, inputs):
+        """Run the circuit forward.
+
+        inputs maps each primary input wire to a value or an array of
+        values. Gates are evaluated in the order they were added, so
+        every gate's inputs must be known by the time it is reached.
+        Returns a dict with a value (or array) for every wire and, named
+        as in bqm(), every aux variable: a ground state of the model.
+        """
+        values = dict(inputs)
+        aux = iter(self.labels()[len(self.wires()):])
+        for template, wires in self.gates:
+            args = [values[wire] for wire in wires[:template.num_inputs]]
+            for wire, value in zip(wires[template.num_inputs:], template.func(*args)):
+                values[wire] = value
+            if template.aux:
+                for value in template.aux_func(*args):
+                    values[next(aux)] = value
+        return values
+
+
+def forms():
+    """Every gate, and every gate with one output fixed to 0 or to 1.
+
+    Returns a dict from (number of ports, packed truth table) to the
+    first template with that table. Built once, on the first call.
+    """
+    global _forms
+    if _forms is None:
+        _forms = {}
+        for gate in gates:
+            candidates = [gate]
+            for port in gate.ports[gate.num_inputs:]:
+                candidates += [gate.fix({port: 1}), gate.fix({port: 0})]
+            for template in candidates:
+                key = (len(template.ports), template.table().tobytes())
+                _forms.setdefault(key, template)
+    return _forms
+
+
+_forms = None
+
+
+def match(constraint):
+    """The template for a dwavebinarycsp constraint, or None."""
+    return forms().get((len(constraint.variables), truth_table(constraint).tobytes()))
+
+
+def stitch(csp, min_classical_gap=2.0, max_graph_size=8):
+    """Same idea as dwavebinarycsp.stitch(), but from templates.
+
+    Every constraint whose truth table matches a template is applied by
+    renaming that template's ports; the rest go through
+    canonical.stitch(). Every template has a gap of at least 1, so
+    they are scaled by min_classical_gap. Aux variables are labeled
+    'aux0', 'aux1', ... as stitch() does, skipping the CSP's own
+    variable names.
+    """
+    from dwave_tutorials import canonical
+
+    circuit = Circuit()
+    rest = dwavebinarycsp.ConstraintSatisfactionProblem(csp.vartype)
+    for const in csp.constraints:
+        if len(const) == 0:
+            continue
+        template = match(const)
+        if template is None:
+            rest.add_constraint(const)
+        else:
+            circuit.add(template, const.variables)
+
+    bqm = circuit.bqm(strength=min_classical_gap, taken=csp.variables)
+    if rest.constraints:
+        # Number the fallback's aux variables after ours.
+        fallback = canonical.stitch(rest, min_classical_gap, max_graph_size)
+        taken = set(csp.variables) | set(bqm.variables)
+        aux = ('aux{}'.format(i) for i in itertools.count())
+        fallback.relabel_variables(
+            {v: next(name for name in aux if name not in taken)
+             for v in fallback.variables if v not in csp.variables})
+        if fallback.vartype is not dimod.BINARY:
+            fallback = fallback.change_vartype(dimod.BINARY)
+        bqm.update(fallback)
+    for v in csp.variables:
+        bqm.add_variable(v, 0.0)
+    return bqm.change_vartype(csp.vartype, inplace=True)
@@ -0,0 +1,157 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+validate.py
+-----------
+  Check every sample in a response against a CSP in one batched pass.
+
+The tutorials check solutions like this:
+
+  for datum in response.data():
+      sample, energy, num = datum
+      if (csp.check(sample)):
+          ...
+
+That is easy to read, but csp.check() walks every constraint for every
+sample, one Python dict at a time. Once num_reads gets into the tens of
+thousands, checking takes longer than sampling.
+
+Every dwavebinarycsp constraint already knows its list of valid
+configurations. We turn each constraint into a truth table (one entry
+per possible assignment of its variables), then look up all the rows of
+the response's sample matrix at once with NumPy. Constraints with the
+same truth table and the same number of variables are grouped together
+so they share a single lookup.
+
+Usage:
+
+  from dwave_tutorials import validate
+
+  checker = validate.CompiledCSP(csp)
+  mask, valid, invalid = checker.check(response)
+
+mask has one entry per row of response.record, in record order. Use
+response.data(sorted_by=None) to walk the rows in the same order, or
+mask[response.record.energy.argsort()] to line it up with
+response.data(), which lists the lowest energy first.
+"""
+
+import numpy as np
+import dimod
+
+# Rows are checked in chunks so that the (rows x constraints) index
+# arrays stay a reasonable size for million-read responses.
+chunk_size = 65536
+
+
+def truth_table(constraint):
+    """Return a boolean array with one entry per assignment.
+
+    Entry i is True when the assignment whose bits are i (bit j is the
+    value of constraint.variables[j]) satisfies the constraint.
+    """
+    table = np.zeros(1 << len(constraint.variables), dtype=bool)
+    spin = (constraint.vartype is dimod.SPIN)
+    for config in constraint.configurations:
+        index = 0
+        for j, value in enumerate(config):
+            if (value > 0 if spin else value):
+                index |= (1 << j)
+        table[index] = True
+    return table
+
+
+class CompiledCSP(object):
+    """A ConstraintSatisfactionProblem compiled into truth-table lookups.
+
+    Compile once, then call check() as many times as you like. The CSP
+    should not change after it is compiled.
+    """
+
+    def __init__(self, csp):
+        self.csp = csp
+        self.spin = (csp.vartype is dimod.SPIN)
+        self.variables = list(csp.variables)
+
+        # Group constraints that have the same truth table.
+        groups = {}
+        for constraint in csp.constraints:
+            table = truth_table(constraint)
+            key = (len(constraint.variables), table.tobytes())
+            if key not in groups:
+                groups[key] = (table, [])
+            groups[key][1].append(constraint.variables)
+        self.groups = list(groups.values())
+
+    def _columns(self, labels):
+        # Map each constraint variable onto its column in the sample
+        # matrix. The matrix may carry extra columns (aux variables from
+        # stitch()), which we simply ignore.
+        position = {v: i for i, v in enumerate(labels)}
+        try:
+            return [
+                (table, np.array([[position[v] for v in variables]
+                                  for variables in members], dtype=np.intp))
+                for table, members in self.groups
+            ]
+        except KeyError as error:
+            raise ValueError('variable {!r} is in the CSP but not in the '
+                             'samples'.format(error.args[0]))
+
+    def check_matrix(self, samples, labels):
+        """Return a boolean mask, one entry per row of samples.
+
+        samples is a 2D array (rows x variables), and labels gives the
+        variable label for each column.
+        """
+        samples = np.asarray(samples)
+        columns = self._columns(labels)
+        mask = np.ones(samples.shape[0], dtype=bool)
+
+        for start in range(0, samples.shape[0], chunk_size):
+            bits = samples[start:start + chunk_size]
+            bits = (bits > 0) if self.spin else (bits != 0)
+            ok = mask[start:start + chunk_size]
+            for table, cols in columns:
+                # index[row, constraint] = truth table entry for that row
+                index = np.zeros((bits.shape[0], cols.shape[0]), dtype=np.intp)
+                for j in range(cols.shape[1]):
+                    index |= bits[:, cols[:, j]].astype(np.intp) << j
+                ok &= table[index].all(axis=1)
+        return mask
+
+    def check(self, response):
+        """Check every row of a response (a dimod SampleSet).
+
+        Returns (mask, valid, invalid), where valid and invalid are
+        counted in occurrences, just like the tutorial tally loops.
+        """
+        record = response.record
+        mask = self.check_matrix(record.sample, list(response.variables))
+        num = record.num_occurrences
+        valid = int(num[mask].sum())
+        invalid = int(num[~mask].sum())
+        return mask, valid, invalid
+
+
+def check(csp, response):
+    """Compile csp and check response in one call.
+
+    Returns (mask, valid, invalid). If you check more than one response
+    against the same CSP, build a CompiledCSP once and reuse it.
+    """
+    return CompiledCSP(csp).check(response)
@@ -15,9 +15,15 @@ limitations under the License.
 """
 
 import time
-from dwave.system.samplers import DWaveSampler
-from neal import SimulatedAnnealingSampler
-from dwave.system.composites import EmbeddingComposite
+import numpy as np
+
+# The shared tutorial helpers live in the dwave_tutorials package at the
+# top of this repository.
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from dwave_tutorials import aggregate, cli
+from dwave_tutorials.randomness import RandomnessTests
 
 useQpu = False   # change this to use a live QPU
 trials = 5000   # How many trials in the coin flipping experiment
@@ -27,118 +33,145 @@ fun-coin.py
 -----------
   Tutorial for flipping a coin.
   This tutorial covers timing and probability distributions.
-  To use a live QPU, set useQpu to True.
+  To use a live QPU, set useQpu to True, or run with --sampler qpu.
+  Run with --help to see the other options. Pass --coins to skip the
+  question about how many coins to flip.
 
 Quantum computers are wonderful at generating random numbers.
 Let's flip some coins!
 """
 
-print('')
-print('Coin Flipperama!')
-print('================')
-print('     ??????     ')
-print('    ??    ??    ')
-print('   ??  ??  ??   ')
-print('   ??  ??  ??   ')
-print('    ??    ??    ')
-print('     ??????     ')
-print('Flip a bunch of coins and show the distribution.')
-print('')
-
-# At the top of this file, set useQpu to True to use a live QPU.
-if (useQpu):
-    sampler = DWaveSampler()
+
+def make_sampler(name):
+    # At the top of this file, set useQpu to True to use a live QPU.
     # We need an embedding composite sampler because not all qubits are
     # working. A trivial embedding lets us avoid dead qubits.
-    sampler = EmbeddingComposite(sampler)
-else:
-    sampler = SimulatedAnnealingSampler()
-
-# Initialize a binary quadratic model.
-# It will use 2000 qubits. All biases are 0 and all couplings are 0.
-bqm = {}       # binary quadratic model
-distrib = {}   # distribution
-
-msg = 'How many coins do you want to flip at the same time?'
-try:
-    coins = raw_input(msg)
-except:
+    from dwave.system.composites import EmbeddingComposite
+    return cli.make_sampler(name, composite=EmbeddingComposite)
+
+
+def build_qubo(max_coins):
+    # Initialize a binary quadratic model.
+    # It will use up to 2000 qubits. All biases are 0 and all couplings are 0.
+    bqm = {}       # binary quadratic model
+    for i in range(0, max_coins):
+        bqm[(i,i)] = 0  # indicate a qubit will be used
+    return bqm
+
+
+def flip(bqm, sampler, num_reads=trials, seed=None):
+    """Returns (response, seconds it took)."""
+    start = time.time()
+    response = sampler.sample_qubo(bqm, **cli.sample_params(sampler, seed, num_reads=num_reads))
+    end = time.time()
+    return response, (end - start)
+
+
+def main(argv=None):
+    parser = cli.parser('Tutorial for flipping a coin.', num_reads=trials, use_qpu=useQpu)
+    parser.add_argument('--coins', help='how many coins to flip at the same time')
+    args = parser.parse_args(argv)
+    say = cli.narrator(args.quiet)
+    num_trials = args.num_reads
+
+    say('')
+    say('Coin Flipperama!')
+    say('================')
+    say('     ??????     ')
+    say('    ??    ??    ')
+    say('   ??  ??  ??   ')
+    say('   ??  ??  ??   ')
+    say('    ??    ??    ')
+    say('     ??????     ')
+    say('Flip a bunch of coins and show the distribution.')
+    say('')
+
+    coins = args.coins
+    if (coins is None):
+        msg = 'How many coins do you want to flip at the same time?'
+        coins = cli.ask(msg, '50', args.batch)
+
     try:
-        coins = input(msg)
+        max_coins = int(coins)
     except:
-        print('I give up! Why can\'t I ask you questions?')
+        say('That is a weird number. I am going with 50.')
         max_coins = 50
 
-try:
-    max_coins = int(coins)
-except:
-    print('That is a weird number. I am going with 50.')
-    max_coins = 50
-
-if (max_coins > 2000):
-    print('Too many coins! I am only flipping 2000 at a time.')
-    max_coins = 2000
-
-if (max_coins < 1):
-    print('Too few coins! I am going to flip one coin at a time.')
-    max_coins = 1
-    
-for i in range(0, max_coins):
-    bqm[(i,i)] = 0  # indicate a qubit will be used
-    distrib[i] = 0  # initialize the distribution to all 0
-distrib[max_coins] = 0  # We need one extra slot for the distribution
-
-print('Okay, for each trial I am going to flip %d coins' % max_coins)
-print('and I will repeat this for %d trials.' % trials)
-print('Next, I will display a distribution of how many coins came up heads.')
-print('This is very exciting, don\'t you think?')
-print('')
-print('DON\'T BLINK!')
-print('')
-
-start = time.time()
-response = sampler.sample_qubo(bqm, num_reads=trials)
-end = time.time()
-total = (end - start)
-
-try:
-    qpu_access_time = response.info['timing']['qpu_access_time']
-except:
-    qpu_access_time = 0
-    print('QPU access time is not available. This makes me sad.')
-
-print('Whew! That was really tough. It took me '+'{:10.4f}'.format(total)+' seconds to flip '+'{:d}'.format(trials * max_coins)+' coins.')
-print('Of all that time, the QPU was used for '+'{:10.8f}'.format(qpu_access_time/1000000)+' seconds.')
-print('')
-print('Give me a moment to sort out these results...')
-
-# This is a very slow, brute force nested loop.
-for datum in response.data():  # for each series of flips
-    n = 0
-    for key in datum.sample:   # count how many heads or tails
-        if (datum.sample[key] == 1):
-            n += 1
-    distrib[n] += 1
-
-# Determine the maximum in our distribution array
-# so we can normalize the widths of the bars.
-max_count = 0
-for i in range(0, len(distrib)):
-    if (distrib[i] > max_count):
-        max_count = distrib[i]
-
-print('Ah, here we go. Here is your distribution for')
-print('the total number of heads per trial:')
-print('---------------------------------------------')
-print('')
-
-# Print out the distribution!
-width = 72  # the maximum width of a bar
-for i in range(0, len(distrib)):
-    print(i, 'x' * int( round( 60 * (distrib[i] / max_count) ) ) )
-
-print('')
-print('Wasn\'t that fun? Have nice day! :-)')
+    # A 2000Q has about 2000 working qubits. To flip far more coins than
+    # that on the simulated annealer, see dwave_tutorials/coins.py.
+    if (max_coins > 2000):
+        say('Too many coins! I am only flipping 2000 at a time.')
+        max_coins = 2000
+
+    if (max_coins < 1):
+        say('Too few coins! I am going to flip one coin at a time.')
+        max_coins = 1
+
+    bqm = build_qubo(max_coins)
+
+    say('Okay, for each trial I am going to flip %d coins' % max_coins)
+    say('and I will repeat this for %d trials.' % num_trials)
+    say('Next, I will display a distribution of how many coins came up heads.')
+    say('This is very exciting, don\'t you think?')
+    say('')
+    say('DON\'T BLINK!')
+    say('')
+
+    response, total = flip(bqm, make_sampler(args.sampler), num_trials, args.seed)
+
+    try:
+        qpu_access_time = response.info['timing']['qpu_access_time']
+    except:
+        qpu_access_time = 0
+        say('QPU access time is not available. This makes me sad.')
+
+    say('Whew! That was really tough. It took me '+'{:10.4f}'.format(total)+' seconds to flip '+'{:d}'.format(num_trials * max_coins)+' coins.')
+    say('Of all that time, the QPU was used for '+'{:10.8f}'.format(qpu_access_time/1000000)+' seconds.')
+    say('')
+    say('Give me a moment to sort out these results...')
+
+    # We used to do this with a very slow, brute force nested loop over
+    # every coin in every trial. count_ones() adds up the heads in each
+    # trial a big chunk of trials at a time. distrib[n] is how many trials
+    # came up with n heads. (There are max_coins + 1 slots, for 0 heads up
+    # to max_coins heads.)
+    distrib = aggregate.count_ones(response)
+
+    # Determine the maximum in our distribution array
+    # so we can normalize the widths of the bars.
+    max_count = 0
+    for i in range(0, len(distrib)):
+        if (distrib[i] > max_count):
+            max_count = distrib[i]
+
+    say('Ah, here we go. Here is your distribution for')
+    say('the total number of heads per trial:')
+    say('---------------------------------------------')
+    say('')
+
+    # Print out the distribution!
+    width = 72  # the maximum width of a bar
+    for i in range(0, len(distrib)):
+        print(i, 'x' * int( round( 60 * (distrib[i] / max_count) ) ) )
+
+    say('')
+
+    # A nice bell curve does not prove the coins are fair. Run the standard
+    # randomness tests over every coin of every trial. A p-value below 0.001
+    # means the coins are probably not fair.
+    say('And now, is it a fair coin?')
+    tests = RandomnessTests(len(response.variables))
+    record = response.record
+    tests.update(np.repeat(record.sample, record.num_occurrences, axis=0))
+    for name, statistic, p_value in tests.results():
+        print('  {:<14} p = {:.4f}'.format(name, p_value))
+
+    say('')
+    say('Wasn\'t that fun? Have nice day! :-)')
+
+
+if __name__ == '__main__':
+    main()
 
 """
 Here are some Sample timing metrics available from a sampler response.
@@ -14,14 +14,17 @@ See the License for the specific language governing permissions and
 limitations under the License.
 '''
 
-import time
-from dwave.system.samplers import DWaveSampler
-from neal import SimulatedAnnealingSampler
-from dwave.system.composites import EmbeddingComposite
 import dwavebinarycsp
 import dwavebinarycsp.factories.constraint.gates as gates
 import operator
 
+# The shared tutorial helpers live in the dwave_tutorials package at the
+# top of this repository.
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from dwave_tutorials import aggregate, cli, nqueens, templates, validate
+
 useQpu = False   # change this to use a live QPU
 samples = 1000   # Default number of samples
 
@@ -29,7 +32,9 @@ samples = 1000   # Default number of samples
 fun-four-queens.py
 ------------------
   Tutorial for four-queens puzzle.
-  To use a live QPU, set useQpu to True.
+  To use a live QPU, set useQpu to True, or run with --sampler qpu.
+  Run with --help to see the other options. --batch skips the
+  "Press enter" pauses, and --size tries a different board in step 2.
 
 The four-queens puzzle is the archetypal constraint satisfaction problem.
 Let's see if we can mix things up a bit.
@@ -40,32 +45,8 @@ Shen's web page on n-queens and SAT solvers:
 
 '''
 
-# At the top of this file, set useQpu to True to use a live QPU.
-if (useQpu):
-    sampler = DWaveSampler()
-    # We need an embedding composite sampler because not all qubits are
-    # working. A trivial embedding lets us avoid dead qubits.
-    sampler = EmbeddingComposite(sampler)
-else:
-    sampler = SimulatedAnnealingSampler()
-
-# Every time I try to type "print," my fingers type "printf."
-# So, I am going to use "p" instead!
-p = print
-
-# We will want to ask input now and then; Python 2 and Python 3 handle
-# differently.
-try:
-    input # We want to use the input() function
-except:
-    input = raw_input # Python 2 has a raw_input() function
-
-# The mysterial Q variable will be a lookup for drawing on the screen.
-Q = {}
-Q[0] = '*'
-Q[1] = 'Q'
-
-p('''
+# The things we say along the way.
+banner = '''
 
    ##  ##  ##  ##
     ############
@@ -87,11 +68,9 @@ p('''
 
 Hi there! We will attempt to solve the four-queens puzzle.
 Let's break it down into steps.
-''')
-
-input('Press enter to get started!\n>')
+'''
 
-p('''
+step_1 = '''
 Step 1
 ------
 Assume we have a row of four spaces, and exactly one queen can be
@@ -103,7 +82,41 @@ Our board looks like this:
 
 Our solutions will be four-bit strings, with a 1 showing where the
 queen is.
-''')
+'''
+
+step_2 = '''
+Step 2
+------
+So far, so good.
+
+If you used a live QPU and saw no or too few solutions, then you
+probably had an unlucky embedding. Your hardware is okay -- the issue
+is a flaw in the tool chain.
+
+Next we will expand the board to be a 4 by 4 grid. We will use the same
+kinds of constraints and see if we can place four queens.
+'''
+
+goodbye = '''
+Now that you have gone through a four-queens tutorial, how about if
+you expand it to make an eight-queens program? Or maybe even an n-queens
+program?
+(If you want to peek at one way to do it, dwave_tutorials/nqueens.py
+builds the problem for any size board without using stitch().)
+
+One word of caution:
+The hardest part of working with a live QPU is finding an optimal
+embedding. Until we get some awesome optimizers, the tool chain will
+only get you so far before you have to worry about doing a few
+optimizations by hand.
+
+That's it for now. Have a nice day!
+'''
+
+# The mysterial Q variable will be a lookup for drawing on the screen.
+Q = {}
+Q[0] = '*'
+Q[1] = 'Q'
 
 '''
 We will be using some logic. Here are the notations we will use:
@@ -170,92 +183,38 @@ solutions.
 Let's run our single-row solver and see how it works.
 '''
 
-csp = dwavebinarycsp.ConstraintSatisfactionProblem(dwavebinarycsp.BINARY)
-
-# At least one qubit must be set
-csp.add_constraint(or4, ['x1', 'x2', 'x3', 'x4'])
-
-# No more than one qubit can be set
-csp.add_constraint(nand, ['x1', 'x2'])
-csp.add_constraint(nand, ['x1', 'x3'])
-csp.add_constraint(nand, ['x1', 'x4'])
-csp.add_constraint(nand, ['x2', 'x3'])
-csp.add_constraint(nand, ['x2', 'x4'])
-csp.add_constraint(nand, ['x3', 'x4'])
-
-bqm = dwavebinarycsp.stitch(csp)
-response = sampler.sample(bqm, num_reads = samples)
-
-# aggregate the results
-answers = {}
-valid, invalid = 0, 0
-for datum in response.data():
-    sample, energy, num = datum
-    if (csp.check(sample)):
-        valid = valid + num
-        result = ''
-        for i in range(1,5):
-            result += str(sample['x'+str(i)])
-        try:
-            answers[result] += num
-        except:
-            answers[result] = num
-    else:
-        invalid = invalid + num
+def row_csp():
+    csp = dwavebinarycsp.ConstraintSatisfactionProblem(dwavebinarycsp.BINARY)
 
-for key in answers:
-    p(key, '('+str(answers[key])+' times)\n')
-p(valid, ' valid solutions, ', invalid, ' invalid solutions')
-
-p('''
-Step 2
-------
-So far, so good.
-
-If you used a live QPU and saw no or too few solutions, then you
-probably had an unlucky embedding. Your hardware is okay -- the issue
-is a flaw in the tool chain.
+    # At least one qubit must be set
+    csp.add_constraint(or4, ['x1', 'x2', 'x3', 'x4'])
 
-Next we will expand the board to be a 4 by 4 grid. We will use the same
-kinds of constraints and see if we can place four queens.
-''')
-input('Press enter to try the four-queens problem.\n>')
+    # No more than one qubit can be set
+    csp.add_constraint(nand, ['x1', 'x2'])
+    csp.add_constraint(nand, ['x1', 'x3'])
+    csp.add_constraint(nand, ['x1', 'x4'])
+    csp.add_constraint(nand, ['x2', 'x3'])
+    csp.add_constraint(nand, ['x2', 'x4'])
+    csp.add_constraint(nand, ['x3', 'x4'])
+    return csp
 
-csp = dwavebinarycsp.ConstraintSatisfactionProblem(dwavebinarycsp.BINARY)
 
-'''
-This time we are using a grid that looks like this:
+def solve(bqm, sampler, num_reads=samples, seed=None):
+    return sampler.sample(bqm, **cli.sample_params(sampler, seed, num_reads=num_reads))
 
-x11 x12 x13 x14
-x21 x22 x23 x24
-x31 x32 x33 x34
-x41 x42 x43 x44
 
-We will start off setting constraints by hand, but this will get tedious
-after a while.
-'''
+def count(csp, response, cells):
+    # aggregate the results
+    # The checker tests every sample against our constraints in one batched
+    # pass, instead of calling csp.check() one sample at a time. The
+    # aggregator walks the samples in chunks and only counts the distinct
+    # answers, so we only build strings for the answers we print. It walks
+    # the samples lowest energy first, like response.data(), so the answers
+    # come out in the same order as before.
+    checker = validate.CompiledCSP(csp)
+    return aggregate.aggregate(response, cells, check=checker.check_matrix,
+                               sorted_by='energy')
 
-# At least one qubit must be set in each row.
-csp.add_constraint(or4, ['x11', 'x12', 'x13', 'x14'])
-csp.add_constraint(or4, ['x21', 'x22', 'x23', 'x24'])
-csp.add_constraint(or4, ['x31', 'x32', 'x33', 'x34'])
-csp.add_constraint(or4, ['x41', 'x42', 'x43', 'x44'])
-
-# You should start noticing a pattern. We will start automating
-# the constraints.
-# No more than one qubit can be set in each row.
-# We process one row at a time.
-for row in (1, 2, 3, 4):
-    for col in (1, 2, 3):
-        for i in range(col+1, 5):
-            csp.add_constraint(nand, ['x'+str(row)+str(col), 'x'+str(row)+str(i)])
-
-# No more than one qubit can be set in each column.
-# We process one column at a time.
-for col in (1, 2, 3, 4):
-    for row in (1, 2, 3):
-        for i in range(row+1, 5):
-            csp.add_constraint(nand, ['x'+str(row)+str(col), 'x'+str(i)+str(col)])
 
 '''
 Since we are placing queens, and queens can move diagonally, we need
@@ -284,13 +243,6 @@ def diagonal_se_constraint_4x4(csp, row, col):
             if ( ((row + b) <= 4) and ((col + b) <= 4) ):
                 csp.add_constraint(nand, ['x'+str(row + a)+str(col + a), 'x'+str(row + b)+str(col + b)])
 
-# Set the constraints for the 5 southeast traveling diagonals
-diagonal_se_constraint_4x4(csp, 3, 1)
-diagonal_se_constraint_4x4(csp, 2, 1)
-diagonal_se_constraint_4x4(csp, 1, 1)
-diagonal_se_constraint_4x4(csp, 1, 2)
-diagonal_se_constraint_4x4(csp, 1, 3)
-
 # As the kids would say at the amusement park,
 # "Let's do it again! Again!"
 def diagonal_sw_constraint_4x4(csp, row, col):
@@ -299,14 +251,76 @@ def diagonal_sw_constraint_4x4(csp, row, col):
             if ( ((row + b) <= 4) and ((col - b) >= 1) ):
                 csp.add_constraint(nand, ['x'+str(row + a)+str(col - a), 'x'+str(row + b)+str(col - b)])
 
-# Set the constraints for the 5 southwest traveling diagonals
-diagonal_sw_constraint_4x4(csp, 1, 2)
-diagonal_sw_constraint_4x4(csp, 1, 3)
-diagonal_sw_constraint_4x4(csp, 1, 4)
-diagonal_sw_constraint_4x4(csp, 2, 4)
-diagonal_sw_constraint_4x4(csp, 3, 4)
 
-bqm = dwavebinarycsp.stitch(csp, min_classical_gap=3.2)
+'''
+This time we are using a grid that looks like this:
+
+x11 x12 x13 x14
+x21 x22 x23 x24
+x31 x32 x33 x34
+x41 x42 x43 x44
+
+We will start off setting constraints by hand, but this will get tedious
+after a while.
+'''
+
+def board_csp(size=4):
+    # Any other size comes from dwave_tutorials/nqueens.py, which builds
+    # the same constraints for an n by n board. (There is no template, and
+    # stitch() cannot find a penalty model, for an OR of more than 8
+    # squares, so 8 is the limit.)
+    if (size != 4):
+        return nqueens.csp(size)
+
+    csp = dwavebinarycsp.ConstraintSatisfactionProblem(dwavebinarycsp.BINARY)
+
+    # At least one qubit must be set in each row.
+    csp.add_constraint(or4, ['x11', 'x12', 'x13', 'x14'])
+    csp.add_constraint(or4, ['x21', 'x22', 'x23', 'x24'])
+    csp.add_constraint(or4, ['x31', 'x32', 'x33', 'x34'])
+    csp.add_constraint(or4, ['x41', 'x42', 'x43', 'x44'])
+
+    # You should start noticing a pattern. We will start automating
+    # the constraints.
+    # No more than one qubit can be set in each row.
+    # We process one row at a time.
+    for row in (1, 2, 3, 4):
+        for col in (1, 2, 3):
+            for i in range(col+1, 5):
+                csp.add_constraint(nand, ['x'+str(row)+str(col), 'x'+str(row)+str(i)])
+
+    # No more than one qubit can be set in each column.
+    # We process one column at a time.
+    for col in (1, 2, 3, 4):
+        for row in (1, 2, 3):
+            for i in range(row+1, 5):
+                csp.add_constraint(nand, ['x'+str(row)+str(col), 'x'+str(i)+str(col)])
+
+    # Set the constraints for the 5 southeast traveling diagonals
+    diagonal_se_constraint_4x4(csp, 3, 1)
+    diagonal_se_constraint_4x4(csp, 2, 1)
+    diagonal_se_constraint_4x4(csp, 1, 1)
+    diagonal_se_constraint_4x4(csp, 1, 2)
+    diagonal_se_constraint_4x4(csp, 1, 3)
+
+    # Set the constraints for the 5 southwest traveling diagonals
+    diagonal_sw_constraint_4x4(csp, 1, 2)
+    diagonal_sw_constraint_4x4(csp, 1, 3)
+    diagonal_sw_constraint_4x4(csp, 1, 4)
+    diagonal_sw_constraint_4x4(csp, 2, 4)
+    diagonal_sw_constraint_4x4(csp, 3, 4)
+    return csp
+
+
+def board_cells(size=4):
+    # 'x'+str(row)+str(col) only works up to 9 squares a side: 'x111'
+    # would be both row 1 column 11 and row 11 column 1. nqueens.label()
+    # puts an underscore in between, and nqueens.model() numbers the
+    # squares instead (see dwave_tutorials/interning.py).
+    if (size != 4):
+        return nqueens.labels(size)
+    return ['x'+str(row)+str(col) for row in range(1,5) for col in range(1,5)]
+
 '''
 Hey! What is a min_classical_gap?
     We are telling the stitch function that we want to optmize for
@@ -321,53 +335,93 @@ Why are we using it?
 The default for min_classical_gap is 2.0. If you go crazy and try some
 large number -- well, I do not know what will happen. Caveat utilitor.
 '''
-response = sampler.sample(bqm, num_reads = samples)
-
-# aggregate the results
-answers = {}
-valid, invalid = 0, 0
-for datum in response.data():
-    sample, energy, num = datum
-    if (csp.check(sample)):
-        valid = valid + num
-        # result = ''
-        result = '+-+-+-+-+\n'
-        for row in range(1,5):
-            for col in range(1,5):
-                # We use our cool Q variable to draw
-                result += '|'+Q[sample['x'+str(row)+str(col)]]
-            result += '|\n'
-            result += '+-+-+-+-+\n'
-        try:
-            answers[result] += num
-        except:
-            answers[result] = num
-    else:
-        invalid = invalid + num
 
-for key in answers:
-    p(key, '('+str(answers[key])+' times)\n')
-p(valid, ' valid solutions, ', invalid, ' invalid solutions')
+def board_bqm(csp):
+    return templates.stitch(csp, min_classical_gap=3.2)
 
 
-if (valid == 0):
-    p('Hmmm... Looks like we struck out. Try again and better luck next time.')
-elif ((valid / (valid + invalid)) < 0.1):
-    p('Not a huge number of valid solutions, but hey, it worked!')
-else:
-    p('Wow! Look at those solutions!')
+def draw(cells, size=4):
+    border = '+-' * size + '+\n'
+    result = border
+    for row in range(0,size):
+        for col in range(0,size):
+            # We use our cool Q variable to draw
+            result += '|'+Q[cells[row*size + col]]
+        result += '|\n'
+        result += border
+    return result
 
-p('''
-Now that you have gone through a four-queens tutorial, how about if
-you expand it to make an eight-queens program? Or maybe even an n-queens
-program?
 
-One word of caution:
-The hardest part of working with a live QPU is finding an optimal
-embedding. Until we get some awesome optimizers, the tool chain will
-only get you so far before you have to worry about doing a few
-optimizations by hand.
+def main(argv=None):
+    parser = cli.parser('Tutorial for the four-queens puzzle.', num_reads=samples,
+                        use_qpu=useQpu)
+    parser.add_argument('--size', type=int, default=4, choices=range(1, 9), metavar='N',
+                        help='board size for step 2, 1 to 8 (default 4)')
+    args = parser.parse_args(argv)
+
+    # Every time I try to type "print," my fingers type "printf."
+    # So, I am going to use "p" instead! With --quiet, p says nothing,
+    # and only the answers (which use print) come out.
+    p = cli.narrator(args.quiet)
+
+    p(banner)
+
+    cli.ask('Press enter to get started!\n>', '', args.batch)
+
+    p(step_1)
+
+    # At the top of this file, set useQpu to True to use a live QPU.
+    # We need an embedding composite sampler because not all qubits are
+    # working. A trivial embedding lets us avoid dead qubits.
+    # ParallelTemperingSampler from dwave_tutorials.tempering is a
+    # drop-in replacement for the simulated annealer (--sampler tempering):
+    # same sample(bqm, num_reads=...) call. See benchmarks-tempering.py
+    # for how the two compare. The simulators are not wrapped, so
+    # dwave.system is only imported for qpu and mockqpu.
+    def embedding_composite(child):
+        from dwave.system.composites import EmbeddingComposite
+        return EmbeddingComposite(child)
+    sampler = cli.make_sampler(args.sampler, composite=embedding_composite)
+
+    csp = row_csp()
+    # templates.stitch() recognizes our or4 and nand functions by their
+    # truth tables and uses ready-made penalty models for them, so there
+    # is no slow search for a penalty model at all.
+    bqm = templates.stitch(csp)
+    response = solve(bqm, sampler, args.num_reads, args.seed)
+    answers = count(csp, response, ['x1', 'x2', 'x3', 'x4'])
+    valid, invalid = answers.valid, answers.invalid
+
+    for row, num in answers.items():
+        result = ''
+        for bit in row:
+            result += str(bit)
+        print(result, '('+str(num)+' times)\n')
+    print(valid, ' valid solutions, ', invalid, ' invalid solutions')
+
+    p(step_2)
+    cli.ask('Press enter to try the four-queens problem.\n>', '', args.batch)
+
+    csp = board_csp(args.size)
+    bqm = board_bqm(csp)
+    response = solve(bqm, sampler, args.num_reads, args.seed)
+
+    answers = count(csp, response, board_cells(args.size))
+    valid, invalid = answers.valid, answers.invalid
+
+    for cells, num in answers.items():
+        print(draw(cells, args.size), '('+str(num)+' times)\n')
+    print(valid, ' valid solutions, ', invalid, ' invalid solutions')
+
+    if (valid == 0):
+        p('Hmmm... Looks like we struck out. Try again and better luck next time.')
+    elif ((valid / (valid + invalid)) < 0.1):
+        p('Not a huge number of valid solutions, but hey, it worked!')
+    else:
+        p('Wow! Look at those solutions!')
+
+    p(goodbye)
 
-That's it for now. Have a nice day!
-''')
 
+if __name__ == '__main__':
+    main()
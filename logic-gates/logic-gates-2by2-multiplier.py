@@ -14,21 +14,28 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-from dwave.system.samplers import DWaveSampler
-from neal import SimulatedAnnealingSampler
-from dwave.system.composites import EmbeddingComposite
 import dwavebinarycsp
 import dwavebinarycsp.factories.constraint.gates as gates
 import operator
 
+# The shared tutorial helpers live in the dwave_tutorials package at the
+# top of this repository.
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from dwave_tutorials import canonical, cli, presolve, stitchcache, validate
+
 useQpu = False  # change this to use a live QPU
+usePresolve = True  # change this to stitch and sample every variable
 
 """
 logic-gates-2by2-multiplier.py
 ------------------------------
   Tutorial for factoring with a 2 by 2 multiplier cicuit.
   This tutorial also contains a technique for factoring numbers.
-  To use a live QPU, set useQpu to True.
+  To use a live QPU, set useQpu to True, or run with --sampler qpu.
+  Run with --help to see the other options, such as --number to factor
+  something other than 9.
 
 This code returns solutions where:
 
@@ -93,6 +100,12 @@ Can I use this problem to factor larger numbers?
   strategy. It would be better to build an embedder that specializes in
   factoring problems.
 
+Can I factor lots of numbers without stitching every time?
+  Yes. The circuit does not change, only the fixed output does. See
+  dwave_tutorials/factoring.py, which stitches the circuit once, fixes
+  the output for each number with fix_variable(), and solves a whole
+  batch of numbers in a single call to the sampler.
+
 Why do I have to check the solutions?
   To put it bluntly, we are using a sledgehammer to put in a screw.
   Although we are only interested in binary variables, quantum annealing
@@ -139,32 +152,25 @@ References
 
 """
 
-print('')
-print('Logic gate: 2 by 2 multiplier')
-print('=============================')
-print('Given virtual qubits a0, a1, b0, b1, c0, c1, c2, c3, c4;')
-print('list possible solutions where:')
-print('  C = A * B, and C = 9 (c3=1, c2=0, c1=0, c0=1)')
-print('')
-
-# At the top of this file, set useQpu to True to use a live QPU.
-#
-# For this tutorial we need a triangular configution, but the physical
-# topology of the QPU does not have triangles. There is a technique
-# called "embedding" that allows us to map our virtual problem onto a
-# physical platform. The concept of embedding is described more
-# thoroughly in the embedding tutorials.
-if (useQpu):
-    sampler = DWaveSampler()  # live QPU
-    sampler_embedded = EmbeddingComposite(sampler)  # we will need to embed
+
+def make_sampler(name):
+    # At the top of this file, set useQpu to True to use a live QPU.
+    #
+    # For this tutorial we need a triangular configution, but the physical
+    # topology of the QPU does not have triangles. There is a technique
+    # called "embedding" that allows us to map our virtual problem onto a
+    # physical platform. The concept of embedding is described more
+    # thoroughly in the embedding tutorials.
+    #
+    # CachedEmbeddingComposite works like EmbeddingComposite, but it
+    # remembers the best embedding it has found for this problem, so we
+    # stop rolling the dice on every run. A simulated annealer does not
+    # need to embed, so only the QPU gets wrapped.
     # See these pages for information on embedding:
     # https://docs.dwavesys.com/docs/latest/c_gs_4.html
     # https://docs.dwavesys.com/docs/latest/c_handbook_5.html
-else:
-    sampler = SimulatedAnnealingSampler()  # simulated quantum annealer
-    sampler_embedded = sampler  # we do not need to embed for a simulation
-
-csp = dwavebinarycsp.ConstraintSatisfactionProblem(dwavebinarycsp.BINARY)
+    from dwave_tutorials.embedcache import CachedEmbeddingComposite
+    return cli.make_sampler(name, composite=CachedEmbeddingComposite)
 
 """
 Now we tie together logic gates and operators in the form of
@@ -202,19 +208,8 @@ See this image for a graphical view of this circuit:
 https://en.wikipedia.org/wiki/Binary_multiplier#/media/File:Binary_multi1.jpg
 """
 
-csp.add_constraint(gates.and_gate(['a0', 'b1', 'and1' ]))  # and(a0, b1) = and1
-csp.add_constraint(gates.and_gate(['a0', 'b0', 'c0'   ]))  # and(a0, b0) = c0
-csp.add_constraint(gates.and_gate(['a1', 'b0', 'and3' ]))  # and(a1, b0) = and3
-csp.add_constraint(gates.and_gate(['a1', 'b1', 'and4' ]))  # and(a1, b1) = and4
-
-csp.add_constraint(gates.xor_gate(['and1', 'and3', 'c1'   ]))  # xor(and1, and3) = c1
-csp.add_constraint(gates.and_gate(['and1', 'and3', 'and5' ]))  # and(and1, and3) = and5
-
-csp.add_constraint(gates.xor_gate(['and5', 'and4', 'c2' ]))  # xor(and5, and4) = c2
-csp.add_constraint(gates.and_gate(['and5', 'and4', 'c3' ]))  # and(and5, and4) = c3
-
 """
-Now that we have defined the gates for our 2 by 2 multiplier, we need
+Once we have defined the gates for our 2 by 2 multiplier, we need
 to fix the output because we want to factor a number. In this case, we
 want to factor the number 9, which is 1001 in binary. There are several
 ways to fix the number, and each way impacts performance and
@@ -236,15 +231,41 @@ For example:
   csp.fix_variable('c0', 1)
 I did not like this method because the c3,c2,c1,c0 labels drop out of
 the sample.
+
+Option 3 (what main() does unless usePresolve is False):
+Fix the outputs with constraints as in option 1, then let
+dwave_tutorials/presolve.py work out everything those fixed bits
+force. c0 = 1 and and(a0, b0) = c0 leave only a0 = b0 = 1, for example.
+The forced variables are left out of stitching and sampling, and are
+put back into every sample with their labels. For C = 9 every single
+variable is forced, so there is nothing left to sample.
 """
 
-# We are fixing the output to the number 9, or 1001 in binary
-# Here we use "truth" and "not_" operators to set the number we want
-# to factor.
-csp.add_constraint(operator.truth,['c3'])
-csp.add_constraint(operator.not_, ['c2'])
-csp.add_constraint(operator.not_, ['c1'])
-csp.add_constraint(operator.truth,['c0'])
+
+def build_csp(c=9):
+    csp = dwavebinarycsp.ConstraintSatisfactionProblem(dwavebinarycsp.BINARY)
+
+    csp.add_constraint(gates.and_gate(['a0', 'b1', 'and1' ]))  # and(a0, b1) = and1
+    csp.add_constraint(gates.and_gate(['a0', 'b0', 'c0'   ]))  # and(a0, b0) = c0
+    csp.add_constraint(gates.and_gate(['a1', 'b0', 'and3' ]))  # and(a1, b0) = and3
+    csp.add_constraint(gates.and_gate(['a1', 'b1', 'and4' ]))  # and(a1, b1) = and4
+
+    csp.add_constraint(gates.xor_gate(['and1', 'and3', 'c1'   ]))  # xor(and1, and3) = c1
+    csp.add_constraint(gates.and_gate(['and1', 'and3', 'and5' ]))  # and(and1, and3) = and5
+
+    csp.add_constraint(gates.xor_gate(['and5', 'and4', 'c2' ]))  # xor(and5, and4) = c2
+    csp.add_constraint(gates.and_gate(['and5', 'and4', 'c3' ]))  # and(and5, and4) = c3
+
+    # We are fixing the output to the number c (9, or 1001 in binary,
+    # unless you pass --number). Here we use "truth" and "not_"
+    # operators to set the number we want to factor, one bit at a time
+    # from c3 down to c0.
+    for bit in (3, 2, 1, 0):
+        if ((c >> bit) & 1):
+            csp.add_constraint(operator.truth, ['c'+str(bit)])
+        else:
+            csp.add_constraint(operator.not_, ['c'+str(bit)])
+    return csp
 
 """
 After we get solutions, the contents of A and B should have factors
@@ -258,14 +279,13 @@ that were used in the NOT and AND tutorials. The stitch() function
 basically generates all of our virtual qubits.
 """
 
-print('Begin stitching...')
-bqm = dwavebinarycsp.stitch(csp)
-print('Done stitching.')
 
-if (useQpu):
-    maxReads = 3000 # use many samples for a QPU
-else:
-    maxReads = 30   # use few samples for a simulated annealer
+def build_bqm(csp):
+    # canonical.stitch() is dwavebinarycsp.stitch() that searches for a
+    # penalty model once per gate shape (AND and OR count as one shape,
+    # since OR(a, b) = z is AND(!a, !b) = !z), and keeps the models in a
+    # cache on disk, so the second run skips the slow search.
+    return canonical.stitch(csp)
 
 """
 Here we ask our sampler for possible solutions. The argument
@@ -278,9 +298,9 @@ still a lot to be learned about how to make the best embeddings for
 different kinds of problems.
 """
 
-print('Begin sampling...')
-response = sampler_embedded.sample(bqm, num_reads = maxReads)
-print('Done sampling.')
+
+def solve(bqm, sampler, num_reads=30, seed=None):
+    return sampler.sample(bqm, **cli.sample_params(sampler, seed, num_reads=num_reads))
 
 """
 Now that we have a bunch of possible solutions, we need to sort
@@ -300,14 +320,80 @@ be fine.
 https://docs.ocean.dwavesys.com/projects/dimod/en/latest/reference/generated/dimod.Response.data.html
 """
 
-valid, invalid = 0, 0
-for datum in response.data():
-    sample, energy, num = datum
-    if (csp.check(sample)):
-        valid = valid + num
-        result = '(' + str(sample['a1']) + str(sample['a0']) + ' * ' + str(sample['b1']) + str(sample['b0']) + ') = '
-        result += str(sample['c3']) + str(sample['c2']) + str(sample['c1']) + str(sample['c0'])
-        print(result, datum)  # print all valid solutions we find
+
+def main(argv=None):
+    parser = cli.parser('Tutorial for factoring with a 2 by 2 multiplier circuit.',
+                        num_reads=None, use_qpu=useQpu)
+    parser.add_argument('--number', type=int, default=9, choices=range(16),
+                        metavar='C', help='the number to factor, 0 to 15 (default 9)')
+    parser.add_argument('--no-presolve', dest='presolve', action='store_false',
+                        default=usePresolve, help='stitch and sample every variable')
+    args = parser.parse_args(argv)
+    say = cli.narrator(args.quiet)
+    c = args.number
+
+    say('')
+    say('Logic gate: 2 by 2 multiplier')
+    say('=============================')
+    say('Given virtual qubits a0, a1, b0, b1, c0, c1, c2, c3, c4;')
+    say('list possible solutions where:')
+    say('  C = A * B, and C = %d (c3=%d, c2=%d, c1=%d, c0=%d)' % (
+        c, (c >> 3) & 1, (c >> 2) & 1, (c >> 1) & 1, c & 1))
+    say('')
+
+    csp = build_csp(c)
+
+    # Presolving may find that no A and B can give C (8 or 10 to 15, for
+    # example). Then we go ahead without it and see what the sampler
+    # finds.
+    presolved = None
+    if (args.presolve):
+        try:
+            presolved = presolve.presolve(csp)
+            say(presolved.report())
+        except ValueError as error:
+            say('presolve: ' + str(error))
+
+    maxReads = args.num_reads
+    if (maxReads is None):
+        if (args.sampler == 'qpu'):
+            maxReads = 3000 # use many samples for a QPU
+        else:
+            maxReads = 30   # use few samples for a simulated annealer
+
+    if (presolved is not None and not presolved.csp.variables):
+        # Presolve decided every variable, so there is nothing left to
+        # stitch or sample: the answer is the decided values.
+        say('Nothing left to sample.')
+        response = presolved.sampleset(maxReads)
     else:
-        invalid = invalid + num
-print(valid, ' valid solutions, ', invalid, ' invalid solutions')
+        say('Begin stitching...')
+        bqm = build_bqm(csp if presolved is None else presolved.csp)
+        say('Done stitching.')
+        say(canonical.default_compiler.report())
+        say(stitchcache.default_cache.report())
+
+        say('Begin sampling...')
+        response = solve(bqm, make_sampler(args.sampler), maxReads, args.seed)
+        if (presolved is not None):
+            response = presolved.expand(response)
+        say('Done sampling.')
+
+    # validate.check() checks every sample against our constraints in one
+    # batched pass, instead of calling csp.check() one sample at a time.
+    # The mask is in record order, so reorder it the way response.data()
+    # sorts the samples, lowest energy first.
+    mask, valid, invalid = validate.check(csp, response)
+    fields = ['sample', 'energy', 'num_occurrences']
+    order = response.record.energy.argsort()  # the same sort response.data() does
+    for datum, ok in zip(response.data(fields, sorted_by='energy'), mask[order]):
+        sample, energy, num = datum
+        if (ok):
+            result = '(' + str(sample['a1']) + str(sample['a0']) + ' * ' + str(sample['b1']) + str(sample['b0']) + ') = '
+            result += str(sample['c3']) + str(sample['c2']) + str(sample['c1']) + str(sample['c0'])
+            print(result, datum)  # print all valid solutions we find
+    print(valid, ' valid solutions, ', invalid, ' invalid solutions')
+
+
+if __name__ == '__main__':
+    main()
@@ -14,9 +14,12 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-from dwave.system.samplers import DWaveSampler
-from neal import SimulatedAnnealingSampler
-from dwave.system.composites import EmbeddingComposite
+# The shared tutorial helpers live in the dwave_tutorials package at the
+# top of this repository.
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from dwave_tutorials import cli
 
 useQpu = False  # change this to use a live QPU
 
@@ -25,7 +28,8 @@ logic-gates-and.py
 ------------------
   Tutorial for AND logic gate.
   This is a fairly low-level tutorial.
-  To use a live QPU, set useQpu to True.
+  To use a live QPU, set useQpu to True, or run with --sampler qpu.
+  Run with --help to see the other options.
 
 This code returns solutions where:
 
@@ -85,27 +89,6 @@ References
 
 """
 
-print('')
-print('Logic gate: AND')
-print('===============')
-print('Given virtual qubits x1, x2, and z, list possible solutions where:')
-print('  z = AND(x1, x2)')
-print('')
-
-# At the top of this file, set useQpu to True to use a live QPU.
-#
-# For this tutorial we need a triangular configution, but the physical
-# topology of the QPU does not have triangles. There is a technique
-# called "embedding" that allows us to map our virtual problem onto a
-# physical platform. The concept of embedding is described more
-# thoroughly in the embedding tutorials.
-if (useQpu):
-    sampler = DWaveSampler()  # live QPU
-    sampler_embedded = EmbeddingComposite(sampler)  # we will need to embed
-else:
-    sampler = SimulatedAnnealingSampler()  # simulated quantum annealer
-    sampler_embedded = sampler  # we do not need to embed for a simulation
-
 # The Q variable is called the quadratic. It is a list of qubit biases
 # and couplings. This configuration for AND is equivalent to the
 # equation:
@@ -116,23 +99,58 @@ else:
 # only when z is the boolean AND of x1 and x2, or when z = x1 * x2.
 Q = {('x1', 'x2'): 1, ('x1', 'z'): -2, ('x2', 'z'): -2, ('z', 'z'): 3}
 
-# A sampler returns one or more possible solutions. We are looking for
-# solutions that have the lowest possible energy value. The num_reads
-# argument means we want to try and solve this 40 times.
-# Keep in mind:
-#   - A QPU will do this in 40 atomic operations.
-#   - A simulated annealer will run a probabilistic simulation 40 times.
-# See: https://docs.ocean.dwavesys.com/projects/dimod/en/latest/reference/generated/dimod.Sampler.sample_qubo.html
-response = sampler_embedded.sample_qubo(Q, num_reads=40)
-
-# The data() function will return the results.
-# See: https://docs.ocean.dwavesys.com/projects/dimod/en/latest/reference/generated/dimod.Response.data.html
-# NOTE: As of 2018-09-30, the DWaveSampler() will aggregate the results,
-# but the SimulatedAnnealingSampler will not.
-print('List of possible solutions')
-print('--------------------------')
-for sample, energy, num_occurrences in response.data():
-    print(sample, "Energy: ", energy, "Occurrences: ", num_occurrences)
+
+def make_sampler(name):
+    # For this tutorial we need a triangular configution, but the physical
+    # topology of the QPU does not have triangles. There is a technique
+    # called "embedding" that allows us to map our virtual problem onto a
+    # physical platform. The concept of embedding is described more
+    # thoroughly in the embedding tutorials. A simulated annealer does
+    # not need to embed, so make_sampler() only wraps the QPU.
+    from dwave.system.composites import EmbeddingComposite
+    return cli.make_sampler(name, composite=EmbeddingComposite)
+
+
+def solve(sampler, num_reads=40, seed=None):
+    # A sampler returns one or more possible solutions. We are looking for
+    # solutions that have the lowest possible energy value. The num_reads
+    # argument means we want to try and solve this 40 times.
+    # Keep in mind:
+    #   - A QPU will do this in 40 atomic operations.
+    #   - A simulated annealer will run a probabilistic simulation 40 times.
+    # See: https://docs.ocean.dwavesys.com/projects/dimod/en/latest/reference/generated/dimod.Sampler.sample_qubo.html
+    return sampler.sample_qubo(Q, **cli.sample_params(sampler, seed, num_reads=num_reads))
+
+
+def main(argv=None):
+    args = cli.parser('Tutorial for AND logic gate.', num_reads=40,
+                      use_qpu=useQpu).parse_args(argv)
+    say = cli.narrator(args.quiet)
+
+    say('')
+    say('Logic gate: AND')
+    say('===============')
+    say('Given virtual qubits x1, x2, and z, list possible solutions where:')
+    say('  z = AND(x1, x2)')
+    say('')
+
+    # At the top of this file, set useQpu to True to use a live QPU.
+    response = solve(make_sampler(args.sampler), args.num_reads, args.seed)
+
+    # The data() function will return the results.
+    # See: https://docs.ocean.dwavesys.com/projects/dimod/en/latest/reference/generated/dimod.Response.data.html
+    # NOTE: As of 2018-09-30, the DWaveSampler() will aggregate the results,
+    # but the SimulatedAnnealingSampler will not. Through an embedding,
+    # each row also has a chain_break_fraction, so we ask for the three
+    # fields we print by name.
+    say('List of possible solutions')
+    say('--------------------------')
+    for sample, energy, num_occurrences in response.data(['sample', 'energy', 'num_occurrences']):
+        print(sample, "Energy: ", energy, "Occurrences: ", num_occurrences)
+
+
+if __name__ == '__main__':
+    main()
 
 """
 Sample output for EmbeddingComposite(DWaveSampler()):
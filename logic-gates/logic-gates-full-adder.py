@@ -14,20 +14,27 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-from dwave.system.samplers import DWaveSampler
-from neal import SimulatedAnnealingSampler
-from dwave.system.composites import EmbeddingComposite
 import dwavebinarycsp
 import dwavebinarycsp.factories.constraint.gates as gates
 import operator
 
+# The shared tutorial helpers live in the dwave_tutorials package at the
+# top of this repository.
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from dwave_tutorials import canonical, cli, presolve, stitchcache, validate
+
 useQpu = False  # change this to use a live QPU
+useRepair = False  # change this to walk every sample downhill before checking
+usePresolve = True  # change this to stitch and sample every variable
 
 """
 logic-gates-full-adder.py
 -------------------------
   Tutorial for a full-adder cicuit.
-  To use a live QPU, set useQpu to True.
+  To use a live QPU, set useQpu to True, or run with --sampler qpu.
+  Run with --help to see the other options.
 
 This code returns solutions where:
 
@@ -115,32 +122,30 @@ References
 
 """
 
-print('')
-print('Logic gate: full-adder')
-print('======================')
-print('Given virtual qubits a, b, cIn, s, cOut, list possible solutions where:')
-print('  s = a + b + cIn, with carry bit in cOut')
-print('  This is a full-adder cicuit.')
-print('')
-
-# At the top of this file, set useQpu to True to use a live QPU.
-#
-# For this tutorial we need a triangular configution, but the physical
-# topology of the QPU does not have triangles. There is a technique
-# called "embedding" that allows us to map our virtual problem onto a
-# physical platform. The concept of embedding is described more
-# thoroughly in the embedding tutorials.
-if (useQpu):
-    sampler = DWaveSampler()  # live QPU
-    sampler_embedded = EmbeddingComposite(sampler)  # we will need to embed
-else:
-    sampler = SimulatedAnnealingSampler()  # simulated quantum annealer
-    sampler_embedded = sampler  # we do not need to embed for a simulation
-
-# The ConstraintSatisfactionProblem class is wonderful for prototyping
-# code on the D-Wave.
-# https://docs.ocean.dwavesys.com/projects/binarycsp/en/latest/reference/csp.html
-csp = dwavebinarycsp.ConstraintSatisfactionProblem(dwavebinarycsp.BINARY)
+def make_sampler(name, repair=False):
+    # At the top of this file, set useQpu to True to use a live QPU.
+    #
+    # For this tutorial we need a triangular configution, but the physical
+    # topology of the QPU does not have triangles. There is a technique
+    # called "embedding" that allows us to map our virtual problem onto a
+    # physical platform. The concept of embedding is described more
+    # thoroughly in the embedding tutorials.
+    #
+    # CachedEmbeddingComposite works like EmbeddingComposite, but it
+    # remembers the best embedding it has found for this problem, so we
+    # stop rolling the dice on every run. A simulated annealer does not
+    # need to embed, so only the QPU gets wrapped.
+    from dwave_tutorials.embedcache import CachedEmbeddingComposite
+    sampler = cli.make_sampler(name, composite=CachedEmbeddingComposite)
+
+    # Many of the invalid samples are only a bit or two away from a valid
+    # answer. SteepestDescentComposite flips bits downhill on every sample
+    # before we check it, which repairs a lot of those near misses for about
+    # a millisecond per thousand samples. See benchmarks-postprocess.py.
+    if (repair):
+        from dwave_tutorials.postprocess import SteepestDescentComposite
+        sampler = SteepestDescentComposite(sampler)
+    return sampler
 
 """
 Now we tie together logic gates and operators in the form of
@@ -177,74 +182,158 @@ See this image for a graphical view of this circuit:
 https://upload.wikimedia.org/wikipedia/commons/5/57/Fulladder.gif
 """
 
-csp.add_constraint(gates.xor_gate(['a',    'b',   'xor1' ]))  # xor(a,b) = xor1
-
-csp.add_constraint(gates.xor_gate(['xor1', 'cIn', 's'    ]))  # xor(xor1,cIn) = s
-csp.add_constraint(gates.and_gate(['xor1', 'cIn', 'and1' ]))  # and(xor1,cIn) = and1
-csp.add_constraint(gates.and_gate(['a',    'b',   'and2' ]))  # and(a,b) = and2
-
-csp.add_constraint(gates.or_gate( ['and1', 'and2', 'cOut']))  # or(and1,and2) = cOut
-
-# This is an example of an assert I used to ensure my constraints above
-# faithfully reproduced the full-adder I want to implement.
-# https://docs.ocean.dwavesys.com/projects/binarycsp/en/latest/reference/generated/dwavebinarycsp.ConstraintSatisfactionProblem.check.html
-assert csp.check({'a': 1, 'and1': 0, 'and2': 1, 'b': 1, 'cIn': 0, 'cOut': 1, 's': 0, 'xor1': 0})
-
-# By adding constraints, we have declared what is and is not acceptible
-# in solutions. That list of constraints needs to be mapped to a
-# "binary quadratic model," which is that list of biases and couplings
-# that were used in the NOT and AND tutorials. The stitch() function
-# basically generates all of our virtual qubits.
-
-print('Begin stitching...')
-# I boost the min_classical_gap from 2.0 (default) to 3.0 to get a
-# little better accuracy. Be careful, though, numbers larger that 4.0
-# can take a long time to compute.
-# https://docs.ocean.dwavesys.com/projects/binarycsp/en/latest/reference/generated/dwavebinarycsp.stitch.html
-bqm = dwavebinarycsp.stitch(csp, min_classical_gap=3.0)
-print('Done stitching.')
-
-if (useQpu):
-    maxReads = 5000 # use many samples for a QPU
-else:
-    maxReads = 30   # use few samples for a simulated annealer
-
-# Here we ask our sampler for possible solutions. The argument
-# num_reads sets how many possible solutions we want back in one batch.
-# If we are using a live QPU, the embedded sampler from above will
-# automatically map our virtual qubits onto the physical qubits.
-# The mapping process is called embedding. Keep in mind that automatic
-# embedding is usually worse than embedding by hand because there is
-# still a lot to be learned about how to make the best embeddings for
-# different kinds of problems.
-    
-print('Begin sampling...')
-response = sampler_embedded.sample(bqm, num_reads = maxReads)
-print('Done sampling.')
-
-# Now that we have a bunch of possible solutions, we need to sort
-# through them and check to see which ones are valid. We can get
-# invalid solutions because the automatic embedding process is
-# far from perfect. Again, this not necessarily a problem with the
-# hardware, but more a reflection of how far we need to go to improve
-# the software tools.
-#
-# Until we have better embedding tools, we expect more valid solutions
-# from the simulated annealer. If we want all or many of the valid
-# solutions, then we need to look into how to make the best embedding
-# possible. However, sometimes we only need a single valid solution.
-# If we only need one valid solution, then a mediocre embedding might
-# be fine.
-
-valid, invalid = 0, 0
-for datum in response.data():
-    sample, energy, num = datum
-    if (csp.check(sample)):
-        print(datum)  # print all valid solutions we find
-        valid = valid+num
+
+def build_csp(fixed=None):
+    # The ConstraintSatisfactionProblem class is wonderful for prototyping
+    # code on the D-Wave.
+    # https://docs.ocean.dwavesys.com/projects/binarycsp/en/latest/reference/csp.html
+    csp = dwavebinarycsp.ConstraintSatisfactionProblem(dwavebinarycsp.BINARY)
+
+    csp.add_constraint(gates.xor_gate(['a',    'b',   'xor1' ]))  # xor(a,b) = xor1
+
+    csp.add_constraint(gates.xor_gate(['xor1', 'cIn', 's'    ]))  # xor(xor1,cIn) = s
+    csp.add_constraint(gates.and_gate(['xor1', 'cIn', 'and1' ]))  # and(xor1,cIn) = and1
+    csp.add_constraint(gates.and_gate(['a',    'b',   'and2' ]))  # and(a,b) = and2
+
+    csp.add_constraint(gates.or_gate( ['and1', 'and2', 'cOut']))  # or(and1,and2) = cOut
+
+    # This is an example of an assert I used to ensure my constraints above
+    # faithfully reproduced the full-adder I want to implement.
+    # https://docs.ocean.dwavesys.com/projects/binarycsp/en/latest/reference/generated/dwavebinarycsp.ConstraintSatisfactionProblem.check.html
+    assert csp.check({'a': 1, 'and1': 0, 'and2': 1, 'b': 1, 'cIn': 0, 'cOut': 1, 's': 0, 'xor1': 0})
+
+    # fixed optionally sets some of the variables, such as {'a': 1, 'b': 1},
+    # the same way the 2 by 2 multiplier tutorial sets its outputs.
+    for v, value in sorted((fixed or {}).items()):
+        csp.add_constraint(operator.truth if value else operator.not_, [v])
+    return csp
+
+
+def build_bqm(csp):
+    # By adding constraints, we have declared what is and is not acceptible
+    # in solutions. That list of constraints needs to be mapped to a
+    # "binary quadratic model," which is that list of biases and couplings
+    # that were used in the NOT and AND tutorials. The stitch() function
+    # basically generates all of our virtual qubits.
+    #
+    # I boost the min_classical_gap from 2.0 (default) to 3.0 to get a
+    # little better accuracy. Be careful, though, numbers larger that 4.0
+    # can take a long time to compute.
+    # https://docs.ocean.dwavesys.com/projects/binarycsp/en/latest/reference/generated/dwavebinarycsp.stitch.html
+    # canonical.stitch() is dwavebinarycsp.stitch() that searches for a
+    # penalty model once per gate shape (AND and OR count as one shape,
+    # since OR(a, b) = z is AND(!a, !b) = !z), and keeps the models in a
+    # cache on disk, so the second run skips the slow search.
+    return canonical.stitch(csp, min_classical_gap=3.0)
+
+
+def solve(bqm, sampler, num_reads=30, seed=None):
+    # Here we ask our sampler for possible solutions. The argument
+    # num_reads sets how many possible solutions we want back in one batch.
+    # If we are using a live QPU, the embedded sampler from above will
+    # automatically map our virtual qubits onto the physical qubits.
+    # The mapping process is called embedding. Keep in mind that automatic
+    # embedding is usually worse than embedding by hand because there is
+    # still a lot to be learned about how to make the best embeddings for
+    # different kinds of problems.
+    return sampler.sample(bqm, **cli.sample_params(sampler, seed, num_reads=num_reads))
+
+
+def main(argv=None):
+    parser = cli.parser('Tutorial for a full-adder circuit.', num_reads=None,
+                        use_qpu=useQpu)
+    parser.add_argument('--repair', action='store_true', default=useRepair,
+                        help='walk every sample downhill before checking it')
+    parser.add_argument('--fix', nargs='+', default=[], metavar='NAME=VALUE',
+                        help='set variables, for example --fix a=1 b=1')
+    parser.add_argument('--no-presolve', dest='presolve', action='store_false',
+                        default=usePresolve, help='stitch and sample every variable')
+    args = parser.parse_args(argv)
+    say = cli.narrator(args.quiet)
+    fixed = {}
+    for item in args.fix:
+        name, _, value = item.partition('=')
+        if value not in ('0', '1'):
+            parser.error('--fix takes NAME=0 or NAME=1, not ' + item)
+        fixed[name] = int(value)
+
+    say('')
+    say('Logic gate: full-adder')
+    say('======================')
+    say('Given virtual qubits a, b, cIn, s, cOut, list possible solutions where:')
+    say('  s = a + b + cIn, with carry bit in cOut')
+    say('  This is a full-adder cicuit.')
+    say('')
+
+    csp = build_csp(fixed)
+
+    # dwave_tutorials/presolve.py works out what the fixed variables force
+    # (a = b = 1 means and2 = cOut = 1, for example) and leaves those out
+    # of stitching and sampling. They go back into every sample afterwards.
+    # With nothing fixed, nothing is forced.
+    presolved = None
+    if (args.presolve):
+        try:
+            presolved = presolve.presolve(csp)
+            say(presolved.report())
+        except ValueError as error:
+            say('presolve: ' + str(error))
+
+    maxReads = args.num_reads
+    if (maxReads is None):
+        if (args.sampler == 'qpu'):
+            maxReads = 5000 # use many samples for a QPU
+        else:
+            maxReads = 30   # use few samples for a simulated annealer
+
+    if (presolved is not None and not presolved.csp.variables):
+        # Presolve decided every variable, so there is nothing left to
+        # stitch or sample: the answer is the decided values.
+        say('Nothing left to sample.')
+        response = presolved.sampleset(maxReads)
     else:
-        invalid = invalid+num
-print(valid, ' valid solutions, ', invalid, ' invalid solutions')
+        say('Begin stitching...')
+        bqm = build_bqm(csp if presolved is None else presolved.csp)
+        say('Done stitching.')
+        say(canonical.default_compiler.report())
+        say(stitchcache.default_cache.report())
+
+        say('Begin sampling...')
+        response = solve(bqm, make_sampler(args.sampler, args.repair), maxReads, args.seed)
+        if (presolved is not None):
+            response = presolved.expand(response)
+        say('Done sampling.')
+
+    # Now that we have a bunch of possible solutions, we need to sort
+    # through them and check to see which ones are valid. We can get
+    # invalid solutions because the automatic embedding process is
+    # far from perfect. Again, this not necessarily a problem with the
+    # hardware, but more a reflection of how far we need to go to improve
+    # the software tools.
+    #
+    # Until we have better embedding tools, we expect more valid solutions
+    # from the simulated annealer. If we want all or many of the valid
+    # solutions, then we need to look into how to make the best embedding
+    # possible. However, sometimes we only need a single valid solution.
+    # If we only need one valid solution, then a mediocre embedding might
+    # be fine.
+    #
+    # validate.check() checks every sample against our constraints in one
+    # batched pass, instead of calling csp.check() one sample at a time.
+    # The mask is in record order, so reorder it the way response.data()
+    # sorts the samples, lowest energy first.
+
+    mask, valid, invalid = validate.check(csp, response)
+    fields = ['sample', 'energy', 'num_occurrences']
+    order = response.record.energy.argsort()  # the same sort response.data() does
+    for datum, ok in zip(response.data(fields, sorted_by='energy'), mask[order]):
+        if (ok):
+            print(datum)  # print all valid solutions we find
+    print(valid, ' valid solutions, ', invalid, ' invalid solutions')
+
+
+if __name__ == '__main__':
+    main()
 
 
 """
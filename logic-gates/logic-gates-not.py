@@ -14,8 +14,12 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-from dwave.system.samplers import DWaveSampler
-from neal import SimulatedAnnealingSampler
+# The shared tutorial helpers live in the dwave_tutorials package at the
+# top of this repository.
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from dwave_tutorials import cli
 
 useQpu = False  # change this to use a live QPU
 
@@ -24,7 +28,8 @@ logic-gates-not.py
 ------------------
   Tutorial for NOT logic gate.
   This is a fairly low-level tutorial.
-  To use a live QPU, set useQpu to True.
+  To use a live QPU, set useQpu to True, or run with --sampler qpu.
+  Run with --help to see the other options.
 
 This code returns solutions where:
 
@@ -58,19 +63,6 @@ References
 
 """
 
-print('')
-print('Logic gate: NOT')
-print('===============')
-print('Given qubits q0 and q4, list possible solutions where:')
-print('  q0 = NOT(q4)')
-print('')
-
-# At the top of this file, set useQpu to True to use a live QPU.
-if (useQpu):
-    sampler = DWaveSampler()
-else:
-    sampler = SimulatedAnnealingSampler()
-
 # The Q variable is called the quadratic. It is a list of qubit biases
 # and couplings. This configuration for NOT is equivalent to the
 # equation:
@@ -81,23 +73,47 @@ else:
 # only when q0 and q4 are different.
 Q = {(0, 0): -1, (0, 4): 0, (4, 0): 2, (4, 4): -1}
 
-# A sampler returns one or more possible solutions. We are looking for
-# solutions that have the lowest possible energy value. The num_reads
-# argument means we want to try and solve this 20 times.
-# Keep in mind:
-#   - A QPU will do this in 20 atomic operations.
-#   - A simulated annealer will run a probabilistic simulation 20 times.
-# See: https://docs.ocean.dwavesys.com/projects/dimod/en/latest/reference/generated/dimod.Sampler.sample_qubo.html
-response = sampler.sample_qubo(Q, num_reads=20)
-
-# The data() function will return the results.
-# See: https://docs.ocean.dwavesys.com/projects/dimod/en/latest/reference/generated/dimod.Response.data.html
-# NOTE: As of 2018-09-30, the DWaveSampler() will aggregate the results,
-# but the SimulatedAnnealingSampler will not.
-print('List of possible solutions')
-print('--------------------------')
-for sample, energy, num_occurrences in response.data():
-    print(sample, "Energy: ", energy, "Occurrences: ", num_occurrences)
+
+def solve(sampler, num_reads=20, seed=None):
+    # A sampler returns one or more possible solutions. We are looking for
+    # solutions that have the lowest possible energy value. The num_reads
+    # argument means we want to try and solve this 20 times.
+    # Keep in mind:
+    #   - A QPU will do this in 20 atomic operations.
+    #   - A simulated annealer will run a probabilistic simulation 20 times.
+    # See: https://docs.ocean.dwavesys.com/projects/dimod/en/latest/reference/generated/dimod.Sampler.sample_qubo.html
+    return sampler.sample_qubo(Q, **cli.sample_params(sampler, seed, num_reads=num_reads))
+
+
+def main(argv=None):
+    args = cli.parser('Tutorial for NOT logic gate.', num_reads=20,
+                      use_qpu=useQpu).parse_args(argv)
+    say = cli.narrator(args.quiet)
+
+    say('')
+    say('Logic gate: NOT')
+    say('===============')
+    say('Given qubits q0 and q4, list possible solutions where:')
+    say('  q0 = NOT(q4)')
+    say('')
+
+    # At the top of this file, set useQpu to True to use a live QPU.
+    # The sampler is only built now, when we are about to use it.
+    sampler = cli.make_sampler(args.sampler)
+    response = solve(sampler, args.num_reads, args.seed)
+
+    # The data() function will return the results.
+    # See: https://docs.ocean.dwavesys.com/projects/dimod/en/latest/reference/generated/dimod.Response.data.html
+    # NOTE: As of 2018-09-30, the DWaveSampler() will aggregate the results,
+    # but the SimulatedAnnealingSampler will not.
+    say('List of possible solutions')
+    say('--------------------------')
+    for sample, energy, num_occurrences in response.data():
+        print(sample, "Energy: ", energy, "Occurrences: ", num_occurrences)
+
+
+if __name__ == '__main__':
+    main()
 
 """
 Sample output for DWaveSampler():
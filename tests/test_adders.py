@@ -0,0 +1,57 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+import itertools
+import unittest
+
+from dwave_tutorials import adders
+from dwave_tutorials.exact import EnumerationSolver
+
+
+class TestAdders(unittest.TestCase):
+
+    def test_ground_states_add(self):
+        # Every ground state has a + b (+ cin) = s, one for every input.
+        for kind, k, carry_in in itertools.product(sorted(adders.builders), (1, 2, 3),
+                                                   (False, True)):
+            bqm, variables = adders.adder_bqm(k, kind=kind, carry_in=carry_in)
+            response = EnumerationSolver().sample(bqm)
+            self.assertAlmostEqual(response.info['ground_energy'], 0.0)
+            self.assertTrue(adders.valid(response, variables).all(), (kind, k, carry_in))
+            inputs = set(zip(adders.decode(response, variables['a']),
+                             adders.decode(response, variables['b']),
+                             adders.decode(response, variables['cin'])))
+            num_inputs = 2 ** (2 * k + carry_in)
+            self.assertEqual(len(inputs), num_inputs)
+            self.assertEqual(response.info['degeneracy'], num_inputs)
+
+    def test_wrong_sums_cost_energy(self):
+        bqm, variables = adders.adder_bqm(2)
+        for a, b, s in itertools.product(range(4), range(4), range(8)):
+            fixed = bqm.copy()
+            for name, value in (('a', a), ('b', b), ('s', s)):
+                for i, v in enumerate(variables[name]):
+                    fixed.fix_variable(v, (value >> i) & 1)
+            ground = EnumerationSolver().sample(fixed).info['ground_energy']
+            if a + b == s:
+                self.assertAlmostEqual(ground, 0.0)
+            else:
+                self.assertGreater(ground, 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+
+import unittest
+
+import numpy as np
+import dimod
+
+from dwave_tutorials import aggregate
+
+
+class TestAggregate(unittest.TestCase):
+
+    def setUp(self):
+        samples = [[1, 0], [0, 1], [1, 0], [1, 1], [0, 1]]
+        self.response = dimod.SampleSet.from_samples(
+            (samples, ['a', 'b']), dimod.BINARY, energy=[2.0, 1.0, 2.0, 0.0, 1.0])
+
+    def test_counts(self):
+        counter = aggregate.aggregate(self.response)
+        counts = dict((tuple(row), num) for row, num in counter.most_common())
+        self.assertEqual(counts, {(1, 0): 2, (0, 1): 2, (1, 1): 1})
+        self.assertEqual(counter.valid, 5)
+
+    def test_items_in_record_order(self):
+        counter = aggregate.aggregate(self.response)
+        self.assertEqual([tuple(row) for row, _ in counter.items()], [(1, 0), (0, 1), (1, 1)])
+
+    def test_sorted_by_energy(self):
+        counter = aggregate.aggregate(self.response, sorted_by='energy')
+        self.assertEqual([tuple(row) for row, _ in counter.items()], [(1, 1), (0, 1), (1, 0)])
+
+    def test_check(self):
+        def check(samples, labels):
+            return np.asarray(samples).sum(axis=1) == 1
+
+        counter = aggregate.aggregate(self.response, check=check, chunk_size=2)
+        self.assertEqual((counter.valid, counter.invalid), (4, 1))
+        self.assertEqual(len(counter), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
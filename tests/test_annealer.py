@@ -0,0 +1,91 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+
+import unittest
+
+import numpy as np
+import dimod
+
+from dwave_tutorials import annealer
+from dwave_tutorials.annealer import ScheduleAnnealingSampler
+
+
+def random_bqm(n, vartype, seed):
+    rng = np.random.RandomState(seed)
+    linear = {v: rng.uniform(-1, 1) for v in range(n)}
+    quadratic = {(u, v): rng.uniform(-1, 1)
+                 for u in range(n) for v in range(u + 1, n) if rng.rand() < 0.5}
+    return dimod.BinaryQuadraticModel(linear, quadratic, 0.0, vartype)
+
+
+class TestScheduleAnnealingSampler(unittest.TestCase):
+
+    def test_ground_state(self):
+        sampler = ScheduleAnnealingSampler()
+        for vartype in (dimod.BINARY, dimod.SPIN):
+            for seed in range(3):
+                bqm = random_bqm(8, vartype, seed)
+                ground = dimod.ExactSolver().sample(bqm).first.energy
+                response = sampler.sample(bqm, num_reads=20, seed=seed)
+                self.assertAlmostEqual(response.first.energy, ground)
+                self.assertEqual(int(response.record.num_occurrences.sum()), 20)
+
+    def test_schedule_sets_sweeps(self):
+        bqm = random_bqm(4, dimod.BINARY, 3)
+        sampler = ScheduleAnnealingSampler()
+        schedule = [(0.0, 0.0), (2.0, 0.4), (4.0, 0.4), (5.0, 1.0)]
+        response = sampler.sample(bqm, anneal_schedule=schedule, seed=1)
+        self.assertEqual(response.info['num_sweeps'], 5 * annealer.sweeps_per_us)
+        response = sampler.sample(bqm, annealing_time=1.0, seed=1)
+        self.assertEqual(response.info['num_sweeps'], annealer.sweeps_per_us)
+
+    def test_reverse_anneal(self):
+        bqm = random_bqm(6, dimod.SPIN, 4)
+        ground = dimod.ExactSolver().sample(bqm).first
+        response = ScheduleAnnealingSampler().sample(
+            bqm, anneal_schedule=[(0.0, 1.0), (2.0, 0.9), (4.0, 1.0)],
+            initial_state=ground.sample, num_reads=10, seed=1)
+        self.assertAlmostEqual(response.first.energy, ground.energy)
+
+    def test_beta_schedule(self):
+        betas = annealer.beta_schedule([(0.0, 0.0), (1.0, 1.0)], (0.1, 10.0), sweeps_per_us=10)
+        self.assertEqual(len(betas), 10)
+        self.assertTrue((np.diff(betas) > 0).all())
+        self.assertTrue(0.1 < betas[0] < betas[-1] < 10.0)
+
+    def test_bad_schedules(self):
+        bqm = random_bqm(3, dimod.BINARY, 5)
+        sampler = ScheduleAnnealingSampler()
+        for schedule in ([(0.0, 0.0)],                            # one point
+                         [(1.0, 0.0), (2.0, 1.0)],                # not from time 0
+                         [(0.0, 0.0), (1.0, 0.5)],                # does not end at s=1
+                         [(0.0, 0.0), (1.0, 0.5), (1.0, 1.0)],    # time does not increase
+                         [(0.0, 0.0), (1.0, 1.5), (2.0, 1.0)],    # s above 1
+                         [(0.0, 0.0), (1.0, 0.6), (2.0, 0.4), (3.0, 1.0)],  # forward goes down
+                         [(0.0, 0.5), (1.0, 1.0)]):               # starts between 0 and 1
+            with self.assertRaises(ValueError, msg=str(schedule)):
+                sampler.sample(bqm, anneal_schedule=schedule)
+        with self.assertRaises(ValueError):
+            sampler.sample(bqm, anneal_schedule=[(0.0, 0.0), (1.0, 1.0)], annealing_time=1.0)
+        with self.assertRaises(ValueError):
+            # A reverse anneal needs somewhere to start from.
+            sampler.sample(bqm, anneal_schedule=[(0.0, 1.0), (1.0, 0.5), (2.0, 1.0)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+import unittest
+
+import numpy as np
+import dimod
+
+from dwave_tutorials import bqmpresolve, multiplier, nqueens
+from dwave_tutorials.exact import EnumerationSolver
+
+
+def random_bqm(rng, n, vartype):
+    bqm = dimod.BinaryQuadraticModel.empty(vartype)
+    for v in range(n):
+        bqm.add_variable(v, float(rng.integers(-3, 4)))
+    for u in range(n):
+        for v in range(u + 1, n):
+            if rng.random() < 0.35:
+                bqm.add_interaction(u, v, float(rng.integers(-4, 5)))
+    bqm.offset = 1.5
+    return bqm
+
+
+class TestReduce(unittest.TestCase):
+
+    def check(self, bqm, **kwargs):
+        # Every state of the smaller model expands to a state of the
+        # original with the same energy, and the ground energy is kept.
+        reduction = bqmpresolve.reduce(bqm, seed=0, **kwargs)
+        ground = dimod.ExactSolver().sample(bqm).first.energy
+        if reduction.bqm.num_variables:
+            response = dimod.ExactSolver().sample(reduction.bqm)
+            self.assertAlmostEqual(response.first.energy, ground)
+        else:
+            self.assertAlmostEqual(reduction.bqm.offset, ground)
+            response = dimod.SampleSet.from_samples_bqm(
+                (np.zeros((1, 0), dtype=np.int8), []), reduction.bqm)
+        expanded = reduction.expand(response)
+        self.assertEqual(set(expanded.variables), set(bqm.variables))
+        energies = bqm.energies((expanded.record.sample, expanded.variables))
+        self.assertTrue(np.allclose(energies, response.record.energy))
+        self.assertTrue(np.allclose(expanded.record.energy, response.record.energy))
+        return reduction
+
+    def test_random_models(self):
+        rng = np.random.default_rng(0)
+        for trial in range(100):
+            vartype = dimod.SPIN if trial % 2 else dimod.BINARY
+            self.check(random_bqm(rng, int(rng.integers(1, 10)), vartype))
+
+    def test_each_rule_alone(self):
+        rng = np.random.default_rng(1)
+        for kwargs in ({'probe': False}, {'use_roof_duality': False},
+                       {'max_degree': -1}, {'max_degree': 0}):
+            for trial in range(20):
+                self.check(random_bqm(rng, 8, dimod.BINARY), **kwargs)
+
+    def test_template_multiplier_is_solved(self):
+        bqm = multiplier.multiplier_bqm(2, 2, c=9)
+        reduction = self.check(bqm)
+        self.assertEqual(reduction.bqm.num_variables, 0)
+        sample = dict(zip(reduction.labels, reduction.lift(np.zeros((1, 0)))[0]))
+        self.assertEqual(sample['a0'] + 2 * sample['a1'], 3)
+        self.assertEqual(sample['b0'] + 2 * sample['b1'], 3)
+
+    def test_four_queens(self):
+        bqm = nqueens.bqm(4)
+        reduction = bqmpresolve.reduce(bqm, seed=0)
+        response = reduction.expand(EnumerationSolver().sample(reduction.bqm))
+        self.assertAlmostEqual(response.first.energy, 0.0)
+        ok = nqueens.check_matrix(response.record.sample[
+            :, [list(response.variables).index(v) for v in nqueens.labels(4)]], 4)
+        self.assertTrue(ok.all())
+
+    def test_report(self):
+        reduction = bqmpresolve.reduce(dimod.BinaryQuadraticModel.from_qubo(
+            {(0, 0): -1, (0, 4): 2, (4, 4): -1}))
+        self.assertIn('0 of 2 variables left', reduction.report())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+import itertools
+import operator
+import unittest
+
+import numpy as np
+import dimod
+import dwavebinarycsp
+
+from dwave_tutorials import canonical, stitchcache
+from dwave_tutorials.validate import truth_table
+
+
+def transform(table, order, flips):
+    # The table over variables reordered by order and negated by flips:
+    # entry i of the result is entry j of table, where bit order[k] of j
+    # is bit k of i, XORed with bit order[k] of flips.
+    k = len(table).bit_length() - 1
+    result = np.zeros_like(table)
+    for i in range(len(table)):
+        j = 0
+        for position in range(k):
+            j |= ((i >> position) & 1) << order[position]
+        result[i] = table[j ^ flips]
+    return result
+
+
+class TestCanonicalForm(unittest.TestCase):
+
+    def test_invariant_under_permutation_and_negation(self):
+        rng = np.random.default_rng(0)
+        for k in (1, 2, 3, 4):
+            for trial in range(10):
+                table = rng.random(1 << k) < 0.5
+                code = canonical.canonical_form(table)[0]
+                for order in itertools.permutations(range(k)):
+                    flips = int(rng.integers(1 << k))
+                    self.assertEqual(canonical.canonical_form(transform(table, order, flips))[0],
+                                     code, (k, table, order, flips))
+
+    def test_form_reproduces_table(self):
+        # Applying order and flips to the original gives the canonical table.
+        rng = np.random.default_rng(1)
+        for k in (1, 2, 3, 4):
+            for trial in range(10):
+                table = rng.random(1 << k) < 0.5
+                code, order, flips = canonical.canonical_form(table)
+                canonical_table = canonical.unpack(code, k)
+                for i in range(1 << k):
+                    j = 0
+                    for position in range(k):
+                        j |= ((i >> position) & 1) << order[position]
+                    self.assertEqual(canonical_table[i], table[j ^ flips])
+
+    def test_and_or_share_a_form(self):
+        compiler = canonical.ConstraintCompiler()
+        forms = {compiler.canonical_form(compiler.table(func, 3))[0]
+                 for func in (lambda a, b, z: (a and b) == z, lambda a, b, z: (a or b) == z)}
+        self.assertEqual(len(forms), 1)
+        self.assertEqual(compiler.canonical_form(compiler.table(operator.truth, 1))[0],
+                         compiler.canonical_form(compiler.table(operator.not_, 1))[0])
+
+    def test_penalty_models_keep_the_gap(self):
+        # Each constraint's model, rebuilt from its canonical form, is at
+        # its ground energy on exactly the constraint's configurations,
+        # and at least gap above it everywhere else.
+        compiler = canonical.ConstraintCompiler(stitchcache.PenaltyModelCache(None))
+        csp = dwavebinarycsp.ConstraintSatisfactionProblem(dwavebinarycsp.BINARY)
+        csp.add_constraint(lambda a, b, z: (a or b) == z, ['x', 'y', 'w'])
+        csp.add_constraint(lambda a, b, z: (not (a and b)) == z, ['y', 'x', 'v'])
+        csp.add_constraint(operator.truth, ['u'])
+        for gap in (2.0, 3.0):
+            for const in csp.constraints:
+                model = compiler.penalty_model(const, gap)
+                table = truth_table(const)
+                variables = list(const.variables)
+                for index in range(len(table)):
+                    fixed = model.copy()
+                    for j, v in enumerate(variables):
+                        fixed.fix_variable(v, (index >> j) & 1)
+                    ground = dimod.ExactSolver().sample(fixed).first.energy \
+                        if fixed.num_variables else fixed.offset
+                    if table[index]:
+                        self.assertAlmostEqual(ground, model_ground(model))
+                    else:
+                        self.assertGreaterEqual(ground - model_ground(model), gap - 1e-6)
+        # OR and NAND are one shape, and "u must be 1" needs no search:
+        # one search per gap.
+        self.assertEqual(compiler.searches, 2)
+
+    def test_single_variable_counts(self):
+        # "x must be 0" is built directly the first time, so it is
+        # neither a search nor a reuse; the second time is a reuse.
+        compiler = canonical.ConstraintCompiler(stitchcache.PenaltyModelCache(None))
+        const = compiler.constraint(operator.not_, ['x'])
+        compiler.penalty_model(const)
+        self.assertEqual((compiler.searches, compiler.hits), (0, 0))
+        compiler.penalty_model(compiler.constraint(operator.truth, ['y']))
+        self.assertEqual((compiler.searches, compiler.hits), (0, 1))
+
+
+def model_ground(model):
+    return dimod.ExactSolver().sample(model).first.energy
+
+
+if __name__ == '__main__':
+    unittest.main()
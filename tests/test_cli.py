@@ -0,0 +1,48 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+
+import contextlib
+import io
+import unittest
+
+from dwave_tutorials import cli
+
+
+class TestCli(unittest.TestCase):
+
+    def test_parser(self):
+        args = cli.parser('test', num_reads=10).parse_args([])
+        self.assertEqual((args.sampler, args.num_reads, args.batch, args.quiet),
+                         ('neal', 10, False, False))
+        args = cli.parser('test', num_reads=10, use_qpu=True).parse_args(
+            ['--batch', '--quiet'])
+        self.assertEqual((args.sampler, args.batch, args.quiet), ('qpu', True, True))
+
+    def test_narrator(self):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            cli.narrator()('hello', 1)
+            cli.narrator(quiet=True)('goodbye', 2)
+        self.assertEqual(out.getvalue(), 'hello 1\n')
+
+    def test_ask_batch(self):
+        self.assertEqual(cli.ask('prompt', 'default', batch=True), 'default')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+
+import unittest
+
+import numpy as np
+import dimod
+from neal import SimulatedAnnealingSampler
+
+from dwave_tutorials import aggregate, coins, mockqpu
+from dwave_tutorials.coins import CoinFlipper
+from dwave_tutorials.mockqpu import MockQPUSampler
+
+
+class TestCoinFlipper(unittest.TestCase):
+
+    def test_empty_bqm(self):
+        bqm = coins.empty_bqm(['a', 'b', 'c'])
+        self.assertEqual(list(bqm.variables), ['a', 'b', 'c'])
+        self.assertEqual((bqm.num_interactions, bqm.offset), (0, 0.0))
+        self.assertTrue(all(bias == 0 for bias in bqm.linear.values()))
+
+    def test_batches(self):
+        flipper = CoinFlipper(SimulatedAnnealingSampler(), 13, batch_size=7,
+                              num_sweeps=1, seed=1)
+        batches = list(flipper.batches(20))
+        self.assertEqual([len(samples) for samples in batches], [7, 7, 6])
+        self.assertTrue(all(samples.shape[1] == 13 for samples in batches))
+        self.assertEqual(flipper.flipped, 20 * 13)
+
+    def test_histogram(self):
+        trials = 1000
+        flipper = CoinFlipper(SimulatedAnnealingSampler(), 13, batch_size=300,
+                              num_sweeps=1, seed=2)
+        distrib = flipper.histogram(trials)
+        self.assertEqual(len(distrib), 14)
+        self.assertEqual(int(distrib.sum()), trials)
+        mean = (distrib * np.arange(14)).sum() / float(trials)
+        self.assertTrue(5.5 < mean < 7.5)
+
+    def test_packed_rows(self):
+        # The tutorial counts heads with aggregate, which packs each row
+        # of 13 coins into 2 bytes. Unpacking gives the rows back.
+        flipper = CoinFlipper(SimulatedAnnealingSampler(), 13, num_sweeps=1, seed=3)
+        samples = next(flipper.batches(200))
+        counter = aggregate.SolutionCounter(range(13))
+        counter.add(samples)
+        rows = {}
+        for row in samples:
+            rows[tuple(row)] = rows.get(tuple(row), 0) + 1
+        self.assertEqual({tuple(row.tolist()): num for row, num in counter.items()}, rows)
+        response = dimod.SampleSet.from_samples(samples, dimod.BINARY, 0)
+        self.assertEqual(aggregate.count_ones(response).tolist(),
+                         np.bincount(samples.sum(axis=1), minlength=14).tolist())
+
+    def test_structured_sampler(self):
+        sampler = MockQPUSampler(shape=(2, 2, 4))
+        flipper = CoinFlipper(sampler, 20, seed=4)
+        self.assertEqual(list(flipper.bqm.variables), sampler.nodelist[:20])
+        self.assertEqual(flipper.batch_size, mockqpu.num_reads_range[1])
+        self.assertEqual(int(flipper.histogram(50).sum()), 50)
+        self.assertAlmostEqual(flipper.qpu_access_time,
+                               mockqpu.timing(50, mockqpu.default_annealing_time)
+                               ['qpu_access_time'])
+        with self.assertRaises(ValueError):
+            CoinFlipper(sampler, len(sampler.nodelist) + 1)
+
+    def test_no_coins(self):
+        with self.assertRaises(ValueError):
+            CoinFlipper(SimulatedAnnealingSampler(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+
+import unittest
+
+import numpy as np
+import dimod
+
+from dwave_tutorials import compiled
+from dwave_tutorials.compiled import CompiledQUBO
+
+
+def random_bqm(n, vartype, seed, density=0.3):
+    rng = np.random.RandomState(seed)
+    linear = {v: rng.uniform(-1, 1) for v in range(n)}
+    quadratic = {(u, v): rng.uniform(-1, 1)
+                 for u in range(n) for v in range(u + 1, n) if rng.rand() < density}
+    return dimod.BinaryQuadraticModel(linear, quadratic, rng.uniform(-1, 1), vartype)
+
+
+class TestCompiledQUBO(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = np.random.RandomState(0)
+
+    def models(self):
+        for seed in range(4):
+            for vartype in (dimod.BINARY, dimod.SPIN):
+                bqm = random_bqm(10 + seed, vartype, seed)
+                yield bqm, CompiledQUBO.from_bqm(bqm)
+
+    def energies(self, bqm, qubo, X):
+        # bqm's own energies of the 0/1 rows of X, in qubo's order.
+        samples = X if bqm.vartype is dimod.BINARY else 2 * X.astype(int) - 1
+        return bqm.energies((samples, qubo.labels))
+
+    def test_energies(self):
+        for bqm, qubo in self.models():
+            X = self.rng.randint(2, size=(50, len(qubo))).astype(np.int8)
+            self.assertTrue(np.allclose(qubo.energies(X), self.energies(bqm, qubo, X)))
+
+    def test_energies_sparse(self):
+        limit = compiled.dense_limit
+        compiled.dense_limit = 0
+        try:
+            self.test_energies()
+            self.test_flip()
+        finally:
+            compiled.dense_limit = limit
+
+    def test_deltas(self):
+        for bqm, qubo in self.models():
+            X = self.rng.randint(2, size=(20, len(qubo))).astype(np.int8)
+            base = self.energies(bqm, qubo, X)
+            deltas = qubo.flip_deltas(X)
+            for i in range(len(qubo)):
+                flipped = X.copy()
+                flipped[:, i] ^= 1
+                expected = self.energies(bqm, qubo, flipped) - base
+                self.assertTrue(np.allclose(deltas[:, i], expected))
+                self.assertTrue(np.allclose(qubo.column_delta(X, i), expected))
+                self.assertAlmostEqual(qubo.delta(X[0], i), expected[0])
+
+    def test_flip(self):
+        for bqm, qubo in self.models():
+            X = self.rng.randint(2, size=(30, len(qubo))).astype(np.int8)
+            fields = qubo.fields(X)
+            for step in range(20):
+                rows = self.rng.choice(len(X), size=self.rng.randint(0, len(X)),
+                                       replace=False)
+                variables = self.rng.randint(len(qubo), size=len(rows))
+                before = qubo.energies(X)
+                deltas = qubo.flip_deltas(X, fields)[rows, variables]
+                qubo.flip(X, fields, rows, variables)
+                self.assertTrue(np.allclose(fields, qubo.fields(X)))
+                after = self.energies(bqm, qubo, X)
+                self.assertTrue(np.allclose(after[rows], before[rows] + deltas))
+
+    def test_isolated_variable(self):
+        bqm = dimod.BinaryQuadraticModel({'a': 1.0, 'b': -1.0}, {}, 0.0, dimod.BINARY)
+        qubo = CompiledQUBO.from_bqm(bqm)
+        X = np.zeros((2, 2), dtype=np.int8)
+        fields = qubo.fields(X)
+        qubo.flip(X, fields, [0, 1], [0, 1])
+        self.assertEqual(X.tolist(), [[1, 0], [0, 1]])
+        self.assertTrue(np.allclose(fields, qubo.fields(X)))
+
+    def test_from_qubo(self):
+        qubo = CompiledQUBO.from_qubo({(0, 0): -1, (4, 4): -1, (0, 4): 2})
+        X = np.array([[0, 0], [0, 1], [1, 0], [1, 1]], dtype=np.int8)
+        self.assertEqual(qubo.energies(X).tolist(), [0.0, -1.0, -1.0, 0.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+
+import shutil
+import tempfile
+import unittest
+
+import networkx as nx
+import dimod
+
+from dwave_tutorials import embedcache
+from dwave_tutorials.mockqpu import MockQPUSampler
+
+
+def triangle(a, b, c):
+    return dimod.BinaryQuadraticModel({a: -1.0, b: 0.5, c: 0.5},
+                                      {(a, b): 1.0, (b, c): -1.0, (a, c): 1.0}, 0.0,
+                                      dimod.SPIN)
+
+
+class TestFind(unittest.TestCase):
+
+    def test_isolated_variables(self):
+        graph = nx.Graph([(0, 1)])
+        graph.add_nodes_from([2, 3])
+        target = [(0, 1), (1, 2), (2, 3)]
+        embedding = embedcache._find(graph, target, [0, 1, 2, 3], 1, {})
+        self.assertEqual(set(embedding), {0, 1, 2, 3})
+        qubits = [q for chain in embedding.values() for q in chain]
+        self.assertEqual(len(qubits), len(set(qubits)))
+
+    def test_too_few_qubits(self):
+        graph = nx.Graph([(0, 1)])
+        graph.add_nodes_from([2, 3])
+        with self.assertRaises(ValueError):
+            embedcache._find(graph, [(0, 1), (1, 2)], [0, 1, 2], 1, {})
+
+
+class TestCachedEmbeddingComposite(unittest.TestCase):
+
+    def setUp(self):
+        self.child = MockQPUSampler(shape=(2, 2, 4))
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def composite(self, directory=None):
+        cache = embedcache.EmbeddingCache(directory)
+        return embedcache.CachedEmbeddingComposite(self.child, cache=cache, seed=1)
+
+    def assertEmbeds(self, embedding, bqm):
+        target = nx.Graph(self.child.edgelist)
+        self.assertEqual(set(embedding), set(bqm.variables))
+        qubits = [q for chain in embedding.values() for q in chain]
+        self.assertEqual(len(qubits), len(set(qubits)))
+        for chain in embedding.values():
+            self.assertTrue(nx.is_connected(target.subgraph(chain)))
+        for u, v in bqm.quadratic:
+            self.assertTrue(any(target.has_edge(q, r)
+                                for q in embedding[u] for r in embedding[v]))
+
+    def test_cache_hit(self):
+        sampler = self.composite()
+        first = sampler.find_embedding(triangle('a', 'b', 'c'))
+        second = sampler.find_embedding(triangle('a', 'b', 'c'))
+        self.assertEqual((sampler.cache.hits, sampler.cache.misses), (1, 1))
+        # The triangle is symmetric, so the chains may be handed out in
+        # another order, but they are the same chains.
+        self.assertEmbeds(second, triangle('a', 'b', 'c'))
+        self.assertEqual(sorted(first.values()), sorted(second.values()))
+
+    def test_relabeled(self):
+        sampler = self.composite()
+        sampler.find_embedding(triangle('a', 'b', 'c'))
+        bqm = triangle('x', 'y', 'z')
+        embedding = sampler.find_embedding(bqm)
+        self.assertEqual(sampler.cache.hits, 1)
+        self.assertEmbeds(embedding, bqm)
+
+    def test_store_and_reload(self):
+        bqm = triangle('a', 'b', 'c')
+        embedding = self.composite(self.directory).find_embedding(bqm)
+        reloaded = self.composite(self.directory)
+        self.assertEqual(sorted(reloaded.find_embedding(bqm).values()),
+                         sorted(embedding.values()))
+        self.assertEqual((reloaded.cache.hits, reloaded.cache.misses), (1, 0))
+
+    def test_sample(self):
+        bqm = triangle('a', 'b', 'c')
+        response = self.composite().sample(bqm, num_reads=10, seed=1)
+        ground = dimod.ExactSolver().sample(bqm).first.energy
+        self.assertAlmostEqual(response.first.energy, ground)
+        self.assertEqual(set(response.variables), set(bqm.variables))
+
+    def test_empty(self):
+        sampler = self.composite()
+        self.assertEqual(sampler.find_embedding(dimod.BinaryQuadraticModel.empty(dimod.BINARY)),
+                         {})
+        response = sampler.sample(dimod.BinaryQuadraticModel.empty(dimod.BINARY), num_reads=5)
+        self.assertEqual(len(response.variables), 0)
+
+    def test_no_interactions(self):
+        bqm = dimod.BinaryQuadraticModel({'a': 1.0, 'b': -1.0}, {}, 0.0, dimod.BINARY)
+        response = self.composite().sample(bqm, num_reads=5, seed=1)
+        self.assertEqual(response.first.sample, {'a': 0, 'b': 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+import unittest
+
+import numpy as np
+import dimod
+
+from dwave_tutorials.exact import EnumerationSolver
+
+
+def random_bqm(rng, n, vartype, density=0.5):
+    bqm = dimod.BinaryQuadraticModel.empty(vartype)
+    for v in range(n):
+        bqm.add_variable(v, float(rng.integers(-3, 4)))
+    for u in range(n):
+        for v in range(u + 1, n):
+            if rng.random() < density:
+                bqm.add_interaction(u, v, float(rng.integers(-3, 4)))
+    bqm.offset = float(rng.integers(-2, 3))
+    return bqm
+
+
+class TestEnumerationSolver(unittest.TestCase):
+
+    def compare(self, bqm, **kwargs):
+        exact = dimod.ExactSolver().sample(bqm)
+        energies = exact.record.energy
+        ground = energies.min()
+        expected = {tuple(row) for row, energy in zip(exact.record.sample, energies)
+                    if np.isclose(energy, ground)}
+
+        response = EnumerationSolver().sample(bqm, **kwargs)
+        self.assertAlmostEqual(response.info['ground_energy'], ground)
+        self.assertEqual(response.info['degeneracy'], len(expected))
+        columns = [list(response.variables).index(v) for v in exact.variables]
+        found = {tuple(row) for row in response.record.sample[:, columns]}
+        self.assertEqual(found, expected)
+        self.assertTrue(np.allclose(response.record.energy, ground))
+        return exact, response
+
+    def test_against_exact_solver(self):
+        rng = np.random.default_rng(0)
+        for trial in range(40):
+            n = int(rng.integers(1, 11))
+            vartype = dimod.SPIN if trial % 2 else dimod.BINARY
+            self.compare(random_bqm(rng, n, vartype))
+
+    def test_gray_code_half(self):
+        # low_bits below n makes the Gray code walk do the work.
+        rng = np.random.default_rng(1)
+        for trial in range(20):
+            self.compare(random_bqm(rng, 9, dimod.BINARY), low_bits=3)
+
+    def test_degenerate_ground_states(self):
+        # No biases at all: every state is a ground state.
+        bqm = dimod.BinaryQuadraticModel({v: 0.0 for v in range(5)}, {}, 0.0, dimod.BINARY)
+        self.compare(bqm, low_bits=2)
+
+    def test_spectrum(self):
+        rng = np.random.default_rng(2)
+        bqm = random_bqm(rng, 7, dimod.SPIN)
+        exact = dimod.ExactSolver().sample(bqm)
+        values, counts = np.unique(np.round(exact.record.energy, 6), return_counts=True)
+        response = EnumerationSolver().sample(bqm, spectrum=True, low_bits=4)
+        self.assertEqual(response.info['spectrum'], list(zip(values.tolist(), counts.tolist())))
+
+
+if __name__ == '__main__':
+    unittest.main()
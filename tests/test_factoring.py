@@ -0,0 +1,61 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+
+import unittest
+
+from dwave_tutorials.factoring import BatchFactorer
+
+
+def factor_pairs(c):
+    return set((a, b) for a in range(4) for b in range(4) if a * b == c)
+
+
+class TestBatchFactorer(unittest.TestCase):
+
+    def test_every_target(self):
+        factorer = BatchFactorer(num_reads=200, seed=1)
+        results = factorer.factor(list(range(16)))
+        self.assertEqual(sorted(results), list(range(16)))
+        for c in range(16):
+            # Every pair found is right, and a number with 2-bit factors
+            # gets at least one pair.
+            self.assertTrue(results[c] <= factor_pairs(c), c)
+            self.assertEqual(bool(results[c]), bool(factor_pairs(c)), c)
+        self.assertEqual(results[9], {(3, 3)})
+        self.assertEqual(results[6], {(2, 3), (3, 2)})
+
+    def test_duplicates(self):
+        factorer = BatchFactorer(num_reads=50, seed=2)
+        results = factorer.factor([4, 4, 9])
+        self.assertEqual(sorted(results), [4, 9])
+        self.assertEqual(factorer.factored, 3)
+        self.assertEqual(factorer.factor([]), {})
+
+    def test_target_bqm(self):
+        factorer = BatchFactorer()
+        bqm = factorer.target_bqm(6)
+        self.assertFalse({'c0', 'c1', 'c2', 'c3'} & set(bqm.variables))
+        batch = factorer.batch_bqm([6, 9])
+        self.assertEqual(len(batch), 2 * len(bqm))
+        for c in (-1, 16):
+            with self.assertRaises(ValueError):
+                factorer.target_bqm(c)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+
+import unittest
+
+import dimod
+
+from dwave_tutorials import mockqpu
+from dwave_tutorials.mockqpu import MockQPUSampler
+
+
+class TestTopology(unittest.TestCase):
+
+    def test_chimera(self):
+        sampler = MockQPUSampler(shape=(2, 2, 4))
+        self.assertEqual(len(sampler.nodelist), 2 * 2 * 8)
+        # 16 couplers inside each cell, 4 between each pair of neighbor cells.
+        self.assertEqual(len(sampler.edgelist), 4 * 16 + 4 * 4)
+        self.assertEqual(sampler.properties['topology'], {'type': 'chimera', 'shape': [2, 2, 4]})
+
+    def test_default_is_c16(self):
+        sampler = MockQPUSampler()
+        self.assertEqual(len(sampler.nodelist), 2048)
+        self.assertEqual(sampler.properties['chip_id'], 'MOCK_C16')
+
+    def test_pegasus(self):
+        sampler = MockQPUSampler('pegasus', shape=(2,))
+        self.assertEqual(sampler.properties['topology']['type'], 'pegasus')
+        nodes = set(sampler.nodelist)
+        self.assertTrue(all(u in nodes and v in nodes for u, v in sampler.edgelist))
+
+    def test_broken_qubits(self):
+        whole = MockQPUSampler(shape=(4, 4, 4))
+        broken = MockQPUSampler(shape=(4, 4, 4), broken_fraction=0.1, seed=1)
+        self.assertEqual(len(broken.nodelist), len(whole.nodelist) - 13)
+        nodes = set(broken.nodelist)
+        self.assertTrue(all(u in nodes and v in nodes for u, v in broken.edgelist))
+        again = MockQPUSampler(shape=(4, 4, 4), broken_fraction=0.1, seed=1)
+        self.assertEqual(broken.nodelist, again.nodelist)
+
+    def test_unknown_topology(self):
+        with self.assertRaises(ValueError):
+            MockQPUSampler('zephyr')
+
+
+class TestAnnealSchedule(unittest.TestCase):
+
+    def test_valid(self):
+        for schedule in ([(0, 0), (20, 1)],
+                         [(0, 0), (10, 0.4), (110, 0.4), (120, 1)],
+                         [(0, 1), (5, 0.45), (10, 1)]):
+            self.assertEqual(len(mockqpu.validate_anneal_schedule(schedule)), len(schedule))
+
+    def test_invalid(self):
+        for schedule in ([(0, 0)],
+                         [(0, 0), (1, 0.2), (2, 0.4), (3, 0.6), (4, 1)],  # five points
+                         [(1, 0), (20, 1)],
+                         [(0, 0), (20, 0.5)],
+                         [(0, 0), (10, 0.5), (10, 1)],
+                         [(0, 0), (10, -0.5), (20, 1)],
+                         [(0, 0), (10, 0.6), (15, 0.4), (20, 1)],
+                         [(0, 0.5), (20, 1)],
+                         [(0, 0), (0.5, 1)],
+                         [(0, 0), (3000, 1)]):
+            with self.assertRaises(ValueError, msg=str(schedule)):
+                mockqpu.validate_anneal_schedule(schedule)
+
+
+class TestSample(unittest.TestCase):
+
+    def setUp(self):
+        self.sampler = MockQPUSampler(shape=(1, 1, 4))
+        u, v = self.sampler.edgelist[0]
+        self.bqm = dimod.BinaryQuadraticModel({u: -1.0, v: 1.0}, {(u, v): -1.0}, 0.0,
+                                              dimod.SPIN)
+
+    def test_ground_state(self):
+        response = self.sampler.sample(self.bqm, num_reads=20, seed=1)
+        self.assertAlmostEqual(response.first.energy, -1.0)
+        self.assertEqual(int(response.record.num_occurrences.sum()), 20)
+        raw = self.sampler.sample(self.bqm, num_reads=20, seed=1, answer_mode='raw')
+        self.assertEqual(len(raw), 20)
+
+    def test_num_reads(self):
+        for num_reads in (0, mockqpu.num_reads_range[1] + 1):
+            with self.assertRaises(ValueError):
+                self.sampler.sample(self.bqm, num_reads=num_reads)
+
+    def test_annealing_time(self):
+        with self.assertRaises(ValueError):
+            self.sampler.sample(self.bqm, annealing_time=0.5)
+        with self.assertRaises(ValueError):
+            self.sampler.sample(self.bqm, annealing_time=20,
+                                anneal_schedule=[(0, 0), (20, 1)])
+        with self.assertRaises(ValueError):
+            self.sampler.sample(self.bqm, anneal_schedule=[(0, 0), (20, 0.5)])
+
+    def test_structure(self):
+        bqm = dimod.BinaryQuadraticModel({0: 1.0, 1: 1.0}, {(0, 1): 1.0}, 0.0, dimod.SPIN)
+        with self.assertRaises(dimod.BinaryQuadraticModelStructureError):
+            self.sampler.sample(bqm)  # 0 and 1 are on the same side of the cell
+
+    def test_timing(self):
+        response = self.sampler.sample(self.bqm, num_reads=10, annealing_time=50, seed=1)
+        timing = response.info['timing']
+        self.assertEqual(timing, mockqpu.timing(10, 50.0))
+        self.assertEqual(timing['anneal_time_per_run'], 50.0)
+        self.assertAlmostEqual(timing['qpu_sampling_time'],
+                               10 * (50.0 + mockqpu.readout_time_per_sample
+                                     + mockqpu.delay_time_per_sample))
+        self.assertAlmostEqual(timing['qpu_access_time'],
+                               timing['qpu_programming_time'] + timing['qpu_sampling_time'])
+        schedule = self.sampler.sample(self.bqm, anneal_schedule=[(0, 0), (10, 0.5), (30, 1)])
+        self.assertEqual(schedule.info['timing']['anneal_time_per_run'], 30.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import itertools
+import unittest
+from unittest import mock
+
+from dwave_tutorials import multiplier
+from dwave_tutorials.adders import decode
+from dwave_tutorials.exact import EnumerationSolver
+
+sizes = [(n, m) for n in range(1, 4) for m in range(1, 4)]
+
+
+def bits(name, k):
+    return ['{}{}'.format(name, i) for i in range(k)]
+
+
+class TestArrayMultiplier(unittest.TestCase):
+
+    def test_ground_states_multiply(self):
+        # Every ground state is a * b = c, and every a, b shows up once.
+        for n, m in sizes:
+            bqm = multiplier.multiplier_bqm(n, m)
+            self.assertTrue(set(bits('c', n + m)) <= set(bqm.variables), (n, m))
+            response = EnumerationSolver().sample(bqm)
+            self.assertAlmostEqual(response.info['ground_energy'], 0.0)
+            a = decode(response, bits('a', n))
+            b = decode(response, bits('b', m))
+            c = decode(response, bits('c', n + m))
+            self.assertEqual((a * b == c).all(), True, (n, m))
+            self.assertEqual(sorted(zip(a, b)),
+                             list(itertools.product(range(1 << n), range(1 << m))))
+
+    def test_fixed_product(self):
+        # With c fixed, the ground states are exactly its factorizations.
+        for n, m in sizes:
+            for c in range(1 << (n + m)):
+                expected = sorted((a, b) for a in range(1 << n) for b in range(1 << m)
+                                  if a * b == c)
+                response = EnumerationSolver().sample(multiplier.multiplier_bqm(n, m, c=c))
+                if not expected:
+                    self.assertGreater(response.info['ground_energy'], 0.5, (n, m, c))
+                    continue
+                self.assertAlmostEqual(response.info['ground_energy'], 0.0)
+                found = sorted(zip(decode(response, bits('a', n)),
+                                   decode(response, bits('b', m))))
+                self.assertEqual(found, expected, (n, m, c))
+
+    def test_missing_product_bit(self):
+        # A circuit without c2 cannot carry c = 4; it must not be dropped.
+        circuit = multiplier.array_multiplier(2, 1)
+        circuit.gates = [(template, wires) for template, wires in circuit.gates
+                         if 'c2' not in wires]
+        with mock.patch.object(multiplier, 'array_multiplier', return_value=circuit):
+            with self.assertRaises(ValueError):
+                multiplier.multiplier_model(2, 1, c=4)
+
+    def test_numbered_model(self):
+        for n, m in sizes:
+            for c in (None, 0, (1 << (n + m)) - 1):
+                bqm, index = multiplier.multiplier_model(n, m, c)
+                self.assertEqual(list(bqm.variables), list(range(len(index))))
+                self.assertEqual(index.bqm(multiplier.multiplier_bqm(n, m, c)), bqm)
+
+    def test_simulate(self):
+        for n, m in sizes:
+            circuit = multiplier.array_multiplier(n, m)
+            for a, b in itertools.product(range(1 << n), range(1 << m)):
+                inputs = {'a{}'.format(i): (a >> i) & 1 for i in range(n)}
+                inputs.update({'b{}'.format(i): (b >> i) & 1 for i in range(m)})
+                values = circuit.simulate(inputs)
+                c = sum(values['c{}'.format(i)] << i for i in range(n + m))
+                self.assertEqual(c, a * b, (n, m, a, b))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+import unittest
+
+import dimod
+
+from dwave_tutorials import parallel
+
+
+class TestParallelSampler(unittest.TestCase):
+
+    def test_shard_sizes(self):
+        self.assertEqual(parallel.shard_sizes(10, 4), [3, 3, 2, 2])
+        self.assertEqual(parallel.shard_sizes(2, 4), [1, 1])
+        for num_reads in range(1, 20):
+            self.assertEqual(sum(parallel.shard_sizes(num_reads, 3)), num_reads)
+
+    def test_num_reads(self):
+        bqm = dimod.BinaryQuadraticModel({'a': -1.0, 'b': 1.0}, {('a', 'b'): -1.0}, 0.0,
+                                         dimod.BINARY)
+        with parallel.ParallelSampler(num_workers=2) as sampler:
+            response = sampler.sample(bqm, num_reads=5, seed=1)
+            self.assertEqual(int(response.record.num_occurrences.sum()), 5)
+            for num_reads in (0, -1):
+                with self.assertRaises(ValueError):
+                    sampler.sample(bqm, num_reads=num_reads)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+
+import unittest
+
+import numpy as np
+import dimod
+
+from dwave_tutorials import postprocess
+from dwave_tutorials.compiled import CompiledQUBO
+
+
+def random_bqm(n, vartype, seed):
+    rng = np.random.RandomState(seed)
+    linear = {v: rng.uniform(-1, 1) for v in range(n)}
+    quadratic = {(u, v): rng.uniform(-1, 1)
+                 for u in range(n) for v in range(u + 1, n) if rng.rand() < 0.4}
+    return dimod.BinaryQuadraticModel(linear, quadratic, 0.0, vartype)
+
+
+class TestDescent(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = np.random.RandomState(0)
+
+    def test_descend(self):
+        for seed in range(5):
+            qubo = CompiledQUBO.from_bqm(random_bqm(15, dimod.BINARY, seed))
+            X = self.rng.randint(2, size=(40, len(qubo))).astype(np.int8)
+            original = X.copy()
+            descended, steps = postprocess.descend(qubo, X)
+            # Never uphill, and no single flip helps at the end.
+            self.assertTrue((qubo.energies(descended) <= qubo.energies(X) + 1e-9).all())
+            self.assertTrue((qubo.flip_deltas(descended) >= -1e-9).all())
+            self.assertGreater(steps, 0)
+            self.assertTrue((X == original).all())  # the input is left alone
+
+    def test_max_steps(self):
+        qubo = CompiledQUBO.from_bqm(random_bqm(15, dimod.BINARY, 1))
+        X = self.rng.randint(2, size=(40, len(qubo))).astype(np.int8)
+        descended, steps = postprocess.descend(qubo, X, max_steps=1)
+        self.assertEqual(steps, 1)
+        self.assertTrue(((descended != X).sum(axis=1) <= 1).all())
+
+    def test_tabu_search(self):
+        qubo = CompiledQUBO.from_bqm(random_bqm(15, dimod.BINARY, 2))
+        X, _ = postprocess.descend(qubo, self.rng.randint(2, size=(40, 15)))
+        best = postprocess.tabu_search(qubo, X, 50)
+        self.assertTrue((qubo.energies(best) <= qubo.energies(X) + 1e-9).all())
+
+    def test_no_variables(self):
+        qubo = CompiledQUBO.from_bqm(dimod.BinaryQuadraticModel.empty(dimod.BINARY))
+        X = np.zeros((3, 0), dtype=np.int8)
+        descended, steps = postprocess.descend(qubo, X)
+        self.assertEqual((descended.shape, steps), ((3, 0), 0))
+        self.assertEqual(postprocess.tabu_search(qubo, X, 10).shape, (3, 0))
+
+
+class TestSteepestDescentComposite(unittest.TestCase):
+
+    def test_sample(self):
+        for vartype in (dimod.BINARY, dimod.SPIN):
+            bqm = random_bqm(12, vartype, 3)
+            child = dimod.RandomSampler()
+            raw = child.sample(bqm, num_reads=30, seed=1)
+            sampler = postprocess.SteepestDescentComposite(child)
+            response = sampler.sample(bqm, num_reads=30, seed=1, tabu_steps=10)
+            self.assertEqual(len(response), 30)
+            self.assertTrue((response.record.energy <= raw.record.energy + 1e-9).all())
+            self.assertTrue(np.allclose(
+                bqm.energies((response.record.sample, response.variables)),
+                response.record.energy))
+            self.assertIn('postprocessing', response.info)
+
+    def test_repair_keeps_occurrences(self):
+        bqm = random_bqm(6, dimod.SPIN, 4)
+        response = dimod.SampleSet.from_samples_bqm(
+            (np.ones((3, 6), dtype=np.int8), list(bqm.variables)), bqm,
+            num_occurrences=[1, 2, 3])
+        repaired = postprocess.repair(response, bqm)
+        self.assertEqual(repaired.record.num_occurrences.tolist(), [1, 2, 3])
+
+    def test_empty(self):
+        bqm = dimod.BinaryQuadraticModel.empty(dimod.BINARY)
+        response = postprocess.SteepestDescentComposite(dimod.RandomSampler()).sample(
+            bqm, num_reads=4)
+        self.assertEqual(len(response.variables), 0)
+        self.assertEqual(int(response.record.num_occurrences.sum()), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
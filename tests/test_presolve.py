@@ -0,0 +1,103 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+import operator
+import unittest
+
+import dimod
+import dwavebinarycsp
+
+from dwave_tutorials import circuits, presolve, validate
+from dwave_tutorials.canonical import ConstraintCompiler
+from dwave_tutorials.exact import EnumerationSolver
+from dwave_tutorials.stitchcache import PenaltyModelCache
+
+
+def solutions(csp):
+    # Every solution of csp, as a set of tuples in sorted label order.
+    labels = sorted(csp.variables)
+    found = set()
+    for index in range(1 << len(labels)):
+        sample = {v: (index >> j) & 1 for j, v in enumerate(labels)}
+        if csp.check(sample):
+            found.add(tuple(sample[v] for v in labels))
+    return found
+
+
+class TestPresolve(unittest.TestCase):
+
+    def test_multiplier_is_decided(self):
+        presolved = presolve.presolve(circuits.multiplier_2x2_csp(9))
+        self.assertEqual(len(presolved.csp.variables), 0)
+        self.assertEqual(presolved.fixed['a0'], 1)
+        self.assertEqual(presolved.fixed['b1'], 1)
+
+    def test_solutions_are_kept(self):
+        # The presolved CSP plus the decided values is the original CSP.
+        for c in (0, 1, 2, 3, 4, 6, 9):
+            csp = circuits.multiplier_2x2_csp(c)
+            presolved = presolve.presolve(csp)
+            labels = sorted(csp.variables)
+            small = sorted(presolved.csp.variables)
+            lifted = set()
+            for index in range(1 << len(small)):
+                sample = {v: (index >> j) & 1 for j, v in enumerate(small)}
+                if presolved.csp.check(sample):
+                    sample.update(presolved.fixed)
+                    lifted.add(tuple(sample[v] for v in labels))
+            self.assertTrue(lifted, c)
+            self.assertTrue(lifted <= solutions(csp), c)
+
+    def test_expand(self):
+        csp = circuits.full_adder_csp()
+        csp.add_constraint(operator.truth, ['a'])
+        csp.add_constraint(operator.not_, ['b'])
+        presolved = presolve.presolve(csp)
+        bqm = ConstraintCompiler(PenaltyModelCache(None)).stitch(presolved.csp, 3.0)
+        response = presolved.expand(EnumerationSolver().sample(bqm))
+        self.assertEqual(set(csp.variables) - set(response.variables), set())
+        self.assertTrue((response.record.sample[:, list(response.variables).index('a')] == 1).all())
+        _, valid, invalid = validate.check(csp, response)
+        self.assertEqual(invalid, 0)
+        self.assertEqual(valid, 2)   # cIn is still free
+
+    def test_expand_with_nothing_decided(self):
+        presolved = presolve.presolve(circuits.full_adder_csp())
+        response = dimod.SampleSet.from_samples(([[0]], ['x']), dimod.BINARY, [0.0])
+        self.assertIs(presolved.expand(response), response)
+
+    def test_sampleset(self):
+        csp = circuits.multiplier_2x2_csp(9)
+        response = presolve.presolve(csp).sampleset(num_reads=5)
+        self.assertEqual(set(response.variables), set(csp.variables))
+        self.assertEqual(int(response.record.num_occurrences.sum()), 5)
+        self.assertEqual(validate.check(csp, response)[1:], (5, 0))
+
+    def test_sampleset_with_variables_left(self):
+        with self.assertRaises(ValueError):
+            presolve.presolve(circuits.full_adder_csp()).sampleset()
+
+    def test_unsatisfiable(self):
+        csp = dwavebinarycsp.ConstraintSatisfactionProblem(dwavebinarycsp.BINARY)
+        csp.add_constraint(operator.truth, ['x'])
+        csp.add_constraint(operator.not_, ['x'])
+        with self.assertRaises(ValueError):
+            presolve.presolve(csp)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+
+import unittest
+
+import numpy as np
+
+from dwave_tutorials import randomness
+
+
+class TestRandomnessTests(unittest.TestCase):
+
+    def test_fair_coin(self):
+        tests = randomness.RandomnessTests(16)
+        state = np.random.RandomState(1)
+        for _ in range(4):
+            tests.update(state.randint(2, size=(1000, 16)))
+        for name, statistic, p_value in tests.results():
+            self.assertGreater(p_value, 1e-4, name)
+
+    def test_stuck_coin(self):
+        tests = randomness.RandomnessTests(4)
+        tests.update(np.ones((100, 4), dtype=np.int8))
+        p_values = dict((name, p_value) for name, _, p_value in tests.results())
+        self.assertTrue(all(p_value < 1e-4 for p_value in p_values.values()), p_values)
+
+    def test_correlation_edge_cases(self):
+        self.assertEqual(randomness._correlation(0, 0, 0, 0), (0.0, 1.0))
+        self.assertEqual(randomness._correlation(10, 10, 5, 10), (0.0, 0.0))
+
+    def test_spin_samples(self):
+        bits = np.random.RandomState(2).randint(2, size=(500, 8))
+        binary, spin = randomness.RandomnessTests(8), randomness.RandomnessTests(8)
+        binary.update(bits)
+        spin.update(2 * bits - 1)
+        self.assertEqual(binary.results(), spin.results())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+
+import unittest
+
+from dwave_tutorials import circuits, mockqpu, schedules
+from dwave_tutorials.mockqpu import MockQPUSampler
+
+
+class TestSchedules(unittest.TestCase):
+
+    def test_pause_schedule(self):
+        self.assertEqual(schedules.pause_schedule(0.4, 10),
+                         ((0.0, 0.0), (8.0, 0.4), (18.0, 0.4), (30.0, 1.0)))
+        self.assertEqual(schedules.pause_schedule(0.5, 0, quench_time=1.0),
+                         ((0.0, 0.0), (10.0, 0.5), (11.0, 1.0)))
+        for point in (0.0, 1.0):
+            with self.assertRaises(ValueError):
+                schedules.pause_schedule(point, 10)
+
+    def test_grid(self):
+        entries = schedules.grid([0.3, 0.5], [0, 10], [None, 2.0])
+        self.assertEqual(len(entries), 8)
+        self.assertEqual([(e['pause_point'], e['pause_length'], e['quench_time'])
+                          for e in entries[:3]],
+                         [(0.3, 0, None), (0.3, 0, 2.0), (0.3, 10, None)])
+        for entry in entries:
+            self.assertEqual(entry['schedule'], schedules.pause_schedule(
+                entry['pause_point'], entry['pause_length'], entry['quench_time']))
+
+
+class TestScheduleSweep(unittest.TestCase):
+
+    def sweep(self, max_workers):
+        # The NOT gate's qubits 0 and 4 are coupled on the mock's Chimera graph.
+        return schedules.ScheduleSweep(MockQPUSampler(shape=(1, 1, 4)), circuits.not_qubo,
+                                       num_reads=50, max_workers=max_workers, seed=1)
+
+    def test_rows_follow_grid(self):
+        entries = schedules.grid([0.2, 0.4, 0.6], [0, 5, 40], [None, 1.0])
+        for max_workers in (1, 4):
+            rows = self.sweep(max_workers).run(entries)
+            self.assertEqual(len(rows), len(entries))
+            for entry, row in zip(entries, rows):
+                self.assertEqual(row['schedule'], entry['schedule'])
+                # The mock's access time depends on the schedule's length,
+                # so it shows which schedule each row was sampled with.
+                length = entry['schedule'][-1][0]
+                self.assertAlmostEqual(row['qpu_access_time'],
+                                       mockqpu.timing(50, length)['qpu_access_time'])
+                self.assertEqual(row['reads'], 50)
+                self.assertTrue(0.0 <= row['ground_probability'] <= 1.0)
+
+    def test_ground_energy(self):
+        rows = self.sweep(2).run([[(0.0, 0.0), (20.0, 1.0)]])
+        self.assertGreater(rows[0]['ground_probability'], 0.0)
+        sweep = self.sweep(1)
+        sweep.ground_energy = -100.0
+        self.assertEqual(sweep.run([[(0.0, 0.0), (20.0, 1.0)]])[0]['ground_probability'], 0.0)
+
+    def test_validate(self):
+        too_many = [(0.0, 0.0), (2.0, 0.2), (4.0, 0.4), (6.0, 0.6), (20.0, 1.0)]
+        with self.assertRaises(ValueError):
+            self.sweep(1).run([[(0.0, 0.0), (20.0, 1.0)], too_many])
+
+    def test_format_table(self):
+        rows = self.sweep(1).run(schedules.grid([0.5], [10]))
+        lines = schedules.format_table(rows).splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertIn('normal', lines[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import dimod
+import dwavebinarycsp
+import dwavebinarycsp.factories.constraint.gates as gates
+
+from dwave_tutorials import circuits, stitchcache
+from dwave_tutorials.exact import EnumerationSolver
+
+
+def ground_states(bqm, csp):
+    labels = sorted(csp.variables)
+    return {tuple(int(sample[v]) for v in labels)
+            for sample in EnumerationSolver().sample(bqm).samples()}
+
+
+class TestJSONCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_round_trip(self):
+        cache = stitchcache.JSONCache(self.directory)
+        cache.put('a key', {'value': [1, 2.5]})
+        reloaded = stitchcache.JSONCache(self.directory)
+        self.assertEqual(reloaded.get('a key'), {'value': [1, 2.5], 'key': 'a key'})
+        self.assertIsNone(reloaded.get('another key'))
+
+    def test_memory_only(self):
+        cache = stitchcache.JSONCache(None)
+        cache.put('k', {'value': 1})
+        self.assertEqual(cache.get('k')['value'], 1)
+        self.assertIsNone(stitchcache.JSONCache(None).get('k'))
+
+    def test_damaged_file(self):
+        cache = stitchcache.JSONCache(self.directory)
+        cache.put('k', {'value': 1})
+        with open(cache._path('k'), 'w') as f:
+            f.write('{not json')
+        self.assertIsNone(stitchcache.JSONCache(self.directory).get('k'))
+
+    def test_evicts_least_recently_used(self):
+        cache = stitchcache.JSONCache(self.directory, max_entries=2)
+        cache.put('old', {})
+        cache.put('used', {})
+        os.utime(cache._path('old'), (1000, 1000))
+        os.utime(cache._path('used'), (2000, 2000))
+        # Reading an entry from disk marks it as recently used.
+        stitchcache.JSONCache(self.directory).get('old')
+        cache.put('new', {})
+        names = set(os.listdir(self.directory))
+        self.assertIn(os.path.basename(cache._path('old')), names)
+        self.assertIn(os.path.basename(cache._path('new')), names)
+        self.assertNotIn(os.path.basename(cache._path('used')), names)
+
+    def test_environment_override(self):
+        saved = os.environ.get('DWAVE_TUTORIALS_CACHE')
+        os.environ['DWAVE_TUTORIALS_CACHE'] = self.directory
+        try:
+            self.assertEqual(stitchcache.default_directory('things'),
+                             os.path.join(self.directory, 'things'))
+        finally:
+            if saved is None:
+                del os.environ['DWAVE_TUTORIALS_CACHE']
+            else:
+                os.environ['DWAVE_TUTORIALS_CACHE'] = saved
+        self.assertTrue(stitchcache.default_directory().endswith('penaltymodels'))
+
+
+class TestStitch(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_same_answers_as_stitch(self):
+        csp = circuits.full_adder_csp()
+        cache = stitchcache.PenaltyModelCache(self.directory)
+        bqm = stitchcache.stitch(csp, min_classical_gap=3.0, cache=cache)
+        expected = dwavebinarycsp.stitch(csp, min_classical_gap=3.0)
+        self.assertEqual(ground_states(bqm, csp), ground_states(expected, csp))
+
+    def test_hits_from_disk(self):
+        csp = circuits.full_adder_csp()
+        first = stitchcache.PenaltyModelCache(self.directory)
+        bqm = stitchcache.stitch(csp, min_classical_gap=3.0, cache=first)
+        self.assertGreater(first.misses, 0)
+        # Every constraint shape was searched once, and then reused.
+        self.assertEqual(first.hits + first.misses, len(csp.constraints))
+
+        second = stitchcache.PenaltyModelCache(self.directory)
+        again = stitchcache.stitch(csp, min_classical_gap=3.0, cache=second)
+        self.assertEqual((second.hits, second.misses), (len(csp.constraints), 0))
+        self.assertEqual(again, bqm)
+
+    def test_aux_labels_skip_csp_variables(self):
+        csp = dwavebinarycsp.ConstraintSatisfactionProblem(dwavebinarycsp.BINARY)
+        csp.add_constraint(gates.xor_gate(['aux0', 'b', 'z']))
+        csp.add_constraint(gates.xor_gate(['z', 'aux1', 'w']))
+        bqm = stitchcache.stitch(csp, cache=stitchcache.PenaltyModelCache(None))
+        aux = set(bqm.variables) - set(csp.variables)
+        self.assertTrue(aux)
+        self.assertFalse(aux & {'aux0', 'aux1'})
+        labels = sorted(csp.variables)
+        solutions = set()
+        for index in range(1 << len(labels)):
+            sample = {v: (index >> j) & 1 for j, v in enumerate(labels)}
+            if csp.check(sample):
+                solutions.add(tuple(sample[v] for v in labels))
+        self.assertEqual(ground_states(bqm, csp), solutions)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+
+import unittest
+
+import numpy as np
+import dimod
+
+from dwave_tutorials import tempering
+from dwave_tutorials.compiled import CompiledQUBO
+
+
+def random_bqm(n, vartype, seed):
+    rng = np.random.RandomState(seed)
+    linear = {v: rng.uniform(-1, 1) for v in range(n)}
+    quadratic = {(u, v): rng.uniform(-1, 1)
+                 for u in range(n) for v in range(u + 1, n) if rng.rand() < 0.5}
+    return dimod.BinaryQuadraticModel(linear, quadratic, 0.5, vartype)
+
+
+class TestColorClasses(unittest.TestCase):
+
+    def test_groups(self):
+        bqm = random_bqm(12, dimod.BINARY, 1)
+        qubo = CompiledQUBO.from_bqm(bqm, list(bqm.variables))
+        groups = tempering.color_classes(qubo)
+        self.assertEqual(sorted(np.concatenate(groups).tolist()), list(range(12)))
+        for group in groups:
+            members = set(qubo.labels[i] for i in group)
+            for u, v in bqm.quadratic:
+                self.assertFalse(u in members and v in members)
+
+    def test_empty(self):
+        qubo = CompiledQUBO.from_bqm(dimod.BinaryQuadraticModel.empty(dimod.BINARY), [])
+        self.assertEqual(tempering.color_classes(qubo), [])
+
+
+class TestParallelTemperingSampler(unittest.TestCase):
+
+    def test_ground_state(self):
+        sampler = tempering.ParallelTemperingSampler()
+        for vartype in (dimod.BINARY, dimod.SPIN):
+            for seed in range(3):
+                bqm = random_bqm(8, vartype, seed)
+                ground = dimod.ExactSolver().sample(bqm).first.energy
+                response = sampler.sample(bqm, num_reads=10, seed=seed)
+                self.assertAlmostEqual(response.first.energy, ground)
+                self.assertTrue(np.allclose(
+                    bqm.energies((response.record.sample, response.variables)),
+                    response.record.energy))
+
+    def test_raw(self):
+        bqm = random_bqm(5, dimod.SPIN, 4)
+        response = tempering.ParallelTemperingSampler().sample(
+            bqm, num_reads=7, num_replicas=3, seed=1, answer_mode='raw')
+        self.assertEqual(len(response), 7)
+        self.assertEqual(len(response.info['betas']), 3)
+        self.assertEqual(len(response.info['acceptance']), 2)
+
+    def test_betas(self):
+        bqm = random_bqm(3, dimod.BINARY, 5)
+        sampler = tempering.ParallelTemperingSampler()
+        for betas in ([], [0.0, 1.0], [-1.0, 1.0]):
+            with self.assertRaises(ValueError):
+                sampler.sample(bqm, betas=betas)
+
+    def test_empty(self):
+        bqm = dimod.BinaryQuadraticModel.empty(dimod.BINARY)
+        bqm.offset = 2.0
+        response = tempering.ParallelTemperingSampler().sample(bqm, num_reads=3, seed=1)
+        self.assertEqual(len(response.variables), 0)
+        self.assertEqual(int(response.record.num_occurrences.sum()), 3)
+        self.assertAlmostEqual(response.first.energy, 2.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+import itertools
+import unittest
+
+import dimod
+import dwavebinarycsp
+import dwavebinarycsp.factories.constraint.gates as gates
+
+from dwave_tutorials import templates
+from dwave_tutorials.exact import EnumerationSolver
+
+
+class TestTemplates(unittest.TestCase):
+
+    def test_verify_every_gate(self):
+        for template in templates.gates + [templates.zero_gate]:
+            gap = template.verify()
+            self.assertGreaterEqual(gap, 1.0 - 1e-9, template.name)
+
+    def test_verify_fixed_outputs(self):
+        for template in templates.gates:
+            for port in template.ports[template.num_inputs:]:
+                for value in (0, 1):
+                    fixed = template.fix({port: value})
+                    self.assertGreaterEqual(fixed.verify(), 1.0 - 1e-9, fixed.name)
+
+    def test_ground_states_follow_func(self):
+        # verify() and table() agree with brute force over ports and aux.
+        for template in templates.gates + [templates.zero_gate]:
+            bqm = dimod.BinaryQuadraticModel.from_qubo(
+                {k: v for k, v in template.qubo().items() if k != ((), ())},
+                template.offset)
+            names = template.ports + template.aux
+            for name in names:
+                bqm.add_variable(name, 0.0)
+            response = EnumerationSolver().sample(bqm)
+            self.assertAlmostEqual(response.info['ground_energy'], 0.0, msg=template.name)
+            ports = {tuple(int(sample[p]) for p in template.ports)
+                     for sample in response.samples()}
+            expected = set()
+            for inputs in itertools.product((0, 1), repeat=template.num_inputs):
+                expected.add(inputs + tuple(int(z) for z in template.func(*inputs)))
+            self.assertEqual(ports, expected, template.name)
+            table = template.table()
+            for config in expected:
+                self.assertTrue(table[sum(bit << j for j, bit in enumerate(config))])
+            self.assertEqual(int(table.sum()), len(expected), template.name)
+
+    def test_verify_rejects_a_broken_model(self):
+        broken = templates.Template('broken', ('a', 'z'), 1, {('a', 'z'): 1},
+                                    lambda a: (1 - a,))
+        with self.assertRaises(ValueError):
+            broken.verify()
+
+    def test_circuit_matches_simulate(self):
+        circuit = templates.Circuit()
+        circuit.add(templates.and_gate, ['x', 'y', 'p'])
+        circuit.add(templates.xor_gate, ['p', 'w', 'z'])
+        bqm = circuit.bqm()
+        for x, y, w in itertools.product((0, 1), repeat=3):
+            values = circuit.simulate({'x': x, 'y': y, 'w': w})
+            self.assertEqual(values['z'], (x & y) ^ w)
+            self.assertAlmostEqual(bqm.energy({v: values[v] for v in bqm.variables}), 0.0)
+
+    def test_aux_names_skip_wires(self):
+        circuit = templates.Circuit()
+        circuit.add(templates.xor_gate, ['aux0', 'b', 'z'])
+        bqm = circuit.bqm()
+        self.assertEqual(len(bqm), 3 + len(templates.xor_gate.aux))
+        self.assertNotIn('aux0', circuit.labels()[3:])
+        for a, b in itertools.product((0, 1), repeat=2):
+            values = circuit.simulate({'aux0': a, 'b': b})
+            self.assertEqual(values['z'], a ^ b)
+            self.assertEqual(values['aux0'], a)
+            self.assertAlmostEqual(bqm.energy({v: values[v] for v in bqm.variables}), 0.0)
+
+    def test_stitch_with_aux_named_variables(self):
+        csp = dwavebinarycsp.ConstraintSatisfactionProblem(dwavebinarycsp.BINARY)
+        csp.add_constraint(gates.xor_gate(['aux0', 'b', 'z']))
+        # No template for this one, so it goes through canonical.stitch().
+        csp.add_constraint(lambda p, q, r: p + q + r == 1, ['aux1', 'z', 'c'])
+        bqm = templates.stitch(csp)
+        self.assertTrue(set(csp.variables) <= set(bqm.variables))
+        labels = sorted(csp.variables)
+        ground = {tuple(int(sample[v]) for v in labels)
+                  for sample in EnumerationSolver().sample(bqm).samples()}
+        solutions = {values for values in itertools.product((0, 1), repeat=len(labels))
+                     if csp.check(dict(zip(labels, values)))}
+        self.assertEqual(ground, solutions)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+
+import contextlib
+import io
+import re
+import unittest
+import warnings
+
+from dwave_tutorials import cli
+
+
+def run(path, *argv):
+    """Run a tutorial's main() with --batch --quiet; returns its output."""
+    tutorial = cli.load(path)
+    out = io.StringIO()
+    with warnings.catch_warnings(), contextlib.redirect_stdout(out):
+        warnings.simplefilter('ignore')
+        tutorial.main(['--batch', '--quiet'] + list(argv))
+    return out.getvalue()
+
+
+def counts(output):
+    valid, invalid = re.search(r'(\d+)  valid solutions,  (\d+)  invalid', output).groups()
+    return int(valid), int(invalid)
+
+
+class TestLogicGateTutorials(unittest.TestCase):
+    """The logic-gates tutorials end to end, with every sampler choice."""
+
+    def samplers(self):
+        # qpu needs a live QPU and an API token.
+        return [name for name in cli.samplers if name != 'qpu']
+
+    def test_multiplier(self):
+        for sampler in self.samplers():
+            with self.subTest(sampler=sampler):
+                output = run('logic-gates/logic-gates-2by2-multiplier.py',
+                             '--sampler', sampler, '--num-reads', '10', '--seed', '1')
+                self.assertEqual(counts(output), (10, 0))
+                self.assertIn('(11 * 11) = 1001', output)
+
+    def test_multiplier_without_presolve(self):
+        for sampler in self.samplers():
+            with self.subTest(sampler=sampler):
+                output = run('logic-gates/logic-gates-2by2-multiplier.py', '--no-presolve',
+                             '--sampler', sampler, '--num-reads', '10', '--seed', '1')
+                valid, invalid = counts(output)
+                self.assertEqual(valid + invalid, 10)
+
+    def test_full_adder_fixed(self):
+        for sampler in self.samplers():
+            with self.subTest(sampler=sampler):
+                output = run('logic-gates/logic-gates-full-adder.py',
+                             '--sampler', sampler, '--num-reads', '10', '--seed', '1',
+                             '--fix', 'a=1', 'b=1', 'cIn=0')
+                self.assertEqual(counts(output), (10, 0))
+
+    def test_full_adder(self):
+        for sampler in self.samplers():
+            with self.subTest(sampler=sampler):
+                output = run('logic-gates/logic-gates-full-adder.py',
+                             '--sampler', sampler, '--num-reads', '10', '--seed', '1')
+                valid, invalid = counts(output)
+                self.assertEqual(valid + invalid, 10)
+                self.assertGreater(valid, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+"""
+Copyright (C) 2018 Ridgeback Network Defense, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+import itertools
+import operator
+import unittest
+
+import numpy as np
+import dimod
+import dwavebinarycsp
+
+from dwave_tutorials import circuits, nqueens, validate
+
+
+def random_csp(rng, vartype):
+    csp = dwavebinarycsp.ConstraintSatisfactionProblem(vartype)
+    labels = ['v{}'.format(i) for i in range(6)]
+    values = tuple(vartype.value)
+    for _ in range(5):
+        k = int(rng.integers(1, 4))
+        variables = list(rng.choice(labels, size=k, replace=False))
+        configurations = [config for config in itertools.product(values, repeat=k)
+                          if rng.random() < 0.6]
+        if configurations:
+            csp.add_constraint(dwavebinarycsp.Constraint.from_configurations(
+                configurations, variables, vartype))
+    return csp
+
+
+class TestCompiledCSP(unittest.TestCase):
+
+    def compare(self, csp, samples, labels):
+        mask = validate.CompiledCSP(csp).check_matrix(samples, labels)
+        expected = [csp.check(dict(zip(labels, (int(value) for value in row))))
+                    for row in samples]
+        self.assertEqual(mask.tolist(), expected)
+
+    def test_random_csps(self):
+        rng = np.random.default_rng(0)
+        for trial in range(20):
+            vartype = dimod.SPIN if trial % 2 else dimod.BINARY
+            csp = random_csp(rng, vartype)
+            labels = sorted(csp.variables)
+            samples = np.array(list(itertools.product(vartype.value, repeat=len(labels))))
+            self.compare(csp, samples, labels)
+
+    def test_tutorial_csps(self):
+        rng = np.random.default_rng(1)
+        for csp in (circuits.full_adder_csp(), circuits.multiplier_2x2_csp(), nqueens.csp(4)):
+            # Extra columns, like stitch()'s aux variables, are ignored.
+            labels = list(csp.variables) + ['aux0', 'aux1']
+            samples = rng.integers(2, size=(200, len(labels)))
+            self.compare(csp, samples, labels)
+
+    def test_check_counts_occurrences(self):
+        csp = dwavebinarycsp.ConstraintSatisfactionProblem(dwavebinarycsp.BINARY)
+        csp.add_constraint(operator.ne, ['a', 'b'])
+        response = dimod.SampleSet.from_samples(
+            ([[0, 1], [1, 1], [1, 0]], ['a', 'b']), dimod.BINARY, [0, 1, 0],
+            num_occurrences=[3, 5, 2])
+        mask, valid, invalid = validate.check(csp, response)
+        self.assertEqual(mask.tolist(), [True, False, True])
+        self.assertEqual((valid, invalid), (5, 5))
+
+    def test_missing_variable(self):
+        with self.assertRaises(ValueError):
+            validate.CompiledCSP(circuits.full_adder_csp()).check_matrix([[0, 1]], ['a', 'b'])
+
+
+if __name__ == '__main__':
+    unittest.main()